@@ -1,3 +1,4 @@
+import re
 from logging.config import fileConfig
 
 from alembic import context
@@ -16,6 +17,25 @@ if config.config_file_name is not None:
 target_metadata = SQLModel.metadata
 
 
+# Schema objects created by hand-written migrations and not modelled in
+# SQLModel.metadata: full-text search (5b8f3d6e1a27, 7d2e9b4f1c38) and the
+# monthly task_archive partitions made by crud.archive_tasks. Without this
+# filter, autogenerate proposes dropping them.
+_UNMODELLED_TABLES = re.compile(r"task_fts(_\w+)?|task_archive_y\d{4}m\d{2}")
+_UNMODELLED_COLUMNS = {("task", "search_vector")}
+_UNMODELLED_INDEXES = {"ix_task_search_vector"}
+
+
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    if type_ == "table":
+        return not (reflected and _UNMODELLED_TABLES.fullmatch(name))
+    if type_ == "column":
+        return (object.table.name, name) not in _UNMODELLED_COLUMNS
+    if type_ == "index":
+        return name not in _UNMODELLED_INDEXES
+    return True
+
+
 def _get_engine_kwargs() -> dict:
     kwargs: dict = {"poolclass": pool.NullPool}
     if settings.DB_ENGINE == "postgresql":
@@ -30,6 +50,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -44,6 +65,7 @@ def run_migrations_online() -> None:
         context.configure(
             connection=connection,
             target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
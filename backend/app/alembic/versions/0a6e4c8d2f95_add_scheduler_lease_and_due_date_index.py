@@ -0,0 +1,44 @@
+"""add scheduler lease table and open-task due date index
+
+Revision ID: 0a6e4c8d2f95
+Revises: f3b8d2a6c417
+Create Date: 2026-10-18 20:41:05.772913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0a6e4c8d2f95'
+down_revision: Union[str, Sequence[str], None] = 'f3b8d2a6c417'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('schedulerlease',
+    sa.Column('name', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+    sa.Column('holder', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.Column('expires_at', sa.Float(), nullable=False),
+    sa.Column('watermark', sa.Float(), nullable=True),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.create_index(
+        'ix_task_due_date_open',
+        'task',
+        ['due_date'],
+        unique=False,
+        postgresql_where=sa.text("status <> 'COMPLETED'"),
+        sqlite_where=sa.text("status <> 'COMPLETED'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_task_due_date_open', table_name='task')
+    op.drop_table('schedulerlease')
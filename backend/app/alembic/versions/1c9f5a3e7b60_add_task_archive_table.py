@@ -0,0 +1,59 @@
+"""add task archive table and completed-task index
+
+Revision ID: 1c9f5a3e7b60
+Revises: 0a6e4c8d2f95
+Create Date: 2026-10-18 23:12:40.318266
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1c9f5a3e7b60'
+down_revision: Union[str, Sequence[str], None] = '0a6e4c8d2f95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # On PostgreSQL the table is partitioned by month of updated_at; the
+    # archiver creates the monthly partitions as it needs them. The enum
+    # types already exist (created with the task table).
+    op.create_table('task_archive',
+    sa.Column('title', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.Column('description', sqlmodel.sql.sqltypes.AutoString(length=1000), nullable=True),
+    sa.Column('status', postgresql.ENUM('TODO', 'IN_PROGRESS', 'COMPLETED', name='taskstatus', create_type=False), nullable=False),
+    sa.Column('priority', postgresql.ENUM('LOW', 'MEDIUM', 'HIGH', 'URGENT', name='taskpriority', create_type=False), nullable=False),
+    sa.Column('due_date', sa.DateTime(), nullable=True),
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('owner_id', sa.Uuid(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['owner_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id', 'updated_at'),
+    postgresql_partition_by='RANGE (updated_at)',
+    )
+    op.create_index('ix_task_archive_owner_id_created_at_id', 'task_archive', ['owner_id', 'created_at', 'id'], unique=False)
+    op.create_index(
+        'ix_task_updated_at_completed',
+        'task',
+        ['updated_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'COMPLETED'"),
+        sqlite_where=sa.text("status = 'COMPLETED'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_task_updated_at_completed', table_name='task')
+    op.drop_index('ix_task_archive_owner_id_created_at_id', table_name='task_archive')
+    # Drops the monthly partitions with it on PostgreSQL.
+    op.drop_table('task_archive')
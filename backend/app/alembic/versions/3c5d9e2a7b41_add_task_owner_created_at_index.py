@@ -0,0 +1,34 @@
+"""add task owner/created_at keyset index
+
+Revision ID: 3c5d9e2a7b41
+Revises: 8110a7289ec0
+Create Date: 2026-10-18 09:12:03.418252
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c5d9e2a7b41'
+down_revision: Union[str, Sequence[str], None] = '8110a7289ec0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_task_owner_id_created_at_id',
+        'task',
+        ['owner_id', 'created_at', 'id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_task_owner_id_created_at_id', table_name='task')
@@ -0,0 +1,96 @@
+"""add task full-text search
+
+PostgreSQL: a generated tsvector column over title/description with a GIN
+index. SQLite: an FTS5 external-content table kept current by triggers.
+The FTS5 table is keyed on the task rowid, which VACUUM may renumber; run
+INSERT INTO task_fts(task_fts) VALUES ('rebuild') after vacuuming.
+
+Revision ID: 5b8f3d6e1a27
+Revises: a4e1f07c92d3
+Create Date: 2026-10-18 13:05:51.227604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8f3d6e1a27'
+down_revision: Union[str, Sequence[str], None] = 'a4e1f07c92d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute(
+            """
+            ALTER TABLE task ADD COLUMN search_vector tsvector
+            GENERATED ALWAYS AS (
+                setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(description, '')), 'B')
+            ) STORED
+            """
+        )
+        op.create_index(
+            'ix_task_search_vector',
+            'task',
+            ['search_vector'],
+            unique=False,
+            postgresql_using='gin',
+        )
+    elif dialect == 'sqlite':
+        op.execute(
+            """
+            CREATE VIRTUAL TABLE task_fts USING fts5(
+                title, description,
+                content='task', content_rowid='rowid',
+                tokenize='porter unicode61'
+            )
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER task_fts_ai AFTER INSERT ON task BEGIN
+                INSERT INTO task_fts(rowid, title, description)
+                VALUES (new.rowid, new.title, new.description);
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER task_fts_ad AFTER DELETE ON task BEGIN
+                INSERT INTO task_fts(task_fts, rowid, title, description)
+                VALUES ('delete', old.rowid, old.title, old.description);
+            END
+            """
+        )
+        op.execute(
+            """
+            CREATE TRIGGER task_fts_au AFTER UPDATE OF title, description ON task BEGIN
+                INSERT INTO task_fts(task_fts, rowid, title, description)
+                VALUES ('delete', old.rowid, old.title, old.description);
+                INSERT INTO task_fts(rowid, title, description)
+                VALUES (new.rowid, new.title, new.description);
+            END
+            """
+        )
+        op.execute("INSERT INTO task_fts(task_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.drop_index('ix_task_search_vector', table_name='task')
+        op.drop_column('task', 'search_vector')
+    elif dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS task_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS task_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS task_fts_ai")
+        op.execute("DROP TABLE IF EXISTS task_fts")
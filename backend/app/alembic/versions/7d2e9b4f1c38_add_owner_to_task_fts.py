@@ -0,0 +1,88 @@
+"""add owner column to the SQLite task full-text index
+
+SQLite only: rebuild task_fts with the task's owner_id as an indexed
+column, so a search matches `owner_id : "<hex>"` inside FTS5 instead of
+enumerating every user's matches and filtering them after the join.
+PostgreSQL is unchanged.
+
+Revision ID: 7d2e9b4f1c38
+Revises: 1c9f5a3e7b60
+Create Date: 2026-10-19 10:24:17.580192
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2e9b4f1c38'
+down_revision: Union[str, Sequence[str], None] = '1c9f5a3e7b60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _create_task_fts(columns: list[str]) -> None:
+    column_list = ", ".join(columns)
+    new_values = ", ".join(f"new.{name}" for name in columns)
+    old_values = ", ".join(f"old.{name}" for name in columns)
+    op.execute(
+        f"""
+        CREATE VIRTUAL TABLE task_fts USING fts5(
+            {column_list},
+            content='task', content_rowid='rowid',
+            tokenize='porter unicode61'
+        )
+        """
+    )
+    op.execute(
+        f"""
+        CREATE TRIGGER task_fts_ai AFTER INSERT ON task BEGIN
+            INSERT INTO task_fts(rowid, {column_list})
+            VALUES (new.rowid, {new_values});
+        END
+        """
+    )
+    op.execute(
+        f"""
+        CREATE TRIGGER task_fts_ad AFTER DELETE ON task BEGIN
+            INSERT INTO task_fts(task_fts, rowid, {column_list})
+            VALUES ('delete', old.rowid, {old_values});
+        END
+        """
+    )
+    op.execute(
+        f"""
+        CREATE TRIGGER task_fts_au AFTER UPDATE OF {column_list} ON task BEGIN
+            INSERT INTO task_fts(task_fts, rowid, {column_list})
+            VALUES ('delete', old.rowid, {old_values});
+            INSERT INTO task_fts(rowid, {column_list})
+            VALUES (new.rowid, {new_values});
+        END
+        """
+    )
+    op.execute("INSERT INTO task_fts(task_fts) VALUES ('rebuild')")
+
+
+def _drop_task_fts() -> None:
+    op.execute("DROP TRIGGER IF EXISTS task_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS task_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS task_fts_ai")
+    op.execute("DROP TABLE IF EXISTS task_fts")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == 'sqlite':
+        _drop_task_fts()
+        # owner_id last: snippet() then prefers title/description on ties.
+        _create_task_fts(['title', 'description', 'owner_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'sqlite':
+        _drop_task_fts()
+        _create_task_fts(['title', 'description'])
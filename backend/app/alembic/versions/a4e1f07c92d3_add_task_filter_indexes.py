@@ -0,0 +1,50 @@
+"""add task filter indexes
+
+Revision ID: a4e1f07c92d3
+Revises: 3c5d9e2a7b41
+Create Date: 2026-10-18 11:47:26.903114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4e1f07c92d3'
+down_revision: Union[str, Sequence[str], None] = '3c5d9e2a7b41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_task_owner_id_status_due_date',
+        'task',
+        ['owner_id', 'status', 'due_date'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_task_owner_id_priority',
+        'task',
+        ['owner_id', 'priority'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_task_owner_id_due_date_open',
+        'task',
+        ['owner_id', 'due_date'],
+        unique=False,
+        postgresql_where=sa.text("status <> 'COMPLETED'"),
+        sqlite_where=sa.text("status <> 'COMPLETED'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_task_owner_id_due_date_open', table_name='task')
+    op.drop_index('ix_task_owner_id_priority', table_name='task')
+    op.drop_index('ix_task_owner_id_status_due_date', table_name='task')
@@ -0,0 +1,52 @@
+"""add task counter table
+
+Revision ID: c7d2a9b4e813
+Revises: 5b8f3d6e1a27
+Create Date: 2026-10-18 14:21:09.655318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d2a9b4e813'
+down_revision: Union[str, Sequence[str], None] = '5b8f3d6e1a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('taskcounter',
+    sa.Column('owner_id', sa.Uuid(), nullable=False),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.Column('todo', sa.Integer(), nullable=False),
+    sa.Column('in_progress', sa.Integer(), nullable=False),
+    sa.Column('completed', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['owner_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('owner_id')
+    )
+    # Backfill one row per existing user from the current task table.
+    op.execute(
+        """
+        INSERT INTO taskcounter (owner_id, total, todo, in_progress, completed, version)
+        SELECT u.id,
+               count(t.id),
+               sum(CASE WHEN t.status = 'TODO' THEN 1 ELSE 0 END),
+               sum(CASE WHEN t.status = 'IN_PROGRESS' THEN 1 ELSE 0 END),
+               sum(CASE WHEN t.status = 'COMPLETED' THEN 1 ELSE 0 END),
+               0
+        FROM "user" u LEFT JOIN task t ON t.owner_id = u.id
+        GROUP BY u.id
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('taskcounter')
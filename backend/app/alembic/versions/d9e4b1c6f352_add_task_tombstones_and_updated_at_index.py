@@ -0,0 +1,39 @@
+"""add task tombstones and updated_at index
+
+Revision ID: d9e4b1c6f352
+Revises: c7d2a9b4e813
+Create Date: 2026-10-18 16:02:47.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9e4b1c6f352'
+down_revision: Union[str, Sequence[str], None] = 'c7d2a9b4e813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('tasktombstone',
+    sa.Column('task_id', sa.Uuid(), nullable=False),
+    sa.Column('owner_id', sa.Uuid(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['owner_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('task_id')
+    )
+    op.create_index('ix_tasktombstone_owner_id_deleted_at_task_id', 'tasktombstone', ['owner_id', 'deleted_at', 'task_id'], unique=False)
+    op.create_index('ix_task_owner_id_updated_at_id', 'task', ['owner_id', 'updated_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_task_owner_id_updated_at_id', table_name='task')
+    op.drop_index('ix_tasktombstone_owner_id_deleted_at_task_id', table_name='tasktombstone')
+    op.drop_table('tasktombstone')
@@ -0,0 +1,43 @@
+"""add task counter priority columns
+
+Revision ID: f3b8d2a6c417
+Revises: e1a7c3f5b920
+Create Date: 2026-10-18 19:02:47.318550
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b8d2a6c417'
+down_revision: Union[str, Sequence[str], None] = 'e1a7c3f5b920'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PRIORITIES = ('LOW', 'MEDIUM', 'HIGH', 'URGENT')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for priority in PRIORITIES:
+        op.add_column('taskcounter', sa.Column(f'priority_{priority.lower()}', sa.Integer(), nullable=False, server_default='0'))
+    # Backfill from the current task table.
+    op.execute(
+        "UPDATE taskcounter SET "
+        + ", ".join(
+            f"priority_{priority.lower()} = (SELECT count(*) FROM task t "
+            f"WHERE t.owner_id = taskcounter.owner_id AND t.priority = '{priority}')"
+            for priority in PRIORITIES
+        )
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('taskcounter') as batch_op:
+        for priority in reversed(PRIORITIES):
+            batch_op.drop_column(f'priority_{priority.lower()}')
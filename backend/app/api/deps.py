@@ -1,27 +1,53 @@
-from collections.abc import Generator
+import uuid
+from collections.abc import AsyncGenerator, Awaitable, Callable
 from typing import Annotated
 
 import jwt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from pydantic import ValidationError
-from sqlmodel import Session
+from sqlalchemy.orm import make_transient_to_detached
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.core.cache import user_cache
 from app.core.config import settings
-from app.core.db import engine
-from app.core.security import ALGORITHM
+from app.core.db import recent_writers, replicas, session_scope
+from app.core.rate_limit import Rate, rate_limiter
+from app.core.security import key_ring
 from app.models import TokenPayload, User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/login/access-token")
 
 
-def get_db() -> Generator[Session, None, None]:
-    with Session(engine) as session:
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session for the request: reads (GET/HEAD) go to a read replica when one
+    is configured and healthy, except for clients that wrote within
+    DB_READ_YOUR_WRITES_SECONDS, which might not see their write there yet.
+    """
+    read_only = False
+    if replicas:
+        client = request.headers.get("authorization")
+        if request.method in SAFE_METHODS:
+            read_only = not (client and recent_writers.wrote_recently(client))
+        elif client:
+            recent_writers.mark(client)
+    async with session_scope(read_only=read_only) as session:
+        yield session
+
+
+async def get_primary_db() -> AsyncGenerator[AsyncSession, None]:
+    async with session_scope() as session:
         yield session
 
-SessionDep = Annotated[Session, Depends(get_db)]
+SessionDep = Annotated[AsyncSession, Depends(get_db)]
+# For reads that must not lag behind writes (e.g. sync cursors)
+PrimarySessionDep = Annotated[AsyncSession, Depends(get_primary_db)]
 
-def get_current_user(session: SessionDep, token: str = Depends(oauth2_scheme)) -> User:
+async def get_current_user(session: SessionDep, token: str = Depends(oauth2_scheme)) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -29,14 +55,26 @@ def get_current_user(session: SessionDep, token: str = Depends(oauth2_scheme)) -
     )
     
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
+        payload = key_ring.decode(token)
         token_data = TokenPayload(**payload)
         if token_data.sub is None:
             raise credentials_exception
-    except (jwt.InvalidTokenError, ValidationError):
+        user_id = uuid.UUID(token_data.sub)
+    except (jwt.InvalidTokenError, ValidationError, ValueError):
         raise credentials_exception
     
-    user = session.get(User, token_data.sub)
+    cached = user_cache.get(token_data.sub)
+    if cached is not None:
+        # Attach a copy of the snapshot to this session without a round-trip.
+        return await session.merge(cached, load=False)
+
+    user = await session.get(User, user_id)
+    if user is None and replicas:
+        # A brand-new account may not have reached the read replica yet.
+        async with session_scope() as primary:
+            user = await primary.get(User, user_id)
+        if user is not None:
+            user = await session.merge(user, load=False)
     if user is None:
         raise credentials_exception
     if not user.is_active:
@@ -44,8 +82,46 @@ def get_current_user(session: SessionDep, token: str = Depends(oauth2_scheme)) -
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Inactive user",
         )
+    snapshot = User(**user.model_dump())
+    make_transient_to_detached(snapshot)
+    user_cache.set(token_data.sub, snapshot)
     return user
 
 
 # Type alias — so routes can just write: current_user: CurrentUser
 CurrentUser = Annotated[User, Depends(get_current_user)]
+
+
+def rate_limit_by_ip(name: str) -> Callable[[Request], Awaitable[None]]:
+    """Dependency applying the RATE_LIMITS[name] bucket per client IP."""
+    async def check(request: Request) -> None:
+        client_ip = request.client.host if request.client else "unknown"
+        await rate_limiter.hit(name, client_ip)
+    return check
+
+
+def rate_limit_by_user(name: str) -> Callable[[User], Awaitable[None]]:
+    """Dependency applying the RATE_LIMITS[name] bucket per authenticated user."""
+    async def check(current_user: CurrentUser) -> None:
+        await rate_limiter.hit(name, str(current_user.id))
+    return check
+
+
+async def consume_ai_quota(current_user: CurrentUser) -> None:
+    """Take one AI request from the user's AI_DAILY_LIMIT allowance."""
+    if not settings.AI_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="AI features are disabled",
+        )
+    # A quota, not an abuse limit: RATE_LIMIT_ENABLED=false does not lift it.
+    await rate_limiter.hit(
+        "ai",
+        str(current_user.id),
+        Rate(limit=settings.AI_DAILY_LIMIT, period=86400),
+        enforce=True,
+    )
+
+
+# Add to AI endpoints' dependencies; each call counts against the daily quota.
+AIQuota = Depends(consume_ai_quota)
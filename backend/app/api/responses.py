@@ -0,0 +1,19 @@
+"""
+Fast JSON responses for list endpoints.
+
+Routes that build their payload from plain column rows return these directly,
+which skips FastAPI's response_model validation and its jsonable_encoder
+pass. orjson serialises UUIDs, enums and datetimes natively.
+"""
+from typing import Any
+
+import orjson
+from fastapi import Response
+
+
+class ORJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        # OPT_UTC_Z writes "Z" for UTC, matching the pydantic-rendered responses.
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
@@ -3,10 +3,17 @@ API v1 Router — combines all v1 route files into a single router.
 """
 from fastapi import APIRouter
 
-from app.api.v1.routes import login, users, tasks, supabase_routes
+from app.api.v1.routes import login, users, tasks
+from app.core.config import settings
 
 api_router = APIRouter()
 api_router.include_router(login.router)
 api_router.include_router(users.router)
 api_router.include_router(tasks.router)
-api_router.include_router(supabase_routes.router)
+
+# The Supabase routes pull in the supabase/postgrest/httpx client stack, so
+# they are only imported (and mounted) on deployments that configure it.
+if settings.SUPABASE_URL and settings.SUPABASE_KEY:
+    from app.api.v1.routes import supabase_routes
+
+    api_router.include_router(supabase_routes.router)
@@ -10,7 +10,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 
 from app import crud
-from app.api.deps import SessionDep
+from app.api.deps import SessionDep, rate_limit_by_ip
 from app.core.config import settings
 from app.core.security import create_access_token
 from app.models import Token
@@ -18,12 +18,16 @@ from app.models import Token
 router = APIRouter(prefix="/login", tags=["login"])
 
 
-@router.post("/access-token", response_model=Token)
-def login_access_token(
+@router.post(
+    "/access-token",
+    response_model=Token,
+    dependencies=[Depends(rate_limit_by_ip("login"))],
+)
+async def login_access_token(
     session: SessionDep,
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
 ) -> Token:
-    user = crud.authenticate(
+    user = await crud.authenticate(
         session=session,
         email=form_data.username,  # OAuth2 spec uses "username" field for email
         password=form_data.password,
@@ -1,33 +1,41 @@
 import uuid
+from typing import Literal
 
 from fastapi import APIRouter, HTTPException, Query, status
 from postgrest.exceptions import APIError
 
+from app.core.config import settings
 from app.core.supabase_client import SupabaseClientDep
 
 router = APIRouter(prefix="/supabase", tags=["supabase"])
 
+CountMethod = Literal["exact", "planned", "estimated"]
+
 
 @router.get("/users")
-def list_users_via_supabase(
+async def list_users_via_supabase(
     supabase: SupabaseClientDep,
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=100, ge=1, le=500),
+    count: CountMethod | None = Query(default=None),
 ):
-    """List users via the Supabase REST API. Excludes hashed_password."""
+    """
+    List users via the Supabase REST API. Excludes hashed_password.
+
+    The page and the total come back in a single request; `count` picks the
+    counting strategy (defaults to SUPABASE_COUNT_METHOD).
+    """
     try:
-        response = (
+        response = await (
             supabase.table("user")
-            .select("id, email, full_name, is_active, is_superuser, created_at")
+            .select(
+                "id, email, full_name, is_active, is_superuser, created_at",
+                count=count or settings.SUPABASE_COUNT_METHOD,
+            )
             .range(skip, skip + limit - 1)
             .execute()
         )
-        count_response = (
-            supabase.table("user")
-            .select("id", count="exact")
-            .execute()
-        )
-        return {"data": response.data, "count": count_response.count}
+        return {"data": response.data, "count": response.count}
     except APIError as e:
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
@@ -36,10 +44,10 @@ def list_users_via_supabase(
 
 
 @router.get("/users/{user_id}")
-def get_user_via_supabase(user_id: uuid.UUID, supabase: SupabaseClientDep):
+async def get_user_via_supabase(user_id: uuid.UUID, supabase: SupabaseClientDep):
     """Get a single user by ID via the Supabase REST API."""
     try:
-        response = (
+        response = await (
             supabase.table("user")
             .select("id, email, full_name, is_active, is_superuser, created_at")
             .eq("id", str(user_id))
@@ -59,33 +67,33 @@ def get_user_via_supabase(user_id: uuid.UUID, supabase: SupabaseClientDep):
 
 
 @router.get("/tasks")
-def list_tasks_via_supabase(
+async def list_tasks_via_supabase(
     supabase: SupabaseClientDep,
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=100, ge=1, le=500),
     owner_id: uuid.UUID | None = Query(default=None),
     task_status: str | None = Query(default=None, alias="status"),
+    count: CountMethod | None = Query(default=None),
 ):
-    """List tasks via the Supabase REST API. Supports filtering by owner_id and status."""
+    """
+    List tasks via the Supabase REST API. Supports filtering by owner_id and status.
+
+    The page and the total come back in a single request; `count` picks the
+    counting strategy (defaults to SUPABASE_COUNT_METHOD).
+    """
     try:
         query = supabase.table("task").select(
-            "id, title, description, status, priority, due_date, created_at, updated_at, owner_id"
+            "id, title, description, status, priority, due_date, created_at, updated_at, owner_id",
+            count=count or settings.SUPABASE_COUNT_METHOD,
         )
         if owner_id:
             query = query.eq("owner_id", str(owner_id))
         if task_status:
             query = query.eq("status", task_status)
 
-        response = query.range(skip, skip + limit - 1).execute()
-
-        count_query = supabase.table("task").select("id", count="exact")
-        if owner_id:
-            count_query = count_query.eq("owner_id", str(owner_id))
-        if task_status:
-            count_query = count_query.eq("status", task_status)
-        count_response = count_query.execute()
+        response = await query.range(skip, skip + limit - 1).execute()
 
-        return {"data": response.data, "count": count_response.count}
+        return {"data": response.data, "count": response.count}
     except APIError as e:
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
@@ -94,10 +102,10 @@ def list_tasks_via_supabase(
 
 
 @router.get("/tasks/{task_id}")
-def get_task_via_supabase(task_id: uuid.UUID, supabase: SupabaseClientDep):
+async def get_task_via_supabase(task_id: uuid.UUID, supabase: SupabaseClientDep):
     """Get a single task by ID via the Supabase REST API."""
     try:
-        response = (
+        response = await (
             supabase.table("task")
             .select("id, title, description, status, priority, due_date, created_at, updated_at, owner_id")
             .eq("id", str(task_id))
@@ -2,32 +2,94 @@
 Task management endpoints.
 
 POST   /tasks/         →  Create a new task
-GET    /tasks/         →  List all your tasks
+GET    /tasks/         →  List your tasks (filter, sort, offset or cursor pagination)
+GET    /tasks/changes  →  Tasks changed or deleted since a sync cursor
+GET    /tasks/search   →  Full-text search over your tasks
+GET    /tasks/stream   →  Server-Sent Events for changes to your tasks
+GET    /tasks/export   →  Stream all your tasks as NDJSON or CSV
+POST   /tasks/import   →  Import tasks from an NDJSON or CSV upload
+POST   /tasks/bulk     →  Create many tasks in one transaction
+PATCH  /tasks/bulk     →  Update many tasks in one transaction
+DELETE /tasks/bulk     →  Delete many tasks in one transaction
 GET    /tasks/{id}     →  Get a specific task
+POST   /tasks/{id}/restore  →  Move an archived task back to your task list
 PATCH  /tasks/{id}     →  Update a task
 DELETE /tasks/{id}     →  Delete a task
 """
+import asyncio
 import uuid
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Annotated, Any
 
-from fastapi import APIRouter, HTTPException, status
-from sqlmodel import select, func, col
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import cast, null, union_all
+from sqlalchemy.orm import aliased
+from sqlmodel import and_, case, col, func, or_, select, tuple_
 
 from app import crud
-from app.api.deps import SessionDep, CurrentUser
+from app.api.deps import PrimarySessionDep, SessionDep, CurrentUser, rate_limit_by_user
+from app.api.etag import etag_matches, make_etag, not_modified, set_etag
+from app.api.responses import ORJSONResponse
+from app.core.config import settings
+from app.core.db import stream_rows
+from app.core.events import Subscription, TaskEvent, event_broker
+from app.core.pagination import (
+    InvalidCursorError,
+    decode_keyset_cursor,
+    decode_sync_cursor,
+    encode_keyset_cursor,
+    encode_sync_cursor,
+)
 from app.models import (
+    BulkItemResult,
+    BulkResults,
     Task,
+    TaskArchive,
+    TaskChanges,
+    TaskCounter,
     TaskCreate,
+    TaskImportReport,
+    TaskPriority,
     TaskPublic,
+    TaskSearchHit,
+    TaskSearchResults,
+    TaskStats,
+    TaskStatus,
+    TaskTombstone,
     TasksPublic,
     TaskUpdate,
+    TasksBulkCreate,
+    TasksBulkDelete,
+    TasksBulkUpdate,
     Message,
 )
+from app.task_io import (
+    EXPORT_COLUMNS,
+    MEDIA_TYPES,
+    ExportFormat,
+    ImportFormat,
+    encode_export,
+    import_tasks as load_task_file,
+)
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
 
 @router.post("/", response_model=TaskPublic)
-def create_task(
+async def create_task(
     *, session: SessionDep, current_user: CurrentUser, task_in: TaskCreate
 ) -> Task:
     """
@@ -36,56 +98,685 @@ def create_task(
     The task is automatically assigned to the logged-in user.
     Requires authentication.
     """
-    task = crud.create_task(
+    task = await crud.create_task(
         session=session, task_create=task_in, owner_id=current_user.id
     )
     return task
 
 
+def _as_utc(value: datetime) -> datetime:
+    """Normalise client datetimes to aware UTC; naive values are taken as UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+@dataclass
+class TaskFilters:
+    """Shared query filters for task listings."""
+
+    status: TaskStatus | None = None
+    priority: TaskPriority | None = None
+    due_before: datetime | None = None
+    due_after: datetime | None = None
+    overdue: bool | None = None
+    # The moment ?overdue= is evaluated at
+    now: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    def clauses(self, source: Any = Task) -> list[Any]:
+        """The filters as SQL WHERE clauses, on Task or an alias of it."""
+        clauses: list[Any] = []
+        if self.status is not None:
+            clauses.append(source.status == self.status)
+        if self.priority is not None:
+            clauses.append(source.priority == self.priority)
+        if self.due_before is not None:
+            clauses.append(col(source.due_date) < _as_utc(self.due_before))
+        if self.due_after is not None:
+            clauses.append(col(source.due_date) >= _as_utc(self.due_after))
+        if self.overdue is not None:
+            now = self.now
+            if self.overdue:
+                clauses.append(
+                    and_(col(source.due_date) < now, source.status != TaskStatus.COMPLETED)
+                )
+            else:
+                clauses.append(
+                    or_(
+                        col(source.due_date).is_(None),
+                        col(source.due_date) >= now,
+                        source.status == TaskStatus.COMPLETED,
+                    )
+                )
+        return clauses
+
+    @property
+    def counter_field(self) -> str | None:
+        """The TaskCounter column holding the matching count, if there is one."""
+        if (self.due_before, self.due_after, self.overdue) != (None,) * 3:
+            return None
+        if self.priority is not None:
+            if self.status is not None:
+                return None
+            return TaskCounter.priority_field(self.priority)
+        return self.status.value if self.status is not None else "total"
+
+
+def task_filters(
+    task_status: TaskStatus | None = Query(default=None, alias="status"),
+    priority: TaskPriority | None = None,
+    due_before: datetime | None = None,
+    due_after: datetime | None = None,
+    overdue: bool | None = None,
+) -> TaskFilters:
+    return TaskFilters(task_status, priority, due_before, due_after, overdue)
+
+
+TaskFiltersDep = Annotated[TaskFilters, Depends(task_filters)]
+
+
+def _sort_columns(source: Any) -> dict[str, Any]:
+    # Enums are stored by name, so rank them in declaration order (low to
+    # urgent, todo to completed) rather than alphabetically.
+    priority_rank = case(
+        *((source.priority == priority, rank) for rank, priority in enumerate(TaskPriority)),
+    )
+    status_rank = case(
+        *((source.status == task_status, rank) for rank, task_status in enumerate(TaskStatus)),
+    )
+    return {
+        "created_at": col(source.created_at),
+        "updated_at": col(source.updated_at),
+        "due_date": col(source.due_date),
+        "priority": priority_rank,
+        "status": status_rank,
+        "title": col(source.title),
+    }
+
+
+def _public_columns(source: Any) -> dict[str, Any]:
+    return {name: col(getattr(source, name)) for name in TaskPublic.model_fields}
+
+
+# Whitelisted ?sort= keys; prefix with "-" for descending order.
+TASK_SORT_COLUMNS: dict[str, Any] = _sort_columns(Task)
+
+# Columns of TaskPublic, in response order; ?fields= picks a subset.
+TASK_PUBLIC_COLUMNS: dict[str, Any] = _public_columns(Task)
+
+
+def _tasks_with_archive(owner_id: uuid.UUID) -> tuple[Any, Any]:
+    """
+    Task mapped onto the owner's live and archived tasks (UNION ALL), and
+    the union's archived_at column (NULL for live tasks).
+    """
+    names = [column.name for column in Task.__table__.columns]
+    task_table = Task.__table__
+    archive_table = TaskArchive.__table__
+    tasks = union_all(
+        select(
+            *(task_table.c[name] for name in names),
+            cast(null(), archive_table.c.archived_at.type).label("archived_at"),
+        ).where(task_table.c.owner_id == owner_id),
+        select(
+            *(archive_table.c[name] for name in names),
+            archive_table.c.archived_at,
+        ).where(archive_table.c.owner_id == owner_id),
+    ).subquery("tasks")
+    return aliased(Task, tasks, adapt_on_names=True), tasks.c.archived_at
+
+
+def _parse_fields(fields: str | None) -> list[str]:
+    if not fields:
+        return list(TASK_PUBLIC_COLUMNS)
+    names = (name.strip() for name in fields.split(","))
+    selected = list(dict.fromkeys(name for name in names if name))
+    if not selected or any(name not in TASK_PUBLIC_COLUMNS for name in selected):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"fields must be a subset of: {', '.join(TASK_PUBLIC_COLUMNS)}",
+        )
+    return selected
+
+
 @router.get("/", response_model=TasksPublic)
-def read_tasks(
+async def read_tasks(
+    request: Request,
     session: SessionDep,
     current_user: CurrentUser,
+    filters: TaskFiltersDep,
     skip: int = 0,
     limit: int = 100,
-) -> TasksPublic:
+    cursor: str | None = None,
+    sort: str = "created_at",
+    fields: str | None = None,
+    include_archived: bool = False,
+) -> Response:
     """
-    List all tasks belonging to the current user.
+    List tasks belonging to the current user.
+    
+    Filter with status, priority, due_before/due_after and overdue, and order
+    with sort (one of created_at, updated_at, due_date, priority, status,
+    title; prefix with "-" for descending). Default is oldest first.
+    priority and status sort in workflow order (low to urgent, todo to
+    completed), not alphabetically.
+    
+    Supports pagination with skip and limit. When sorting by created_at,
+    keyset pagination is also available by passing the `next_cursor` of the
+    previous page as `cursor` (skip is then ignored).
     
-    Supports pagination with skip and limit.
+    fields is an optional comma-separated list of task fields (e.g.
+    `id,title,status`); only those are selected and returned.
+
+    With include_archived=true, archived tasks are listed too, and every
+    task carries `archived_at` (null for tasks that are not archived).
+    
+    Responses carry a weak ETag; send it back as If-None-Match to get a 304
+    when nothing in the listing has changed.
     Requires authentication.
     """
-    # Count total tasks for this user
-    count_statement = (
-        select(func.count())
-        .select_from(Task)
-        .where(Task.owner_id == current_user.id)
-    )
-    count = session.exec(count_statement).one()
+    descending = sort.startswith("-")
+    sort_key = sort.removeprefix("-")
+    if sort_key not in TASK_SORT_COLUMNS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"sort must be one of: {', '.join(TASK_SORT_COLUMNS)}",
+        )
+    keyset = sort_key == "created_at"
+    if cursor and not keyset:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="cursor pagination requires sort=created_at or sort=-created_at",
+        )
+    selected = _parse_fields(fields)
+
+    # The per-user counter row gives the list version for the ETag and, for
+    # unfiltered or status-only listings, the total without a COUNT(*).
+    counter = await session.get(TaskCounter, current_user.id)
+    if counter is not None:
+        version: tuple[Any, ...] = (counter.version,)
+    else:
+        # No counter row: fall back to the newest updated_at as the version.
+        version = tuple(
+            (
+                await session.exec(
+                    select(func.count(), func.max(Task.updated_at)).where(
+                        Task.owner_id == current_user.id
+                    )
+                )
+            ).one()
+        )
+    if filters.overdue is not None:
+        # ?overdue= also depends on the clock: tasks become overdue without
+        # any write. Between writes the overdue set only grows, so its size
+        # pins the result (one count on the open-tasks due-date index).
+        overdue = TaskFilters(overdue=True, now=filters.now)
+        version += (
+            (
+                await session.exec(
+                    select(func.count())
+                    .select_from(Task)
+                    .where(Task.owner_id == current_user.id, *overdue.clauses())
+                )
+            ).one(),
+        )
+    etag = make_etag(current_user.id, request.url.query, *version)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    source: Any = Task
+    sort_columns, public_columns = TASK_SORT_COLUMNS, TASK_PUBLIC_COLUMNS
+    extra_columns: list[Any] = []
+    if include_archived:
+        # Archived tasks are not in the counters; count the union instead.
+        source, archived_at = _tasks_with_archive(current_user.id)
+        sort_columns, public_columns = _sort_columns(source), _public_columns(source)
+        extra_columns = [archived_at]
+
+    clauses = filters.clauses(source)
+    if counter is not None and filters.counter_field is not None and not include_archived:
+        count = getattr(counter, filters.counter_field)
+    else:
+        count = (
+            await session.exec(
+                select(func.count())
+                .select_from(source)
+                .where(source.owner_id == current_user.id, *clauses)
+            )
+        ).one()
     
-    # Fetch tasks with pagination
+    sort_column = sort_columns[sort_key]
+    if descending:
+        order_by = [sort_column.desc(), col(source.id).desc()]
+    else:
+        order_by = [sort_column.asc(), col(source.id).asc()]
+    if sort_key == "due_date":
+        order_by[0] = order_by[0].nulls_last()
+
+    # Plain column rows: no ORM instances, identity map or TaskPublic
+    # validation. The cursor columns ride along after the requested ones.
+    columns = [public_columns[name] for name in selected] + extra_columns
+    keys = selected + ["archived_at"] if include_archived else selected
+    if keyset:
+        columns += [col(source.created_at), col(source.id)]
+
+    # The default (created_at, id) order is served by ix_task_owner_id_created_at_id
     statement = (
-        select(Task)
-        .where(Task.owner_id == current_user.id)
-        .offset(skip)
+        select(*columns)
+        .where(source.owner_id == current_user.id, *clauses)
+        .order_by(*order_by)
         .limit(limit)
     )
-    tasks = session.exec(statement).all()
+    if cursor:
+        try:
+            after_created_at, after_id = decode_keyset_cursor(cursor)
+        except InvalidCursorError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            )
+        position = tuple_(col(source.created_at), col(source.id))
+        after = tuple_(after_created_at, after_id)
+        statement = statement.where(position < after if descending else position > after)
+    else:
+        statement = statement.offset(skip)
+    rows = (await session.execute(statement)).all()
+
+    next_cursor = None
+    if keyset and rows and len(rows) == limit:
+        next_cursor = encode_keyset_cursor(rows[-1][-2], rows[-1][-1])
+    
+    response = ORJSONResponse(
+        {
+            "data": [dict(zip(keys, row)) for row in rows],
+            "count": count,
+            "next_cursor": next_cursor,
+        }
+    )
+    set_etag(response, etag)
+    return response
+
+
+_MIN_ID = uuid.UUID(int=0)
+_MAX_ID = uuid.UUID(int=(1 << 128) - 1)
+
+
+@router.get("/changes", response_model=TaskChanges)
+async def read_task_changes(
+    # Cursors advance past settled rows; a lagging replica could skip some.
+    session: PrimarySessionDep,
+    current_user: CurrentUser,
+    since: str | None = None,
+    limit: int = Query(default=500, ge=1, le=1000),
+) -> Response:
+    """
+    Incremental sync: tasks created or updated, and ids of tasks deleted,
+    since the `next_cursor` of a previous call passed as `since`.
+    
+    Omit since for a first full sync. Keep calling while has_more is true,
+    then store next_cursor for the next sync. A cursor older than the
+    tombstone retention period gets a 410; start over without since.
+    Requires authentication.
+    """
+    # Rows stamped up to `now` are committed, however slow their transaction.
+    now = await crud.wait_for_task_writes(session=session, owner_id=current_user.id)
+    settled = now - timedelta(seconds=settings.SYNC_SETTLE_SECONDS)
+    if since:
+        try:
+            changed_after, deleted_after = decode_sync_cursor(since)
+        except InvalidCursorError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor",
+            )
+        if deleted_after[0] < now - timedelta(days=settings.TOMBSTONE_RETENTION_DAYS):
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail="Sync cursor expired; sync again without since",
+            )
+    else:
+        # A full sync returns every task; deletions only matter from now on.
+        changed_after = (datetime.min.replace(tzinfo=timezone.utc), _MIN_ID)
+        deleted_after = (settled, _MAX_ID)
+
+    # Both scans are served by the (owner_id, <timestamp>, id) indexes.
+    position = tuple_(col(Task.updated_at), col(Task.id))
+    rows = (
+        await session.execute(
+            select(*TASK_PUBLIC_COLUMNS.values())
+            .where(
+                Task.owner_id == current_user.id,
+                position > tuple_(*changed_after),
+                col(Task.updated_at) <= settled,
+            )
+            .order_by(col(Task.updated_at), col(Task.id))
+            .limit(limit)
+        )
+    ).all()
+    tombstone_position = tuple_(col(TaskTombstone.deleted_at), col(TaskTombstone.task_id))
+    tombstones = (
+        await session.execute(
+            select(TaskTombstone.deleted_at, TaskTombstone.task_id)
+            .where(
+                TaskTombstone.owner_id == current_user.id,
+                tombstone_position > tuple_(*deleted_after),
+                col(TaskTombstone.deleted_at) <= settled,
+            )
+            .order_by(col(TaskTombstone.deleted_at), col(TaskTombstone.task_id))
+            .limit(limit)
+        )
+    ).all()
+
+    # A full page resumes after its last row; a partial one has caught up
+    # to `settled`, so the cursor moves there and stays within retention.
+    if len(rows) == limit:
+        last = dict(zip(TASK_PUBLIC_COLUMNS, rows[-1]))
+        changed_after = (last["updated_at"], last["id"])
+    else:
+        changed_after = max(changed_after, (settled, _MAX_ID))
+    if len(tombstones) == limit:
+        deleted_after = tuple(tombstones[-1])
+    else:
+        deleted_after = max(deleted_after, (settled, _MAX_ID))
+
+    return ORJSONResponse(
+        {
+            "changed": [dict(zip(TASK_PUBLIC_COLUMNS, row)) for row in rows],
+            "deleted": [task_id for _, task_id in tombstones],
+            "next_cursor": encode_sync_cursor(changed_after, deleted_after),
+            "has_more": len(rows) == limit or len(tombstones) == limit,
+        }
+    )
+
+
+@router.get("/stats", response_model=TaskStats)
+async def read_task_stats(
+    session: SessionDep, current_user: CurrentUser, all_users: bool = False
+) -> TaskStats:
+    """
+    Task counts by status and by priority, and the number of overdue open
+    tasks, for dashboards; one cheap query instead of listing every task.
+
+    Superusers may pass all_users=true for the totals across all users.
+    Requires authentication.
+    """
+    if all_users and not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions",
+        )
+    return await crud.get_task_stats(
+        session=session, owner_id=None if all_users else current_user.id
+    )
+
+
+@router.get("/search", response_model=TaskSearchResults)
+async def search_tasks(
+    session: SessionDep,
+    current_user: CurrentUser,
+    q: str = Query(min_length=1, max_length=200),
+    skip: int = Query(default=0, ge=0),
+    limit: int = Query(default=20, ge=1, le=100),
+) -> TaskSearchResults:
+    """
+    Full-text search over the titles and descriptions of your tasks.
     
-    return TasksPublic(data=tasks, count=count)
+    Results are ranked by relevance and include a snippet with matches
+    wrapped in <mark> tags. Requires authentication.
+    """
+    hits = await crud.search_tasks(
+        session=session, owner_id=current_user.id, query=q, skip=skip, limit=limit
+    )
+    return TaskSearchResults(
+        data=[
+            TaskSearchHit.model_validate(task, update={"rank": rank, "snippet": snippet})
+            for task, rank, snippet in hits
+        ]
+    )
+
+
+async def _event_stream(subscription: Subscription) -> AsyncIterator[str]:
+    try:
+        # Tell the client the subscription is live before the first change.
+        yield "retry: 5000\nevent: ready\ndata: {}\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    subscription.queue.get(), settings.EVENTS_HEARTBEAT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                # Comment line: keeps proxies from closing an idle stream.
+                yield ": keepalive\n\n"
+                await event_broker.start()
+                continue
+            yield f"event: {event.type}\ndata: {event.to_json()}\n\n"
+    finally:
+        event_broker.unsubscribe(subscription)
+
+
+@router.get("/stream", response_class=StreamingResponse)
+async def stream_task_events(
+    session: SessionDep, current_user: CurrentUser
+) -> StreamingResponse:
+    """
+    Server-Sent Events stream of changes to your tasks.
+    
+    Emits `created`, `updated` and `deleted` events whose data holds the
+    task id (and the task itself where available). A `resync` event means
+    events were dropped because the client fell behind; refetch the task
+    list. Clients should also refetch after reconnecting.
+    Requires authentication.
+    """
+    await event_broker.start()
+    subscription = event_broker.subscribe(current_user.id)
+    # The stream can stay open for hours; don't hold a pooled connection.
+    await session.close()
+    return StreamingResponse(
+        _event_stream(subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_tasks(
+    current_user: CurrentUser,
+    filters: TaskFiltersDep,
+    export_format: ExportFormat = Query(default="ndjson", alias="format"),
+    all_users: bool = False,
+) -> StreamingResponse:
+    """
+    Export your tasks as NDJSON (one task per line) or CSV.
+    
+    The response is streamed from a server-side cursor, so any number of
+    tasks can be exported in one request. Accepts the same filters as the
+    task listing. Superusers may pass all_users=true to export every
+    user's tasks.
+    Requires authentication.
+    """
+    if all_users and not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions",
+        )
+    statement = select(*EXPORT_COLUMNS).where(*filters.clauses())
+    if all_users:
+        statement = statement.order_by(
+            col(Task.owner_id), col(Task.created_at), col(Task.id)
+        )
+    else:
+        statement = statement.where(Task.owner_id == current_user.id).order_by(
+            col(Task.created_at), col(Task.id)
+        )
+    rows = stream_rows(statement, chunk_size=settings.EXPORT_CHUNK_SIZE)
+    return StreamingResponse(
+        encode_export(rows, export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="tasks.{export_format}"'
+        },
+    )
+
+
+@router.post(
+    "/import",
+    response_model=TaskImportReport,
+    dependencies=[Depends(rate_limit_by_user("import"))],
+)
+async def import_tasks(
+    session: SessionDep,
+    current_user: CurrentUser,
+    file: UploadFile,
+    import_format: ImportFormat = Query(default="ndjson", alias="format"),
+) -> TaskImportReport:
+    """
+    Import tasks from an NDJSON or CSV file (same fields as task creation).
+    
+    Rows are validated one by one and loaded in chunks; invalid rows are
+    skipped and listed in the report with their line numbers.
+    Requires authentication.
+    """
+    report = await run_in_threadpool(
+        load_task_file,
+        file.file,
+        owner_id=current_user.id,
+        import_format=import_format,
+        chunk_size=settings.IMPORT_CHUNK_SIZE,
+    )
+    if report.imported:
+        await crud.reconcile_task_counters(session=session, owner_id=current_user.id)
+        # Too many rows for per-task events; streams refetch instead.
+        await event_broker.publish([TaskEvent(type="resync", owner_id=current_user.id)])
+    return report
+
+
+def _check_bulk_size(count: int) -> None:
+    if count > settings.BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.BULK_MAX_ITEMS} items per bulk request",
+        )
+
+
+@router.post(
+    "/bulk",
+    response_model=BulkResults,
+    dependencies=[Depends(rate_limit_by_user("bulk"))],
+)
+async def create_tasks_bulk(
+    *, session: SessionDep, current_user: CurrentUser, tasks_in: TasksBulkCreate
+) -> BulkResults:
+    """
+    Create many tasks at once.
+    
+    All tasks are inserted in a single transaction and assigned to the
+    logged-in user. Results are returned in request order.
+    Requires authentication.
+    """
+    _check_bulk_size(len(tasks_in.items))
+    task_ids = await crud.create_tasks(
+        session=session, tasks_create=tasks_in.items, owner_id=current_user.id
+    )
+    return BulkResults(
+        results=[
+            BulkItemResult(index=index, id=task_id, status="created")
+            for index, task_id in enumerate(task_ids)
+        ]
+    )
+
+
+@router.patch(
+    "/bulk",
+    response_model=BulkResults,
+    dependencies=[Depends(rate_limit_by_user("bulk"))],
+)
+async def update_tasks_bulk(
+    *, session: SessionDep, current_user: CurrentUser, tasks_in: TasksBulkUpdate
+) -> BulkResults:
+    """
+    Update many of your tasks at once (partial updates).
+    
+    Items whose task does not exist or is not yours are reported as
+    "not_found"; the others are applied in a single transaction.
+    Requires authentication.
+    """
+    _check_bulk_size(len(tasks_in.items))
+    updated = await crud.update_tasks(
+        session=session, items=tasks_in.items, owner_id=current_user.id
+    )
+    return BulkResults(
+        results=[
+            BulkItemResult(
+                index=index,
+                id=item.id,
+                status="updated" if item.id in updated else "not_found",
+            )
+            for index, item in enumerate(tasks_in.items)
+        ]
+    )
+
+
+@router.delete(
+    "/bulk",
+    response_model=BulkResults,
+    dependencies=[Depends(rate_limit_by_user("bulk"))],
+)
+async def delete_tasks_bulk(
+    *, session: SessionDep, current_user: CurrentUser, tasks_in: TasksBulkDelete
+) -> BulkResults:
+    """
+    Delete many of your tasks at once.
+    
+    Ids that do not exist or are not yours are reported as "not_found".
+    Requires authentication.
+    """
+    _check_bulk_size(len(tasks_in.ids))
+    deleted = await crud.delete_tasks(
+        session=session, task_ids=tasks_in.ids, owner_id=current_user.id
+    )
+    return BulkResults(
+        results=[
+            BulkItemResult(
+                index=index,
+                id=task_id,
+                status="deleted" if task_id in deleted else "not_found",
+            )
+            for index, task_id in enumerate(tasks_in.ids)
+        ]
+    )
 
 
 @router.get("/{task_id}", response_model=TaskPublic)
-def read_task(
-    task_id: uuid.UUID, session: SessionDep, current_user: CurrentUser
+async def read_task(
+    task_id: uuid.UUID,
+    request: Request,
+    response: Response,
+    session: SessionDep,
+    current_user: CurrentUser,
 ) -> Task:
     """
     Get a specific task by ID.
     
     Users can only access their own tasks (unless superuser).
+    Supports If-None-Match with the weak ETag from a previous response.
     Requires authentication.
     """
-    task = session.get(Task, task_id)
+    if request.headers.get("if-none-match"):
+        # Revalidation only needs the version columns, not the whole row.
+        version = (
+            await session.exec(
+                select(Task.owner_id, Task.updated_at).where(Task.id == task_id)
+            )
+        ).first()
+        if version is not None:
+            owner_id, updated_at = version
+            etag = make_etag(task_id, updated_at)
+            if (
+                owner_id == current_user.id or current_user.is_superuser
+            ) and etag_matches(request, etag):
+                return not_modified(etag)  # type: ignore[return-value]
+
+    task = await session.get(Task, task_id)
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -96,11 +787,37 @@ def read_task(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions",
         )
+    set_etag(response, make_etag(task.id, task.updated_at))
     return task
 
 
+@router.post("/{task_id}/restore", response_model=TaskPublic)
+async def restore_task(
+    task_id: uuid.UUID, session: SessionDep, current_user: CurrentUser
+) -> Task:
+    """
+    Move an archived task back to the task list.
+
+    Only the task owner (or superuser) can restore it.
+    Requires authentication.
+    """
+    archived = await crud.get_archived_task(session=session, task_id=task_id)
+    if not archived:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Archived task not found",
+        )
+    if archived.owner_id != current_user.id and not current_user.is_superuser:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions",
+        )
+
+    return await crud.restore_task(session=session, archived=archived)
+
+
 @router.patch("/{task_id}", response_model=TaskPublic)
-def update_task(
+async def update_task(
     *,
     session: SessionDep,
     current_user: CurrentUser,
@@ -114,7 +831,7 @@ def update_task(
     Only updates fields that are provided (partial update).
     Requires authentication.
     """
-    task = session.get(Task, task_id)
+    task = await session.get(Task, task_id)
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -126,12 +843,12 @@ def update_task(
             detail="Not enough permissions",
         )
     
-    task = crud.update_task(session=session, db_task=task, task_update=task_in)
+    task = await crud.update_task(session=session, db_task=task, task_update=task_in)
     return task
 
 
 @router.delete("/{task_id}", response_model=Message)
-def delete_task(
+async def delete_task(
     task_id: uuid.UUID, session: SessionDep, current_user: CurrentUser
 ) -> Message:
     """
@@ -140,7 +857,7 @@ def delete_task(
     Only the task owner (or superuser) can delete it.
     Requires authentication.
     """
-    task = session.get(Task, task_id)
+    task = await session.get(Task, task_id)
     if not task:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -152,5 +869,5 @@ def delete_task(
             detail="Not enough permissions",
         )
     
-    crud.delete_task(session=session, db_task=task)
+    await crud.delete_task(session=session, db_task=task)
     return Message(message="Task deleted successfully")
@@ -1,8 +1,10 @@
-from fastapi import APIRouter, HTTPException, status
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlmodel import select, func
 
 from app import crud
-from app.api.deps import SessionDep, CurrentUser
+from app.api.deps import SessionDep, CurrentUser, rate_limit_by_ip, rate_limit_by_user
 from app.models import (
     User,
     UserCreate,
@@ -15,29 +17,33 @@ from app.models import (
 router = APIRouter(prefix="/users", tags=["users"])
 
 
-@router.post("/signup", response_model=UserPublic)
-def create_user(*, session: SessionDep, user_in: UserCreate) -> User:
+@router.post(
+    "/signup",
+    response_model=UserPublic,
+    dependencies=[Depends(rate_limit_by_ip("signup"))],
+)
+async def create_user(*, session: SessionDep, user_in: UserCreate) -> User:
     """
     Register a new user account.
     
     This endpoint is public — no authentication required.
     """
     # Check if email already exists
-    existing_user = session.exec(
+    existing_user = (await session.exec(
         select(User).where(User.email == user_in.email)
-    ).first()
+    )).first()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="A user with this email already exists",
         )
     
-    user = crud.create_user(session=session, user_create=user_in)
+    user = await crud.create_user(session=session, user_create=user_in)
     return user
 
 
 @router.get("/me", response_model=UserPublic)
-def read_user_me(current_user: CurrentUser) -> User:
+async def read_user_me(current_user: CurrentUser) -> User:
     """
     Get the current logged-in user's profile.
     
@@ -46,8 +52,12 @@ def read_user_me(current_user: CurrentUser) -> User:
     return current_user
 
 
-@router.patch("/me", response_model=UserPublic)
-def update_user_me(
+@router.patch(
+    "/me",
+    response_model=UserPublic,
+    dependencies=[Depends(rate_limit_by_user("account"))],
+)
+async def update_user_me(
     *, session: SessionDep, current_user: CurrentUser, user_in: UserUpdate
 ) -> User:
     """
@@ -58,22 +68,22 @@ def update_user_me(
     """
     # If changing email, check it's not already taken
     if user_in.email:
-        existing_user = session.exec(
+        existing_user = (await session.exec(
             select(User).where(User.email == user_in.email)
-        ).first()
+        )).first()
         if existing_user and existing_user.id != current_user.id:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="A user with this email already exists",
             )
 
-    user = crud.update_user(session=session, db_user=current_user, user_update=user_in)
+    user = await crud.update_user(session=session, db_user=current_user, user_update=user_in)
     return user
 
 
 @router.get("/{user_id}", response_model=UserPublic)
-def read_user_by_id(
-    user_id: str, session: SessionDep, current_user: CurrentUser
+async def read_user_by_id(
+    user_id: uuid.UUID, session: SessionDep, current_user: CurrentUser
 ) -> User:
     """
     Get a specific user by ID.
@@ -81,7 +91,7 @@ def read_user_by_id(
     - Regular users can only read their own profile.
     - Superusers can read any user's profile.
     """
-    user = session.get(User, user_id)
+    user = await session.get(User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
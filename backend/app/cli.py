@@ -0,0 +1,112 @@
+"""
+Maintenance commands.
+
+Run from the backend directory, e.g.:
+
+    python -m app.cli reconcile-counters
+    python -m app.cli import-tasks --owner-email me@example.com tasks.ndjson
+    python -m app.cli prune-tombstones
+    python -m app.cli archive-tasks --days 90
+"""
+import argparse
+import asyncio
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlmodel import select
+from starlette.concurrency import run_in_threadpool
+
+from app import crud
+from app.core.config import settings
+from app.core.db import session_scope
+from app.models import User
+from app.task_archive import archive_completed_tasks
+from app.task_io import import_tasks as load_task_file
+
+
+async def reconcile_counters(args: argparse.Namespace) -> None:
+    async with session_scope() as session:
+        repaired = await crud.reconcile_task_counters(
+            session=session, owner_id=args.owner_id
+        )
+    print(f"Repaired {repaired} task counter row(s)")
+
+
+async def import_tasks(args: argparse.Namespace) -> None:
+    async with session_scope() as session:
+        owner = (
+            await session.exec(select(User).where(User.email == args.owner_email))
+        ).first()
+        if owner is None:
+            raise SystemExit(f"No user with email {args.owner_email}")
+        import_format = args.format or ("csv" if args.path.endswith(".csv") else "ndjson")
+        with open(args.path, "rb") as file:
+            report = await run_in_threadpool(
+                load_task_file,
+                file,
+                owner_id=owner.id,
+                import_format=import_format,
+                chunk_size=args.chunk_size,
+            )
+        if report.imported:
+            await crud.reconcile_task_counters(session=session, owner_id=owner.id)
+    print(json.dumps(report.model_dump(), indent=2))
+
+
+async def prune_tombstones(args: argparse.Namespace) -> None:
+    older_than = datetime.now(timezone.utc) - timedelta(days=args.days)
+    async with session_scope() as session:
+        pruned = await crud.prune_task_tombstones(session=session, older_than=older_than)
+    print(f"Pruned {pruned} task tombstone(s) older than {args.days} day(s)")
+
+
+async def archive_tasks(args: argparse.Namespace) -> None:
+    older_than = datetime.now(timezone.utc) - timedelta(days=args.days)
+    archived = await archive_completed_tasks(older_than=older_than, batch_size=args.batch_size)
+    print(f"Archived {archived} task(s) completed more than {args.days} day(s) ago")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    reconcile = commands.add_parser(
+        "reconcile-counters",
+        help="Recompute per-user task counters from the task table",
+    )
+    reconcile.add_argument("--owner-id", type=uuid.UUID, default=None, help="Only this user")
+    reconcile.set_defaults(handler=reconcile_counters)
+
+    importer = commands.add_parser(
+        "import-tasks",
+        help="Bulk-load tasks for one user from an NDJSON or CSV file",
+    )
+    importer.add_argument("path", help="File to import")
+    importer.add_argument("--owner-email", required=True, help="User who will own the tasks")
+    importer.add_argument("--format", choices=["ndjson", "csv"], default=None,
+                          help="Defaults to csv for *.csv files, ndjson otherwise")
+    importer.add_argument("--chunk-size", type=int, default=settings.IMPORT_CHUNK_SIZE)
+    importer.set_defaults(handler=import_tasks)
+
+    prune = commands.add_parser(
+        "prune-tombstones",
+        help="Delete deleted-task markers past the sync retention period",
+    )
+    prune.add_argument("--days", type=int, default=settings.TOMBSTONE_RETENTION_DAYS)
+    prune.set_defaults(handler=prune_tombstones)
+
+    archive = commands.add_parser(
+        "archive-tasks",
+        help="Move old completed tasks to the task_archive table",
+    )
+    archive.add_argument("--days", type=int, default=settings.ARCHIVE_AFTER_DAYS)
+    archive.add_argument("--batch-size", type=int, default=settings.ARCHIVE_BATCH_SIZE)
+    archive.set_defaults(handler=archive_tasks)
+
+    args = parser.parse_args(argv)
+    asyncio.run(args.handler(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 import secrets
 import warnings
-from typing import Any, Annotated
+from typing import Any, Annotated, Literal
 
 from pydantic import (
     AnyUrl,
@@ -30,11 +30,28 @@ class Settings(BaseSettings):
 
     PROJECT_NAME: str = "TaskLine"
     API_V1_STR: str = "/api/v1"
+    # Without SECRET_KEY or JWT_KEYS a random key is generated per process,
+    # which only works for a single local process (see check_signing_keys).
     SECRET_KEY: str = secrets.token_urlsafe(32)
+    # Signing key ring, {"kid": "secret", ...}, identical on every node.
+    # Tokens are signed with JWT_ACTIVE_KID and verified with the key named
+    # by their kid header; tokens without a kid are verified with SECRET_KEY.
+    JWT_KEYS: dict[str, str] = {}
+    JWT_ACTIVE_KID: str | None = None
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     ALGORITHM: str = "HS256"
     FRONTEND_URL: str = "http://localhost:3000"
     ENVIRONMENT: str = "local"
+    # `python -m app.server`: worker processes (WEB_CONCURRENCY, as read by
+    # gunicorn/uvicorn) and whether the parent imports the app first.
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    WEB_CONCURRENCY: int = 1
+    SERVER_PRELOAD: bool = True
+    # Adds a Server-Timing header (db/app time) to every response
+    DEBUG: bool = False
+    # Log SQL statements slower than this (0 disables)
+    SLOW_QUERY_MS: float = 200.0
 
     BACKEND_CORS_ORIGINS: Annotated[
         list[AnyUrl] | str, BeforeValidator(parse_cors)
@@ -56,8 +73,48 @@ class Settings(BaseSettings):
     DB_USER: str = "postgres"
     DB_PASSWORD: str = ""
 
+    # Serve requests from an AsyncEngine (aiosqlite / asyncpg). When off, the
+    # blocking engine is used and each query runs on the threadpool.
+    DB_ASYNC: bool = False
+
+    # Connection pool. Pre-ping and recycle guard against connections closed
+    # behind our back (e.g. by the Supabase pooler).
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Connections opened at startup so the first requests don't pay for
+    # connecting (capped at DB_POOL_SIZE; 0 disables).
+    DB_POOL_WARMUP: int = 2
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+
+    # Read replicas: comma-separated URLs in DATABASE_URL form. GET requests
+    # read from a healthy replica unless the same client wrote within
+    # DB_READ_YOUR_WRITES_SECONDS. Replicas failing the periodic health check
+    # or lagging more than DB_REPLICA_MAX_LAG_SECONDS are ejected until they
+    # recover.
+    DB_REPLICA_URLS: Annotated[list[str] | str, BeforeValidator(parse_cors)] = []
+    DB_REPLICA_MAX_LAG_SECONDS: float = 2.0
+    DB_REPLICA_CHECK_INTERVAL_SECONDS: float = 5.0
+    DB_READ_YOUR_WRITES_SECONDS: float = 5.0
+
     SUPABASE_URL: str = ""
     SUPABASE_KEY: str = ""
+    SUPABASE_MAX_CONNECTIONS: int = 20
+    SUPABASE_TIMEOUT_SECONDS: float = 30.0
+    # Default count strategy for list endpoints; "planned"/"estimated" avoid
+    # a full COUNT(*) on large tables.
+    SUPABASE_COUNT_METHOD: Literal["exact", "planned", "estimated"] = "exact"
+
+    # bcrypt runs in a process pool; extra requests beyond the cap get a 503
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
+
+    # In-process cache of authenticated users (see app/core/cache.py)
+    USER_CACHE_MAX_SIZE: int = 10_000
+    USER_CACHE_TTL_SECONDS: float = 60.0
 
     @computed_field
     @property
@@ -68,6 +125,85 @@ class Settings(BaseSettings):
         password = quote_plus(self.DB_PASSWORD)
         return f"postgresql://{self.DB_USER}:{password}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
+    @computed_field
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        if self.DB_ENGINE == "sqlite":
+            return f"sqlite+aiosqlite:///{self.SQLITE_DATABASE_NAME}"
+        return self.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+    @computed_field
+    @property
+    def ASYNC_DB_REPLICA_URLS(self) -> list[str]:
+        return [
+            url.strip()
+            .replace("sqlite://", "sqlite+aiosqlite://", 1)
+            .replace("postgresql://", "postgresql+asyncpg://", 1)
+            for url in self.DB_REPLICA_URLS
+        ]
+
+    # Maximum number of items accepted by the /tasks/bulk endpoints
+    BULK_MAX_ITEMS: int = 1000
+    # Rows fetched per server-side cursor round-trip by /tasks/export
+    EXPORT_CHUNK_SIZE: int = 1000
+    # Rows per COPY / executemany batch (and commit) for task imports
+    IMPORT_CHUNK_SIZE: int = 5000
+
+    # Task change events for /tasks/stream (see app/core/events.py). Use
+    # "postgres" (LISTEN/NOTIFY) to fan out across several worker processes.
+    EVENTS_BACKEND: Literal["memory", "postgres"] = "memory"
+    EVENTS_PG_CHANNEL: str = "task_events"
+    # Events buffered per stream before a slow client is told to resync
+    EVENTS_QUEUE_SIZE: int = 100
+    EVENTS_HEARTBEAT_SECONDS: float = 15.0
+
+    # Due-date reminders (see app/core/reminders.py), sent by whichever
+    # worker holds the scheduler lease. "due_soon" fires
+    # REMINDER_LEAD_MINUTES before the due date, "overdue" at it.
+    REMINDERS_ENABLED: bool = False
+    REMINDER_LEAD_MINUTES: float = 60.0
+    # Look-ahead loaded into memory by each scan of the due-date index
+    REMINDER_WINDOW_MINUTES: float = 15.0
+    # After downtime, reminders missed for longer than this are skipped
+    REMINDER_MAX_CATCHUP_MINUTES: float = 60.0
+    REMINDER_LEASE_SECONDS: float = 30.0
+    REMINDER_SINK: Literal["log", "webhook"] = "log"
+    REMINDER_WEBHOOK_URL: str = ""
+
+    # Archival of completed tasks (see app/task_archive.py): tasks completed
+    # more than ARCHIVE_AFTER_DAYS ago move to task_archive, ARCHIVE_BATCH_SIZE
+    # rows per transaction. With ARCHIVE_ENABLED, the worker holding the
+    # archiver lease runs it every ARCHIVE_INTERVAL_MINUTES; otherwise use
+    # `python -m app.cli archive-tasks`.
+    ARCHIVE_ENABLED: bool = False
+    ARCHIVE_AFTER_DAYS: int = 90
+    ARCHIVE_BATCH_SIZE: int = 1000
+    ARCHIVE_INTERVAL_MINUTES: float = 60.0
+
+    # Delta sync (GET /tasks/changes). Deletions are remembered for this
+    # long; older sync cursors get a 410 and must resync from scratch.
+    TOMBSTONE_RETENTION_DAYS: int = 30
+    # Changes newer than this are held back, as a margin for clock skew
+    # between app servers. Slow write transactions are waited for instead
+    # (crud.wait_for_task_writes), so this need not outlast them.
+    SYNC_SETTLE_SECONDS: float = 1.0
+
+    # Token-bucket limits as "<count>/<second|minute|hour|day>"; see
+    # app/core/rate_limit.py. "memory" limits each worker separately, "sql"
+    # shares buckets through the database. An empty value disables a limit.
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: Literal["memory", "sql"] = "memory"
+    RATE_LIMIT_MEMORY_MAX_KEYS: int = 100_000
+    RATE_LIMITS: dict[str, str] = {
+        "login": "10/minute",  # per client IP
+        "signup": "5/hour",  # per client IP
+        "account": "10/minute",  # per user: profile and password changes
+        "bulk": "60/minute",  # per user: /tasks/bulk
+        "import": "10/hour",  # per user: /tasks/import
+    }
+
+    # AI_DAILY_LIMIT is enforced per user as a bucket refilling over a day,
+    # through RATE_LIMIT_BACKEND even when RATE_LIMIT_ENABLED is false.
     AI_ENABLED: bool = True
     AI_MODEL: str = "gpt-4o-mini"
     AI_DAILY_LIMIT: int = 100
@@ -86,10 +222,36 @@ class Settings(BaseSettings):
             else:
                 raise ValueError(message)
 
+    @property
+    def ephemeral_secret_key(self) -> bool:
+        """True if tokens would be signed with this process's random SECRET_KEY."""
+        return not self.JWT_KEYS and "SECRET_KEY" not in self.model_fields_set
+
     @model_validator(mode="after")
     def enforce_non_default_secrets(self) -> Self:
         self.check_default_secret("SECRET_KEY", self.SECRET_KEY)
         self.check_default_secret("FIRST_SUPERUSER_PASSWORD", self.FIRST_SUPERUSER_PASSWORD)
+        for kid, key in self.JWT_KEYS.items():
+            self.check_default_secret(f"JWT_KEYS[{kid!r}]", key)
+        return self
+
+    @model_validator(mode="after")
+    def check_signing_keys(self) -> Self:
+        if self.JWT_KEYS:
+            if self.JWT_ACTIVE_KID is None and len(self.JWT_KEYS) == 1:
+                self.JWT_ACTIVE_KID = next(iter(self.JWT_KEYS))
+            if self.JWT_ACTIVE_KID not in self.JWT_KEYS:
+                raise ValueError(
+                    f"JWT_ACTIVE_KID must name one of the JWT_KEYS ({', '.join(self.JWT_KEYS)})"
+                )
+        elif self.JWT_ACTIVE_KID is not None:
+            raise ValueError("JWT_ACTIVE_KID is set but JWT_KEYS is empty")
+        if self.ephemeral_secret_key and self.ENVIRONMENT != "local":
+            # Every worker would sign with its own key and reject the others' tokens.
+            raise ValueError(
+                "Set SECRET_KEY or JWT_KEYS: a per-process random signing key is only "
+                'allowed with ENVIRONMENT="local"'
+            )
         return self
 
 
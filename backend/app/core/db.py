@@ -1,21 +1,512 @@
+import asyncio
+import itertools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import AsyncGenerator, AsyncIterator, Callable, Sequence
+from contextlib import asynccontextmanager
+from typing import Any, TypeVar
+
+from sqlalchemy import Engine, Executable, Row, event, exc, text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
 from sqlmodel import Session, create_engine, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
 from app import crud
 from app.core.config import settings
+from app.core.metrics import record_query
 from app.models import User, UserCreate
 
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+class PoolStats:
+    """Counters for one connection pool; read via get_pool_stats()."""
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self._lock = threading.Lock()
+
+    def record_checkout(self, waited: float, timed_out: bool) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "wait_seconds_total": round(self.wait_seconds_total, 6),
+            "wait_seconds_max": round(self.wait_seconds_max, 6),
+        }
+
+
+class _CheckoutTimingMixin:
+    """Times how long each checkout waits for a free connection."""
+
+    stats: PoolStats
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def recreate(self) -> Pool:
+        new_pool = super().recreate()  # type: ignore[misc]
+        new_pool.stats = self.stats
+        return new_pool
+
+    def _do_get(self) -> Any:
+        started = time.perf_counter()
+        try:
+            record = super()._do_get()  # type: ignore[misc]
+        except exc.TimeoutError:
+            self.stats.record_checkout(time.perf_counter() - started, timed_out=True)
+            raise
+        self.stats.record_checkout(time.perf_counter() - started, timed_out=False)
+        return record
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _pool_kwargs() -> dict[str, Any]:
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def _instrument_engine(sync_engine: Engine) -> None:
+    """
+    Hook pool and statement events (for pool stats and query metrics), and
+    apply SQLite pragmas on every new connection.
+    """
+    stats: PoolStats = sync_engine.pool.stats  # type: ignore[attr-defined]
+
+    @event.listens_for(sync_engine, "connect")
+    def _on_connect(dbapi_connection: Any, connection_record: Any) -> None:
+        stats.connects += 1
+        if sync_engine.dialect.name == "sqlite":
+            cursor = dbapi_connection.cursor()
+            # WAL lets readers proceed while a writer holds the lock, and the
+            # busy timeout makes writers wait instead of failing immediately.
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+            cursor.close()
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _on_before_execute(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _on_after_execute(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        started = conn.info["query_started"].pop()
+        record_query(time.perf_counter() - started, statement)
+
+    @event.listens_for(sync_engine, "invalidate")
+    def _on_invalidate(dbapi_connection: Any, connection_record: Any, exception: Any) -> None:
+        stats.invalidations += 1
+
+
 connect_args = {}
+async_connect_args = {}
 if settings.DB_ENGINE == "sqlite":
     connect_args["check_same_thread"] = False
 elif settings.DB_ENGINE == "postgresql":
     connect_args["sslmode"] = "require"
+    async_connect_args["ssl"] = "require"
+
+# The synchronous engine is always available: Alembic, CLI commands and the
+# threaded session below all use it.
+engine = create_engine(
+    settings.DATABASE_URL,
+    connect_args=connect_args,
+    poolclass=InstrumentedQueuePool,
+    **_pool_kwargs(),
+)
+_instrument_engine(engine)
+
+async_engine: AsyncEngine | None = None
+if settings.DB_ASYNC:
+    async_engine = create_async_engine(
+        settings.ASYNC_DATABASE_URL,
+        connect_args=async_connect_args,
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        **_pool_kwargs(),
+    )
+    _instrument_engine(async_engine.sync_engine)
+
+
+# Replication lag in seconds; zero on a primary, or when the standby has
+# replayed everything it received (an idle primary writes nothing to replay).
+_PG_REPLICA_LAG = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+class Replica:
+    """A read replica: its engine, for the configured mode, and its health."""
+
+    def __init__(self, name: str, url: str, async_url: str) -> None:
+        self.name = name
+        self.engine: Engine | None = None
+        self.async_engine: AsyncEngine | None = None
+        if settings.DB_ASYNC:
+            self.async_engine = create_async_engine(
+                async_url,
+                connect_args=async_connect_args,
+                poolclass=InstrumentedAsyncAdaptedQueuePool,
+                **_pool_kwargs(),
+            )
+            self.sync_engine = self.async_engine.sync_engine
+        else:
+            self.engine = create_engine(
+                url,
+                connect_args=connect_args,
+                poolclass=InstrumentedQueuePool,
+                **_pool_kwargs(),
+            )
+            self.sync_engine = self.engine
+        _instrument_engine(self.sync_engine)
+        # Out of rotation until the first health check passes.
+        self.healthy = False
+        self.lag_seconds: float | None = None
+        self.error: str | None = "not checked yet"
+
+        @event.listens_for(self.sync_engine, "handle_error")
+        def _on_error(context: Any) -> None:
+            # A lost or refused connection takes the replica out of rotation
+            # at once instead of failing reads until the next check.
+            if context.is_disconnect or context.connection is None:
+                self.eject(f"{type(context.original_exception).__name__}: {context.original_exception}")
+
+    def eject(self, reason: str) -> None:
+        if self.healthy:
+            logger.warning("Ejecting read replica %s: %s", self.name, reason)
+        self.healthy = False
+        self.error = reason
+
+    def _measure_lag(self, connection: Any) -> float:
+        if connection.dialect.name != "postgresql":
+            connection.execute(text("SELECT 1"))
+            return 0.0
+        return float(connection.execute(_PG_REPLICA_LAG).scalar_one())
+
+    async def check(self) -> None:
+        """Measure replication lag; eject on failure or excess lag, else admit."""
+        try:
+            if self.async_engine is not None:
+                async with self.async_engine.connect() as connection:
+                    lag = await asyncio.wait_for(
+                        connection.run_sync(self._measure_lag),
+                        timeout=settings.DB_REPLICA_CHECK_INTERVAL_SECONDS,
+                    )
+            else:
+                lag = await asyncio.wait_for(
+                    run_in_threadpool(self._check_sync),
+                    timeout=settings.DB_REPLICA_CHECK_INTERVAL_SECONDS,
+                )
+        except Exception as e:
+            self.lag_seconds = None
+            self.eject(f"health check failed: {type(e).__name__}: {e}")
+            return
+        self.lag_seconds = lag
+        if lag > settings.DB_REPLICA_MAX_LAG_SECONDS:
+            self.eject(f"lag {lag:.1f}s exceeds {settings.DB_REPLICA_MAX_LAG_SECONDS}s")
+            return
+        if not self.healthy:
+            logger.info("Read replica %s is in rotation (lag %.1fs)", self.name, lag)
+        self.healthy = True
+        self.error = None
+
+    def _check_sync(self) -> float:
+        assert self.engine is not None
+        with self.engine.connect() as connection:
+            return self._measure_lag(connection)
+
+    def stats(self) -> dict[str, Any]:
+        return {"healthy": self.healthy, "lag_seconds": self.lag_seconds, "error": self.error}
+
+    async def dispose(self) -> None:
+        if self.async_engine is not None:
+            await self.async_engine.dispose()
+        elif self.engine is not None:
+            await run_in_threadpool(self.engine.dispose)
+
+
+class ReplicaSet:
+    """
+    The configured read replicas, health-checked in the background.
+
+    pick() round-robins over the replicas currently in rotation, and returns
+    None (read from the primary) when there are none.
+    """
+
+    def __init__(self, urls: list[str], async_urls: list[str]) -> None:
+        self.replicas = [
+            Replica(f"replica{index}", url.strip(), async_url)
+            for index, (url, async_url) in enumerate(zip(urls, async_urls))
+        ]
+        self._counter = itertools.count()
+        self._task: asyncio.Task[None] | None = None
+
+    def __len__(self) -> int:
+        return len(self.replicas)
+
+    def pick(self) -> Replica | None:
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._counter) % len(healthy)]
 
-engine = create_engine(settings.DATABASE_URL, connect_args=connect_args)
+    async def check(self) -> None:
+        await asyncio.gather(*(replica.check() for replica in self.replicas))
 
+    async def start(self) -> None:
+        """Check every replica once, then keep checking in the background."""
+        if not self.replicas or self._task is not None:
+            return
+        await self.check()
+        self._task = asyncio.create_task(self._run())
 
-def init_db(session: Session) -> None:
-    user = session.exec(
-        select(User).where(User.email == settings.FIRST_SUPERUSER_EMAIL)
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.DB_REPLICA_CHECK_INTERVAL_SECONDS)
+            await self.check()
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for replica in self.replicas:
+            await replica.dispose()
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        return {replica.name: replica.stats() for replica in self.replicas}
+
+
+replicas = ReplicaSet(settings.DB_REPLICA_URLS, settings.ASYNC_DB_REPLICA_URLS)
+
+
+class RecentWriters:
+    """
+    Clients that wrote within the last `window` seconds, whose reads stay on
+    the primary so they see their own writes. Bounded LRU, per process.
+    """
+
+    def __init__(self, window: float, max_keys: int = 10_000) -> None:
+        self.window = window
+        self.max_keys = max_keys
+        self._writes: OrderedDict[str, float] = OrderedDict()
+
+    def mark(self, key: str) -> None:
+        self._writes.pop(key, None)
+        self._writes[key] = time.monotonic()
+        while len(self._writes) > self.max_keys:
+            self._writes.popitem(last=False)
+
+    def wrote_recently(self, key: str) -> bool:
+        written_at = self._writes.get(key)
+        return written_at is not None and time.monotonic() - written_at < self.window
+
+
+recent_writers = RecentWriters(window=settings.DB_READ_YOUR_WRITES_SECONDS)
+
+
+def get_pool_stats() -> dict[str, dict[str, Any]]:
+    """Checkout/wait counters plus current occupancy for each engine's pool."""
+    engines = {"sync": engine}
+    if async_engine is not None:
+        engines["async"] = async_engine.sync_engine
+    for replica in replicas.replicas:
+        engines[replica.name] = replica.sync_engine
+    result = {}
+    for name, eng in engines.items():
+        pool = eng.pool
+        result[name] = {
+            **pool.stats.as_dict(),  # type: ignore[attr-defined]
+            "size": pool.size(),  # type: ignore[attr-defined]
+            "checked_out": pool.checkedout(),  # type: ignore[attr-defined]
+            "overflow": pool.overflow(),  # type: ignore[attr-defined]
+        }
+    return result
+
+
+class ThreadedSession:
+    """
+    AsyncSession-compatible wrapper around a blocking Session.
+
+    Used when DB_ASYNC is off: each database call is awaited on Starlette's
+    threadpool, so CRUD code and routes are written once against the
+    AsyncSession API and work with either engine mode.
+    """
+
+    def __init__(self, sync_session: Session) -> None:
+        self.sync_session = sync_session
+
+    def add(self, instance: Any) -> None:
+        self.sync_session.add(instance)
+
+    def add_all(self, instances: Sequence[Any]) -> None:
+        self.sync_session.add_all(instances)
+
+    async def exec(self, statement: Any, **kwargs: Any) -> Any:
+        kwargs.setdefault("execution_options", {"prebuffer_rows": True})
+        return await run_in_threadpool(self.sync_session.exec, statement, **kwargs)
+
+    async def execute(self, statement: Any, *args: Any, **kwargs: Any) -> Any:
+        kwargs.setdefault("execution_options", {"prebuffer_rows": True})
+        return await run_in_threadpool(
+            self.sync_session.execute, statement, *args, **kwargs
+        )
+
+    async def scalar(self, statement: Any, *args: Any, **kwargs: Any) -> Any:
+        return await run_in_threadpool(self.sync_session.scalar, statement, *args, **kwargs)
+
+    async def get(self, entity: Any, ident: Any, **kwargs: Any) -> Any:
+        return await run_in_threadpool(self.sync_session.get, entity, ident, **kwargs)
+
+    async def merge(self, instance: T, **kwargs: Any) -> T:
+        return await run_in_threadpool(self.sync_session.merge, instance, **kwargs)
+
+    async def delete(self, instance: Any) -> None:
+        await run_in_threadpool(self.sync_session.delete, instance)
+
+    async def flush(self, objects: Sequence[Any] | None = None) -> None:
+        await run_in_threadpool(self.sync_session.flush, objects)
+
+    async def refresh(self, instance: Any, **kwargs: Any) -> None:
+        await run_in_threadpool(self.sync_session.refresh, instance, **kwargs)
+
+    async def commit(self) -> None:
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def rollback(self) -> None:
+        await run_in_threadpool(self.sync_session.rollback)
+
+    async def close(self) -> None:
+        await run_in_threadpool(self.sync_session.close)
+
+    async def run_sync(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        return await run_in_threadpool(fn, self.sync_session, *args, **kwargs)
+
+
+@asynccontextmanager
+async def session_scope(read_only: bool = False) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Open a session for the configured engine mode (see DB_ASYNC). With
+    read_only, it reads from a healthy replica when there is one.
+    """
+    bind_async, bind_sync = async_engine, engine
+    if read_only and (replica := replicas.pick()) is not None:
+        bind_async, bind_sync = replica.async_engine, replica.engine
+    if bind_async is not None:
+        async with AsyncSession(bind_async, expire_on_commit=False) as session:
+            yield session
+        return
+    session = ThreadedSession(Session(bind_sync, expire_on_commit=False))
+    try:
+        yield session  # type: ignore[misc]
+    finally:
+        await session.close()
+
+
+async def stream_rows(
+    statement: Executable, *, chunk_size: int = 1000
+) -> AsyncIterator[Sequence[Row[Any]]]:
+    """
+    Yield the result rows of a Core statement in chunks, read through a
+    server-side cursor on a dedicated connection. Memory use is bounded by
+    chunk_size however many rows match; nothing enters an ORM identity map.
+    """
+    if async_engine is not None:
+        async with async_engine.connect() as connection:
+            result = await connection.stream(
+                statement.execution_options(max_row_buffer=chunk_size)
+            )
+            async for partition in result.partitions(chunk_size):
+                yield partition
+        return
+
+    connection = await run_in_threadpool(engine.connect)
+    try:
+        result = await run_in_threadpool(
+            connection.execution_options(
+                stream_results=True, max_row_buffer=chunk_size
+            ).execute,
+            statement,
+        )
+        partitions = result.partitions(chunk_size)
+        while partition := await run_in_threadpool(next, partitions, None):
+            yield partition
+    finally:
+        await run_in_threadpool(connection.close)
+
+
+async def warm_pool(connections: int) -> None:
+    """
+    Open up to `connections` connections at once and return them to the pool
+    of the engine that serves requests, so the first requests after startup
+    find them already established.
+    """
+    connections = min(connections, settings.DB_POOL_SIZE)
+    if connections <= 0:
+        return
+    if async_engine is not None:
+        opened = await asyncio.gather(*(async_engine.connect() for _ in range(connections)))
+        for connection in opened:
+            await connection.close()
+        return
+    opened = await asyncio.gather(
+        *(run_in_threadpool(engine.connect) for _ in range(connections))
+    )
+    for connection in opened:
+        await run_in_threadpool(connection.close)
+
+
+async def dispose_engines() -> None:
+    """Close every pooled connection (call on application shutdown)."""
+    await replicas.close()
+    if async_engine is not None:
+        await async_engine.dispose()
+    await run_in_threadpool(engine.dispose)
+
+
+async def init_db(session: AsyncSession) -> None:
+    user = (
+        await session.exec(
+            select(User).where(User.email == settings.FIRST_SUPERUSER_EMAIL)
+        )
     ).first()
     if not user:
         user_in = UserCreate(
@@ -23,4 +514,4 @@ def init_db(session: Session) -> None:
             password=settings.FIRST_SUPERUSER_PASSWORD,
             is_superuser=True,
         )
-        user = crud.create_user(session=session, user_create=user_in)
+        user = await crud.create_user(session=session, user_create=user_in)
@@ -0,0 +1,192 @@
+"""
+Task change events for /tasks/stream.
+
+CRUD functions publish a TaskEvent after each commit; the broker fans it out
+to the stream subscriptions of the task's owner. With EVENTS_BACKEND=memory
+events only reach subscribers in the same process. With "postgres", events
+are sent through NOTIFY on EVENTS_PG_CHANNEL and every worker LISTENs on it,
+so a change made in one worker reaches streams held by any other.
+
+Each subscription has a bounded queue. A consumer that falls
+EVENTS_QUEUE_SIZE events behind loses its backlog and receives a single
+"resync" event instead, telling the client to refetch its task list.
+"""
+import asyncio
+import json
+import logging
+import uuid
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+EventType = Literal["created", "updated", "deleted", "resync"]
+
+
+@dataclass(frozen=True)
+class TaskEvent:
+    type: EventType
+    owner_id: uuid.UUID
+    task_id: uuid.UUID | None = None
+    # TaskPublic fields, when the publisher has them at hand
+    task: dict[str, Any] | None = None
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "type": self.type,
+                "owner_id": str(self.owner_id),
+                "task_id": str(self.task_id) if self.task_id else None,
+                "task": self.task,
+            },
+            default=str,
+            separators=(",", ":"),
+        )
+
+    @classmethod
+    def from_json(cls, payload: str) -> "TaskEvent":
+        data = json.loads(payload)
+        return cls(
+            type=data["type"],
+            owner_id=uuid.UUID(data["owner_id"]),
+            task_id=uuid.UUID(data["task_id"]) if data.get("task_id") else None,
+            task=data.get("task"),
+        )
+
+
+@dataclass(eq=False)
+class Subscription:
+    owner_id: uuid.UUID
+    queue: asyncio.Queue[TaskEvent] = field(
+        default_factory=lambda: asyncio.Queue(maxsize=settings.EVENTS_QUEUE_SIZE)
+    )
+    dropped: int = 0
+
+
+class EventBroker:
+    """Routes published events to the subscriptions of each owner."""
+
+    def __init__(self, backend: Literal["memory", "postgres"] = "memory") -> None:
+        self.backend = backend
+        self._subscriptions: dict[uuid.UUID, set[Subscription]] = {}
+        # In-process consumers of every owner's events (e.g. the reminder
+        # scheduler); called from deliver(), so they must not block.
+        self._listeners: list[Callable[[TaskEvent], None]] = []
+        self._pg_connection: Any = None
+        self._pg_lock = asyncio.Lock()
+
+    def subscribe(self, owner_id: uuid.UUID) -> Subscription:
+        subscription = Subscription(owner_id=owner_id)
+        self._subscriptions.setdefault(owner_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscriptions = self._subscriptions.get(subscription.owner_id)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.owner_id]
+
+    def add_listener(self, listener: Callable[[TaskEvent], None]) -> None:
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[TaskEvent], None]) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def subscriber_count(self) -> int:
+        return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+    def deliver(self, event: TaskEvent) -> None:
+        """Queue an event for this process's subscribers; never blocks."""
+        for listener in self._listeners:
+            listener(event)
+        for subscription in self._subscriptions.get(event.owner_id, ()):
+            try:
+                subscription.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Slow consumer: drop its backlog rather than buffer without
+                # bound, and have the client refetch.
+                subscription.dropped += subscription.queue.qsize()
+                while not subscription.queue.empty():
+                    subscription.queue.get_nowait()
+                subscription.queue.put_nowait(
+                    TaskEvent(type="resync", owner_id=event.owner_id)
+                )
+
+    def _deliver_all_resync(self) -> None:
+        for owner_id in list(self._subscriptions):
+            self.deliver(TaskEvent(type="resync", owner_id=owner_id))
+
+    async def publish(self, events: list[TaskEvent]) -> None:
+        """
+        Publish events after the change they describe has been committed.
+        A failure to notify is logged, never raised: the write has already
+        succeeded and clients recover with a resync on reconnect.
+        """
+        if not events:
+            return
+        if self.backend != "postgres":
+            for event in events:
+                self.deliver(event)
+            return
+        try:
+            async with self._pg_lock:
+                connection = await self._listen()
+                # One round trip per batch. Our own LISTEN delivers the events
+                # back to this process's subscribers.
+                await connection.execute(
+                    "SELECT pg_notify($1, payload) FROM unnest($2::text[]) AS payload",
+                    settings.EVENTS_PG_CHANNEL,
+                    [event.to_json() for event in events],
+                )
+        except Exception:
+            logger.exception("Failed to publish %d task event(s)", len(events))
+
+    async def start(self) -> None:
+        """
+        Begin listening (postgres backend). Idempotent: streams call it on
+        every heartbeat, which re-establishes a dropped LISTEN connection.
+        """
+        if self.backend == "postgres":
+            async with self._pg_lock:
+                await self._listen()
+
+    async def close(self) -> None:
+        async with self._pg_lock:
+            connection, self._pg_connection = self._pg_connection, None
+            if connection is not None and not connection.is_closed():
+                await connection.close()
+
+    async def _listen(self) -> Any:
+        """Return the LISTEN connection, (re)connecting if needed. Hold _pg_lock."""
+        if self._pg_connection is not None and not self._pg_connection.is_closed():
+            return self._pg_connection
+        import asyncpg
+
+        reconnecting = self._pg_connection is not None
+        connection = await asyncpg.connect(
+            settings.DATABASE_URL,
+            ssl="require",
+            timeout=settings.DB_POOL_TIMEOUT,
+        )
+        await connection.add_listener(settings.EVENTS_PG_CHANNEL, self._on_notify)
+        self._pg_connection = connection
+        if reconnecting:
+            # Notifications sent while we were disconnected are lost.
+            self._deliver_all_resync()
+        return connection
+
+    def _on_notify(self, connection: Any, pid: int, channel: str, payload: str) -> None:
+        try:
+            event = TaskEvent.from_json(payload)
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed task event payload")
+            return
+        self.deliver(event)
+
+
+event_broker = EventBroker(backend=settings.EVENTS_BACKEND)
@@ -0,0 +1,94 @@
+"""
+Leader election through a database lease.
+
+A singleton background job (such as the reminder scheduler) runs in every
+worker process, but only the holder of its schedulerlease row acts. The
+holder renews the lease well before it expires. When the holder dies, the
+lease lapses after `ttl` seconds and the next worker to ask takes it over.
+Taking and renewing are single conditional statements, so two workers
+never both believe they hold it. This works the same on PostgreSQL and
+SQLite.
+"""
+import os
+import socket
+import time
+import uuid
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import col
+
+from app.core.config import settings
+from app.core.db import session_scope
+from app.models import SchedulerLease
+
+
+class Lease:
+    def __init__(self, name: str, ttl: float) -> None:
+        self.name = name
+        self.ttl = ttl
+        self.holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    async def acquire(self, watermark: float | None = None) -> bool:
+        """
+        Take the lease if it is free or expired, or renew it if we hold it.
+        A given watermark is stored for the next holder. Returns whether we
+        hold the lease now.
+        """
+        now = time.time()
+        values: dict[str, object] = {"holder": self.holder, "expires_at": now + self.ttl}
+        if watermark is not None:
+            values["watermark"] = watermark
+        take = (
+            update(SchedulerLease)
+            .where(
+                col(SchedulerLease.name) == self.name,
+                or_(
+                    col(SchedulerLease.holder) == self.holder,
+                    col(SchedulerLease.expires_at) < now,
+                ),
+            )
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        insert = pg_insert if settings.DB_ENGINE == "postgresql" else sqlite_insert
+        create = (
+            insert(SchedulerLease)
+            .values(name=self.name, **values)
+            .on_conflict_do_nothing(index_elements=["name"])
+        )
+        async with session_scope() as session:
+            taken = (await session.execute(take)).rowcount
+            if not taken:
+                taken = (await session.execute(create)).rowcount
+            await session.commit()
+        return bool(taken)
+
+    async def watermark(self) -> float | None:
+        """The progress recorded by the previous holder."""
+        async with session_scope() as session:
+            return (
+                await session.execute(
+                    select(SchedulerLease.watermark).where(
+                        col(SchedulerLease.name) == self.name
+                    )
+                )
+            ).scalar()
+
+    async def release(self, watermark: float | None = None) -> None:
+        """Give up the lease at once (on shutdown) if we hold it."""
+        values: dict[str, object] = {"expires_at": 0.0}
+        if watermark is not None:
+            values["watermark"] = watermark
+        async with session_scope() as session:
+            await session.execute(
+                update(SchedulerLease)
+                .where(
+                    col(SchedulerLease.name) == self.name,
+                    col(SchedulerLease.holder) == self.holder,
+                )
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
@@ -0,0 +1,255 @@
+"""
+In-process metrics in the Prometheus text exposition format.
+
+MetricsMiddleware times every HTTP request by route template, and the
+engine hooks in app/core/db.py call record_query() for each SQL statement.
+Query counts and database time are also accumulated per request through a
+context variable, which reaches the threadpool in ThreadedSession mode and
+the greenlet in async mode alike. The request's totals feed the
+per-request histograms and, with DEBUG on, a Server-Timing header.
+
+Metrics are per worker process; Prometheus sums them across targets.
+"""
+import bisect
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterable
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+LabelValues = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._values: dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def collect(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} counter"
+        with self._lock:
+            values = list(self._values.items())
+        for label_values, value in values:
+            yield f"{self.name}{_format_labels(self.labels, label_values)} {_format_value(value)}"
+
+
+class Gauge(Counter):
+    def dec(self, *label_values: str, amount: float = 1) -> None:
+        self.inc(*label_values, amount=-amount)
+
+    def collect(self) -> Iterable[str]:
+        lines = list(super().collect())
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.buckets = buckets
+        # label values -> (per-bucket counts with a final +Inf slot, sum)
+        self._values: dict[LabelValues, tuple[list[int], float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.get(label_values, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[index] += 1
+            self._values[label_values] = (counts, total + value)
+
+    def collect(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            values = [(key, (list(counts), total)) for key, (counts, total) in self._values.items()]
+        for label_values, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                labels = _format_labels(self.labels, label_values, f'le="{_format_value(bound)}"')
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labels, label_values)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    labels=("method", "route", "status"),
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served."
+)
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds", "SQL statement execution time."
+)
+DB_SLOW_QUERIES = Counter(
+    "db_slow_queries_total", "SQL statements slower than SLOW_QUERY_MS."
+)
+HTTP_REQUEST_QUERIES = Histogram(
+    "http_request_db_queries",
+    "SQL statements issued per HTTP request.",
+    labels=("route",),
+    buckets=QUERY_COUNT_BUCKETS,
+)
+HTTP_REQUEST_DB_DURATION = Histogram(
+    "http_request_db_duration_seconds",
+    "Total SQL time per HTTP request.",
+    labels=("route",),
+)
+
+_METRICS = (
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS_IN_FLIGHT,
+    HTTP_REQUEST_QUERIES,
+    HTTP_REQUEST_DB_DURATION,
+    DB_QUERY_DURATION,
+    DB_SLOW_QUERIES,
+)
+
+# Values gathered at scrape time: name -> (type, help, callback).
+# Callbacks return {label string: value}, e.g. {'{pool="sync"}': 3}.
+_collectors: dict[str, tuple[str, str, Callable[[], dict[str, float]]]] = {}
+
+
+def register_gauge(name: str, documentation: str, callback: Callable[[], dict[str, float]]) -> None:
+    """Expose a value computed at scrape time (cache sizes, pool occupancy, ...)."""
+    _collectors[name] = ("gauge", documentation, callback)
+
+
+def register_counter(name: str, documentation: str, callback: Callable[[], dict[str, float]]) -> None:
+    """Expose a cumulative count kept elsewhere (cache hits, timeouts, ...)."""
+    if not name.endswith("_total"):
+        raise ValueError(f"counter name {name!r} must end with _total")
+    _collectors[name] = ("counter", documentation, callback)
+
+
+def render_metrics() -> str:
+    lines: list[str] = []
+    for metric in _METRICS:
+        lines.extend(metric.collect())
+    for name, (metric_type, documentation, callback) in _collectors.items():
+        lines.append(f"# HELP {name} {documentation}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for labels, value in callback().items():
+            lines.append(f"{name}{labels} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    db_seconds: float = 0.0
+
+
+request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def record_query(duration: float, statement: str) -> None:
+    """Called by the engine hooks after every statement."""
+    DB_QUERY_DURATION.observe(duration)
+    stats = request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += duration
+    if settings.SLOW_QUERY_MS and duration * 1000 >= settings.SLOW_QUERY_MS:
+        DB_SLOW_QUERIES.inc()
+        logger.warning(
+            "Slow query (%.1f ms): %s", duration * 1000, " ".join(statement.split())[:1000]
+        )
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, in-flight requests and SQL use."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = request_stats.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if settings.DEBUG:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", _server_timing(stats, started).encode()))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            request_stats.reset(token)
+            # The route template (not the raw path) keeps label cardinality bounded.
+            route: Any = scope.get("route")
+            route_label = getattr(route, "path", None) or "unmatched"
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - started, scope["method"], route_label, str(status_code)
+            )
+            HTTP_REQUEST_QUERIES.observe(stats.queries, route_label)
+            HTTP_REQUEST_DB_DURATION.observe(stats.db_seconds, route_label)
+
+
+def _server_timing(stats: RequestStats, started: float) -> str:
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    return (
+        f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries", '
+        f"app;dur={elapsed_ms:.1f}"
+    )
@@ -0,0 +1,72 @@
+"""
+Opaque cursor helpers for keyset pagination.
+
+A cursor is the URL-safe base64 encoding of a small JSON object holding the
+sort key of the last row a client has seen. Clients must treat it as opaque.
+"""
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor cannot be decoded."""
+
+
+def encode_cursor(values: dict[str, Any]) -> str:
+    """Encode sort-key values (datetimes/UUIDs are stringified) into a cursor."""
+    raw = json.dumps(values, default=str, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> dict[str, Any]:
+    """Decode a cursor produced by encode_cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError("Invalid cursor") from e
+    if not isinstance(values, dict):
+        raise InvalidCursorError("Invalid cursor")
+    return values
+
+
+def encode_keyset_cursor(created_at: datetime, row_id: uuid.UUID) -> str:
+    """Cursor for rows ordered by (created_at, id)."""
+    return encode_cursor({"c": created_at.isoformat(), "i": str(row_id)})
+
+
+def decode_keyset_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """Inverse of encode_keyset_cursor."""
+    values = decode_cursor(cursor)
+    try:
+        return datetime.fromisoformat(values["c"]), uuid.UUID(values["i"])
+    except (KeyError, TypeError, ValueError) as e:
+        raise InvalidCursorError("Invalid cursor") from e
+
+
+SyncPosition = tuple[datetime, uuid.UUID]
+
+
+def encode_sync_cursor(changed: SyncPosition, deleted: SyncPosition) -> str:
+    """Cursor for /tasks/changes: positions in the task and tombstone streams."""
+    return encode_cursor(
+        {
+            "u": [changed[0].isoformat(), str(changed[1])],
+            "d": [deleted[0].isoformat(), str(deleted[1])],
+        }
+    )
+
+
+def decode_sync_cursor(cursor: str) -> tuple[SyncPosition, SyncPosition]:
+    """Inverse of encode_sync_cursor."""
+    values = decode_cursor(cursor)
+    try:
+        return tuple(  # type: ignore[return-value]
+            (datetime.fromisoformat(values[key][0]), uuid.UUID(values[key][1]))
+            for key in ("u", "d")
+        )
+    except (KeyError, IndexError, TypeError, ValueError) as e:
+        raise InvalidCursorError("Invalid cursor") from e
@@ -0,0 +1,171 @@
+"""
+Token-bucket rate limiting.
+
+Each named limit in settings.RATE_LIMITS ("10/minute", "5/hour", ...) is a
+bucket of `limit` tokens that refills continuously over `period`; every
+request takes one token and is refused with RateLimitExceeded (429 with a
+Retry-After header) when the bucket is empty. Buckets are keyed per client
+IP or per user by the dependencies in app/api/deps.py.
+
+With RATE_LIMIT_BACKEND=memory buckets live in this process, so each worker
+enforces its own allowance. With "sql" they are rows of the ratelimitbucket
+table, updated atomically, and shared by every worker.
+"""
+import random
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Literal
+
+from sqlalchemy import case, delete, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import col
+
+from app.core.config import settings
+from app.core.db import session_scope
+from app.models import RateLimitBucket
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a request finds its bucket empty."""
+
+    def __init__(self, retry_after: float) -> None:
+        super().__init__(f"Rate limit exceeded; retry after {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+@dataclass(frozen=True)
+class Rate:
+    limit: int
+    period: float
+
+    @classmethod
+    def parse(cls, value: str) -> "Rate":
+        """Parse "<count>/<second|minute|hour|day>", e.g. "10/minute"."""
+        count, _, unit = value.partition("/")
+        try:
+            rate = cls(limit=int(count), period=_PERIODS[unit.strip().rstrip("s")])
+        except (KeyError, ValueError) as e:
+            raise ValueError(f"Invalid rate {value!r}") from e
+        if rate.limit <= 0:
+            raise ValueError(f"Invalid rate {value!r}: count must be positive")
+        return rate
+
+    @property
+    def per_second(self) -> float:
+        return self.limit / self.period
+
+
+class MemoryBackend:
+    """Buckets in a bounded LRU dict; evicting one simply refills it."""
+
+    def __init__(self, max_keys: int) -> None:
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def hit(self, key: str, rate: Rate, now: float) -> float:
+        tokens, updated_at = self._buckets.pop(key, (float(rate.limit), now))
+        tokens = min(float(rate.limit), tokens + (now - updated_at) * rate.per_second)
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / rate.per_second
+        self._buckets[key] = (tokens, now)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return retry_after
+
+
+class SQLBackend:
+    """Buckets as rows of ratelimitbucket, taken with a conditional UPDATE."""
+
+    # Idle buckets are full again after at most a day (the longest period),
+    # so rows untouched for longer can be dropped.
+    PRUNE_AFTER_SECONDS = _PERIODS["day"]
+    PRUNE_PROBABILITY = 0.001
+
+    async def hit(self, key: str, rate: Rate, now: float) -> float:
+        elapsed = now - col(RateLimitBucket.updated_at)
+        refilled = col(RateLimitBucket.tokens) + elapsed * rate.per_second
+        tokens = case((refilled > rate.limit, float(rate.limit)), else_=refilled)
+        take = (
+            update(RateLimitBucket)
+            .where(col(RateLimitBucket.key) == key, tokens >= 1)
+            .values(tokens=tokens - 1, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        insert = pg_insert if settings.DB_ENGINE == "postgresql" else sqlite_insert
+        create = (
+            insert(RateLimitBucket)
+            .values(key=key, tokens=rate.limit - 1, updated_at=now)
+            .on_conflict_do_nothing(index_elements=["key"])
+        )
+        async with session_scope() as session:
+            if random.random() < self.PRUNE_PROBABILITY:
+                await session.execute(
+                    delete(RateLimitBucket).where(
+                        col(RateLimitBucket.updated_at) < now - self.PRUNE_AFTER_SECONDS
+                    )
+                )
+            # Try the existing bucket, then a new one; if a concurrent request
+            # created it in between, try the existing bucket once more.
+            taken = (await session.execute(take)).rowcount
+            if not taken:
+                taken = (await session.execute(create)).rowcount
+            if not taken:
+                taken = (await session.execute(take)).rowcount
+            remaining = None
+            if not taken:
+                remaining = (
+                    await session.execute(
+                        select(tokens).where(col(RateLimitBucket.key) == key)
+                    )
+                ).scalar()
+            await session.commit()
+        if taken:
+            return 0.0
+        return max(0.0, 1 - (remaining or 0.0)) / rate.per_second
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        backend: Literal["memory", "sql"],
+        rates: dict[str, str],
+        enabled: bool = True,
+    ) -> None:
+        self.enabled = enabled
+        self.rates = {name: Rate.parse(value) for name, value in rates.items() if value}
+        self.backend = (
+            SQLBackend() if backend == "sql"
+            else MemoryBackend(max_keys=settings.RATE_LIMIT_MEMORY_MAX_KEYS)
+        )
+
+    async def hit(
+        self, name: str, key: str, rate: Rate | None = None, *, enforce: bool = False
+    ) -> None:
+        """
+        Take one token from the `name` bucket of `key`, using the configured
+        rate unless one is given. Names without a configured rate are not
+        limited. Raises RateLimitExceeded when the bucket is empty.
+
+        enforce applies the limit even when rate limiting is disabled, for
+        quotas rather than abuse limits.
+        """
+        rate = rate or self.rates.get(name)
+        if not (self.enabled or enforce) or rate is None:
+            return
+        retry_after = await self.backend.hit(f"{name}:{key}", rate, time.time())
+        if retry_after > 0:
+            raise RateLimitExceeded(retry_after)
+
+
+rate_limiter = RateLimiter(
+    backend=settings.RATE_LIMIT_BACKEND,
+    rates=settings.RATE_LIMITS,
+    enabled=settings.RATE_LIMIT_ENABLED,
+)
@@ -0,0 +1,332 @@
+"""
+Due-date reminders: "due_soon" REMINDER_LEAD_MINUTES before a task's due
+date and "overdue" at it, for tasks that are not completed.
+
+Every worker runs a ReminderScheduler, but only the holder of the
+"reminders" lease (app/core/lease.py) sends anything. The leader never polls
+the whole task table. Every third of REMINDER_WINDOW_MINUTES it scans the
+partial due-date index for the reminders falling in the next window, and
+keeps them in a min-heap ordered by firing time. Between scans, task events
+from app/core/events.py mark changed tasks, which are re-read by id, so an
+edited, completed or deleted task is rescheduled or dropped right away. Heap
+entries are never removed in place: an entry whose due date no longer
+matches the task is skipped when popped.
+
+The leader stores a watermark (reminders up to this time have been sent)
+after every batch it sends and with every lease renewal. A new leader
+resumes from it, so a failover loses no reminders, except those older than
+REMINDER_MAX_CATCHUP_MINUTES. Delivery is at least once: a batch sent just
+before the leader dies, or loses its lease before storing the watermark, is
+sent again. A batch the sink fails to take is retried after
+SEND_RETRY_SECONDS.
+
+With several worker processes, use EVENTS_BACKEND=postgres so the leader
+hears about changes made in other workers; otherwise they are picked up by
+the next scan.
+"""
+import asyncio
+import heapq
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Literal, Protocol
+
+from sqlmodel import col, select
+
+from app.core.config import settings
+from app.core.db import session_scope
+from app.core.events import TaskEvent, event_broker
+from app.core.lease import Lease
+from app.models import Task, TaskStatus
+
+logger = logging.getLogger(__name__)
+
+ReminderKind = Literal["due_soon", "overdue"]
+
+SEND_RETRY_SECONDS = 10.0
+
+
+@dataclass(frozen=True)
+class Reminder:
+    kind: ReminderKind
+    task_id: uuid.UUID
+    owner_id: uuid.UUID
+    title: str
+    due_date: datetime
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "task_id": str(self.task_id),
+            "owner_id": str(self.owner_id),
+            "title": self.title,
+            "due_date": self.due_date.isoformat(),
+        }
+
+
+class ReminderSink(Protocol):
+    async def send(self, reminders: list[Reminder]) -> None: ...
+
+    async def close(self) -> None: ...
+
+
+class LogSink:
+    """Writes each reminder to the log."""
+
+    async def send(self, reminders: list[Reminder]) -> None:
+        for reminder in reminders:
+            logger.info(
+                "Reminder %s: task %s (%r) of user %s is due %s",
+                reminder.kind,
+                reminder.task_id,
+                reminder.title,
+                reminder.owner_id,
+                reminder.due_date.isoformat(),
+            )
+
+    async def close(self) -> None:
+        pass
+
+
+class WebhookSink:
+    """POSTs each batch as {"reminders": [...]} to REMINDER_WEBHOOK_URL."""
+
+    def __init__(self, url: str) -> None:
+        if not url:
+            raise ValueError("REMINDER_WEBHOOK_URL must be set for REMINDER_SINK=webhook")
+        self.url = url
+        self._client: Any = None
+
+    async def send(self, reminders: list[Reminder]) -> None:
+        if self._client is None:
+            import httpx
+
+            self._client = httpx.AsyncClient(timeout=10.0)
+        response = await self._client.post(
+            self.url, json={"reminders": [reminder.as_dict() for reminder in reminders]}
+        )
+        response.raise_for_status()
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+SINKS = {"log": LogSink, "webhook": lambda: WebhookSink(settings.REMINDER_WEBHOOK_URL)}
+
+
+@dataclass(frozen=True)
+class _ScheduledTask:
+    owner_id: uuid.UUID
+    title: str
+    due_date: datetime
+
+
+class ReminderScheduler:
+    def __init__(self, sink: ReminderSink, lease: Lease) -> None:
+        self.sink = sink
+        self.lease = lease
+        self.lead = settings.REMINDER_LEAD_MINUTES * 60
+        self.window = settings.REMINDER_WINDOW_MINUTES * 60
+        self.leader = False
+        self.sent: dict[str, int] = {"due_soon": 0, "overdue": 0}
+        # (fire at, kind, task id, due timestamp); validated against _tasks on pop
+        self._heap: list[tuple[float, str, uuid.UUID, float]] = []
+        # Open tasks with a due date in (watermark, horizon + lead]
+        self._tasks: dict[uuid.UUID, _ScheduledTask] = {}
+        self._watermark = 0.0
+        self._horizon = 0.0
+        self._next_scan = 0.0
+        self._renew_at = 0.0
+        self._lease_expires = 0.0
+        self._retry_at = 0.0
+        self._changed: set[uuid.UUID] = set()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            event_broker.add_listener(self._on_event)
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        self._task = None
+        event_broker.remove_listener(self._on_event)
+        if self.leader:
+            await self.lease.release(self._watermark)
+            self.leader = False
+        await self.sink.close()
+
+    def stats(self) -> dict[str, Any]:
+        return {"leader": self.leader, "scheduled": len(self._heap), "sent": dict(self.sent)}
+
+    def _on_event(self, event: TaskEvent) -> None:
+        if not self.leader:
+            return
+        if event.type == "resync":
+            self._next_scan = 0.0
+        elif event.task_id is not None:
+            self._changed.add(event.task_id)
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            try:
+                await self._tick()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Reminder scheduler tick failed")
+                self._renew_at = min(self._renew_at, time.time() + 1)
+            now = time.time()
+            wake_at = self._renew_at
+            if self.leader:
+                wake_at = min(wake_at, self._next_scan)
+                if self._heap:
+                    wake_at = min(wake_at, max(self._heap[0][0], self._retry_at))
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(0.0, wake_at - now))
+            except asyncio.TimeoutError:
+                pass
+
+    async def _tick(self) -> None:
+        now = time.time()
+        if now >= self._renew_at:
+            await self._renew(now)
+        if not self.leader or now >= self._lease_expires:
+            # Not the leader, or renewals are failing and another worker
+            # may have taken over.
+            return
+        if now >= self._next_scan:
+            await self._scan(now)
+        if self._changed:
+            ids, self._changed = self._changed, set()
+            await self._load(now, col(Task.id).in_(ids), ids=ids, immediate=True)
+        await self._fire(time.time())
+
+    async def _renew(self, now: float) -> None:
+        was_leader = self.leader
+        self.leader = await self.lease.acquire(self._watermark if was_leader else None)
+        self._renew_at = now + self.lease.ttl / 3
+        if self.leader:
+            self._lease_expires = now + self.lease.ttl
+        if self.leader and not was_leader:
+            watermark = await self.lease.watermark()
+            oldest = now - settings.REMINDER_MAX_CATCHUP_MINUTES * 60
+            self._watermark = max(watermark or now, oldest)
+            self._next_scan = 0.0
+            # Hear about changes made in other workers (postgres backend).
+            await event_broker.start()
+            logger.info("Reminder scheduler is now the leader (%s)", self.lease.holder)
+        elif was_leader and not self.leader:
+            logger.warning("Reminder scheduler lost its lease")
+        if not self.leader:
+            self._heap.clear()
+            self._tasks.clear()
+            self._changed.clear()
+            self._horizon = 0.0
+
+    async def _scan(self, now: float) -> None:
+        """Reload the reminders of the next window from the due-date index."""
+        took_over = self._horizon == 0.0
+        self._horizon = now + self.window
+        self._next_scan = now + self.window / 3
+        await self._load(now, immediate=not took_over)
+
+    async def _load(
+        self,
+        now: float,
+        *clauses: Any,
+        ids: set[uuid.UUID] | None = None,
+        immediate: bool,
+    ) -> None:
+        """
+        Schedule the open tasks due in (watermark, horizon + lead] that match
+        `clauses`, and drop scheduled tasks (of `ids`, or all) that no longer
+        qualify. With `immediate`, a task whose "due soon" moment has already
+        passed (new, or its due date moved closer) gets it right away.
+        """
+        low = datetime.fromtimestamp(self._watermark, tz=timezone.utc)
+        high = datetime.fromtimestamp(self._horizon + self.lead, tz=timezone.utc)
+        statement = select(Task.id, Task.owner_id, Task.title, Task.due_date).where(
+            col(Task.due_date) > low,
+            col(Task.due_date) <= high,
+            Task.status != TaskStatus.COMPLETED,
+            *clauses,
+        )
+        async with session_scope() as session:
+            rows = (await session.exec(statement)).all()
+        found = set()
+        for task_id, owner_id, title, due_date in rows:
+            found.add(task_id)
+            self._schedule(task_id, _ScheduledTask(owner_id, title, due_date), now, immediate)
+        for task_id in (ids if ids is not None else set(self._tasks)) - found:
+            self._tasks.pop(task_id, None)
+
+    def _schedule(
+        self, task_id: uuid.UUID, task: _ScheduledTask, now: float, immediate: bool
+    ) -> None:
+        previous = self._tasks.get(task_id)
+        self._tasks[task_id] = task
+        if previous is not None and previous.due_date == task.due_date:
+            return  # already scheduled; at most the title changed
+        due = task.due_date.timestamp()
+        heapq.heappush(self._heap, (due, "overdue", task_id, due))
+        due_soon = due - self.lead
+        if due_soon > self._watermark:
+            heapq.heappush(self._heap, (due_soon, "due_soon", task_id, due))
+        elif immediate and due > now:
+            heapq.heappush(self._heap, (now, "due_soon", task_id, due))
+
+    async def _fire(self, now: float) -> None:
+        if now < self._retry_at:
+            return
+        entries = []
+        batch: list[Reminder] = []
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            _, kind, task_id, due = entry
+            task = self._tasks.get(task_id)
+            if task is None or task.due_date.timestamp() != due:
+                continue  # stale: task changed, completed or deleted
+            entries.append(entry)
+            batch.append(
+                Reminder(kind, task_id, task.owner_id, task.title, task.due_date)  # type: ignore[arg-type]
+            )
+        if batch:
+            try:
+                await self.sink.send(batch)
+            except Exception:
+                logger.exception(
+                    "Failed to send %d reminder(s); retrying in %.0fs",
+                    len(batch),
+                    SEND_RETRY_SECONDS,
+                )
+                # Keep them, and the watermark, for the retry.
+                for entry in entries:
+                    heapq.heappush(self._heap, entry)
+                self._retry_at = now + SEND_RETRY_SECONDS
+                return
+            for reminder in batch:
+                self.sent[reminder.kind] += 1
+                if reminder.kind == "overdue":
+                    self._tasks.pop(reminder.task_id, None)
+        self._watermark = max(self._watermark, now)
+        if batch:
+            # Store the watermark now rather than at the next renewal, so a
+            # new leader does not send this batch again.
+            await self._renew(time.time())
+
+
+reminder_scheduler = ReminderScheduler(
+    # Only build the configured sink (and check its settings) when enabled.
+    sink=SINKS[settings.REMINDER_SINK]() if settings.REMINDERS_ENABLED else LogSink(),
+    lease=Lease("reminders", ttl=settings.REMINDER_LEASE_SECONDS),
+)
@@ -1,26 +1,176 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import Any, Callable, TypeVar
 
 import jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes below the configured cost are flagged by needs_update() and get
+# upgraded on the next successful login.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+)
 
 ALGORITHM = "HS256"
 
+T = TypeVar("T")
+
+
+class KeyRing:
+    """
+    JWT signing keys by key id (kid).
+
+    Tokens are signed with the active key and carry its kid in the header;
+    decode() picks the verification key by that kid, so a token stays valid
+    on every node holding its key. To rotate without downtime: add the new
+    key to JWT_KEYS everywhere, then make it JWT_ACTIVE_KID, then drop the
+    old key once ACCESS_TOKEN_EXPIRE_MINUTES have passed.
+    """
+
+    def __init__(self, keys: dict[str, str], active_kid: str | None, legacy_key: str) -> None:
+        self.keys = keys
+        self.active_kid = active_kid
+        # Verifies tokens without a kid (minted before the key ring existed)
+        # and signs when no key ring is configured.
+        self.legacy_key = legacy_key
+
+    def encode(self, payload: dict[str, Any]) -> str:
+        if self.active_kid is None:
+            return jwt.encode(payload, self.legacy_key, algorithm=ALGORITHM)
+        return jwt.encode(
+            payload,
+            self.keys[self.active_kid],
+            algorithm=ALGORITHM,
+            headers={"kid": self.active_kid},
+        )
+
+    def decode(self, token: str) -> dict[str, Any]:
+        """Verify and decode a token; raises jwt.InvalidTokenError."""
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = self.legacy_key if kid is None else self.keys.get(kid)
+        if key is None:
+            raise jwt.InvalidTokenError(f"Unknown signing key id {kid!r}")
+        return jwt.decode(token, key, algorithms=[ALGORITHM])
+
+
+key_ring = KeyRing(
+    keys=settings.JWT_KEYS,
+    active_kid=settings.JWT_ACTIVE_KID,
+    legacy_key=settings.SECRET_KEY,
+)
+
 
 def create_access_token(subject: str | Any, expires_delta: timedelta) -> str:
     expire = datetime.now(timezone.utc) + expires_delta
     to_encode = {"exp": expire, "sub": str(subject)}
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
+    return key_ring.encode(to_encode)
+
 
+class PasswordHashingBusyError(RuntimeError):
+    """Raised when too many password hashing jobs are already queued."""
 
-def get_password_hash(password: str) -> str:
+
+def _hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+def _verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a dedicated process pool, off the request threads.
+
+    At most `max_pending` jobs may be queued or running at once; beyond that
+    submissions fail fast with PasswordHashingBusyError instead of piling up.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int) -> None:
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._executor: ProcessPoolExecutor | None = None
+
+    @property
+    def queue_depth(self) -> int:
+        """Jobs submitted but not yet finished."""
+        return self._pending
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "queue_depth": self._pending,
+            "max_pending": self.max_pending,
+            "workers": self.max_workers,
+        }
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def _job_done(self, _: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def submit(self, fn: Callable[..., T], *args: Any) -> "Future[T]":
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise PasswordHashingBusyError("Password hashing queue is full")
+            executor = self._get_executor()
+            self._pending += 1
+        try:
+            future = executor.submit(fn, *args)
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+            raise
+        future.add_done_callback(self._job_done)
+        return future
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
+
+
+async def get_password_hash(password: str) -> str:
+    return await asyncio.wrap_future(password_hasher.submit(_hash_password, password))
+
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return (await verify_and_update_password(plain_password, hashed_password))[0]
+
+
+async def verify_and_update_password(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """
+    Verify a password and, if the stored hash uses outdated parameters,
+    also return a fresh hash to store (otherwise None).
+    """
+    return await asyncio.wrap_future(
+        password_hasher.submit(
+            _verify_and_update_password, plain_password, hashed_password
+        )
+    )
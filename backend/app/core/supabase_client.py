@@ -1,25 +1,57 @@
-from functools import lru_cache
+import asyncio
 from typing import Annotated
 
-from supabase import create_client, Client
+import httpx
+from supabase import AsyncClient, AsyncClientOptions, acreate_client
 from fastapi import Depends, HTTPException, status
 
 from app.core.config import settings
 
+_client: AsyncClient | None = None
+_http_client: httpx.AsyncClient | None = None
+_client_lock = asyncio.Lock()
 
-@lru_cache(maxsize=1)
-def _create_supabase_client() -> Client:
+
+async def _create_supabase_client() -> AsyncClient:
+    """Create the shared async client once, on top of one pooled HTTP client."""
+    global _client, _http_client
+    if _client is not None:
+        return _client
     if not settings.SUPABASE_URL or not settings.SUPABASE_KEY:
         raise RuntimeError(
             "SUPABASE_URL and SUPABASE_KEY must be set in .env to use Supabase endpoints. "
             "Get these from: Supabase Dashboard > Project Settings > API"
         )
-    return create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
-
-
-def get_supabase_client() -> Client:
+    async with _client_lock:
+        if _client is None:
+            _http_client = httpx.AsyncClient(
+                http2=True,
+                timeout=settings.SUPABASE_TIMEOUT_SECONDS,
+                limits=httpx.Limits(
+                    max_connections=settings.SUPABASE_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.SUPABASE_MAX_CONNECTIONS,
+                ),
+            )
+            _client = await acreate_client(
+                settings.SUPABASE_URL,
+                settings.SUPABASE_KEY,
+                options=AsyncClientOptions(httpx_client=_http_client),
+            )
+    return _client
+
+
+async def close_supabase_client() -> None:
+    """Close the pooled HTTP connections (call on application shutdown)."""
+    global _client, _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+    _client = None
+    _http_client = None
+
+
+async def get_supabase_client() -> AsyncClient:
     try:
-        return _create_supabase_client()
+        return await _create_supabase_client()
     except RuntimeError as e:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -27,4 +59,4 @@ def get_supabase_client() -> Client:
         )
 
 
-SupabaseClientDep = Annotated[Client, Depends(get_supabase_client)]
+SupabaseClientDep = Annotated[AsyncClient, Depends(get_supabase_client)]
@@ -1,47 +1,135 @@
 import uuid
-from sqlmodel import Session, select
-from app.core.security import get_password_hash, verify_password
-from app.models import User, UserCreate, UserUpdate, Task, TaskCreate, TaskUpdate
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import column, delete, desc, event, func, insert, literal_column, table, text, update
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.cache import user_cache
+from app.core.config import settings
+from app.core.events import TaskEvent, event_broker
+from app.core.security import get_password_hash, verify_and_update_password
+from app.models import (
+    User,
+    UserCreate,
+    UserUpdate,
+    Task,
+    TaskArchive,
+    TaskBulkUpdateItem,
+    TaskCounter,
+    TaskCreate,
+    TaskPriority,
+    TaskPublic,
+    TaskStats,
+    TaskStatus,
+    TaskTombstone,
+    TaskUpdate,
+)
 
 
-def create_user(*,session:Session,user_create:UserCreate)->User:
+async def create_user(*,session:AsyncSession,user_create:UserCreate)->User:
     """Create a new user with hashed password."""
     db_user=User(
         email=user_create.email,
         full_name=user_create.full_name,
         is_active=user_create.is_active,
         is_superuser=user_create.is_superuser,
-        hashed_password=get_password_hash(user_create.password),
+        hashed_password=await get_password_hash(user_create.password),
     )
     session.add(db_user)
-    session.commit()
-    session.refresh(db_user)
+    session.add(TaskCounter(owner_id=db_user.id))
+    await session.commit()
+    await session.refresh(db_user)
     return db_user
 
-def update_user(*, session: Session, db_user: User, user_update: UserUpdate) -> User:
+async def update_user(*, session: AsyncSession, db_user: User, user_update: UserUpdate) -> User:
     """Update a user's details. Handles password hashing if password is changed."""
     user_data = user_update.model_dump(exclude_unset=True)
 
     if "password" in user_data:
-        user_data["hashed_password"] = get_password_hash(user_data.pop("password"))
+        user_data["hashed_password"] = await get_password_hash(user_data.pop("password"))
 
     db_user.sqlmodel_update(user_data)
-    session.commit()
-    session.refresh(db_user)
+    await session.commit()
+    user_cache.invalidate(str(db_user.id))
+    await session.refresh(db_user)
     return db_user
 
-def authenticate(*, session: Session, email: str, password: str) -> User | None:
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target: User) -> None:
+    """Drop cached snapshots on any flushed change, e.g. deactivation."""
+    user_cache.invalidate(str(target.id))
+
+
+async def authenticate(*, session: AsyncSession, email: str, password: str) -> User | None:
     """Authenticate a user by email and password."""
-    user = session.exec(select(User).where(User.email == email)).first()
+    user = (await session.exec(select(User).where(User.email == email))).first()
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    verified, new_hash = await verify_and_update_password(password, user.hashed_password)
+    if not verified:
         return None
+    if new_hash:
+        # Stored hash used outdated cost parameters; upgrade it transparently.
+        user.hashed_password = new_hash
+        session.add(user)
+        await session.commit()
+        await session.refresh(user)
     return user
 
 
-def create_task(*, session: Session, task_create: TaskCreate, owner_id: uuid.UUID) -> Task:
+def _task_event(event_type: str, task: Task) -> TaskEvent:
+    return TaskEvent(
+        type=event_type,  # type: ignore[arg-type]
+        owner_id=task.owner_id,
+        task_id=task.id,
+        task=TaskPublic.model_validate(task).model_dump(mode="json"),
+    )
+
+
+async def lock_task_writes(*, session: AsyncSession, owner_ids: Iterable[uuid.UUID]) -> datetime:
+    """
+    Lock the owners' TaskCounter rows for the rest of the transaction and
+    return the time to stamp its task writes with.
+
+    Every write path calls this before it computes updated_at or deleted_at,
+    and /tasks/changes waits for these locks (wait_for_task_writes) before
+    it picks its cutoff. So a row stamped before a sync's cutoff is always
+    committed by the time the sync reads, however long its transaction took.
+    Owners are locked in a fixed order, and before any task row.
+    """
+    for owner_id in sorted(set(owner_ids)):
+        await session.execute(TaskCounter.lock(owner_id))
+    return datetime.now(timezone.utc)
+
+
+async def wait_for_task_writes(*, session: AsyncSession, owner_id: uuid.UUID) -> datetime:
+    """
+    Wait until the owner's task writes in flight have committed, and return
+    a time that every later write will be stamped after; see
+    lock_task_writes. Ends the session's transaction, so reads after this
+    see those writes.
+    """
+    await session.commit()
+    if settings.DB_ENGINE == "postgresql":
+        # Shares the lock with other syncs; waits only for writers.
+        await session.execute(
+            select(TaskCounter.owner_id)
+            .where(TaskCounter.owner_id == owner_id)
+            .with_for_update(read=True)
+        )
+    else:
+        await session.execute(TaskCounter.lock(owner_id))
+    now = datetime.now(timezone.utc)
+    await session.commit()
+    return now
+
+
+async def create_task(*, session: AsyncSession, task_create: TaskCreate, owner_id: uuid.UUID) -> Task:
     """Create a new task. owner_id comes from the authenticated user, not the request body."""
+    now = await lock_task_writes(session=session, owner_ids=[owner_id])
     db_task = Task(
         title=task_create.title,
         description=task_create.description,
@@ -49,20 +137,509 @@ def create_task(*, session: Session, task_create: TaskCreate, owner_id: uuid.UUI
         priority=task_create.priority,
         due_date=task_create.due_date,
         owner_id=owner_id,
+        created_at=now,
+        updated_at=now,
     )
     session.add(db_task)
-    session.commit()
-    session.refresh(db_task)
+    await _update_task_counters(
+        session=session, owner_id=owner_id, added=[(db_task.status, db_task.priority)]
+    )
+    await session.commit()
+    await session.refresh(db_task)
+    await event_broker.publish([_task_event("created", db_task)])
     return db_task
 
-def update_task(*,session:Session,db_task:Task,task_update:TaskUpdate)->Task:
+async def update_task(*,session:AsyncSession,db_task:Task,task_update:TaskUpdate)->Task:
+    old_key = (db_task.status, db_task.priority)
     task_data=task_update.model_dump(exclude_unset=True)
+    await lock_task_writes(session=session, owner_ids=[db_task.owner_id])
+    # updated_at is bumped by the column's onupdate (at flush, so after the
+    # lock) when anything changed
     db_task.sqlmodel_update(task_data)
-    session.commit()
-    session.refresh(db_task)
+    await _update_task_counters(
+        session=session,
+        owner_id=db_task.owner_id,
+        added=[(db_task.status, db_task.priority)],
+        removed=[old_key],
+    )
+    await session.commit()
+    await session.refresh(db_task)
+    await event_broker.publish([_task_event("updated", db_task)])
+    return db_task
+
+async def delete_task(*,session:AsyncSession,db_task:Task)->Task:
+    now = await lock_task_writes(session=session, owner_ids=[db_task.owner_id])
+    await session.delete(db_task)
+    session.add(TaskTombstone(task_id=db_task.id, owner_id=db_task.owner_id, deleted_at=now))
+    await _update_task_counters(
+        session=session, owner_id=db_task.owner_id, removed=[(db_task.status, db_task.priority)]
+    )
+    await session.commit()
+    await event_broker.publish(
+        [TaskEvent(type="deleted", owner_id=db_task.owner_id, task_id=db_task.id)]
+    )
     return db_task
 
-def delete_task(*,session:Session,db_task:Task)->Task:
-    session.delete(db_task)
-    session.commit()
+
+async def create_tasks(
+    *, session: AsyncSession, tasks_create: list[TaskCreate], owner_id: uuid.UUID
+) -> list[uuid.UUID]:
+    """Insert many tasks with one multi-row INSERT in a single transaction."""
+    now = await lock_task_writes(session=session, owner_ids=[owner_id])
+    rows = []
+    for index, task_create in enumerate(tasks_create):
+        # Offset creation times so (created_at, id) listings keep the
+        # request order, as imports do.
+        created_at = now + timedelta(microseconds=index)
+        rows.append(
+            {
+                **task_create.model_dump(),
+                "id": uuid.uuid4(),
+                "owner_id": owner_id,
+                "created_at": created_at,
+                "updated_at": created_at,
+            }
+        )
+    await session.execute(insert(Task), rows)
+    await _update_task_counters(
+        session=session,
+        owner_id=owner_id,
+        added=[(row["status"], row["priority"]) for row in rows],
+    )
+    await session.commit()
+    await event_broker.publish(
+        [
+            TaskEvent(
+                type="created",
+                owner_id=owner_id,
+                task_id=row["id"],
+                task=TaskPublic.model_validate(row).model_dump(mode="json"),
+            )
+            for row in rows
+        ]
+    )
+    return [row["id"] for row in rows]
+
+
+async def update_tasks(
+    *, session: AsyncSession, items: list[TaskBulkUpdateItem], owner_id: uuid.UUID
+) -> set[uuid.UUID]:
+    """
+    Apply partial updates to many tasks of one owner in a single transaction.
+
+    Returns the ids that exist and belong to the owner; items for any other
+    id are skipped.
+    """
+    ids = {item.id for item in items}
+    now = await lock_task_writes(session=session, owner_ids=[owner_id])
+    # id -> (status, priority), for the counters
+    keys = {
+        task_id: (task_status, priority)
+        for task_id, task_status, priority in (
+            await session.exec(
+                select(Task.id, Task.status, Task.priority).where(
+                    col(Task.id).in_(ids), Task.owner_id == owner_id
+                )
+            )
+        ).all()
+    }
+    rows = []
+    old_keys = dict(keys)
+    for item in items:
+        changes = item.model_dump(exclude_unset=True, exclude={"id"})
+        if item.id in keys and changes:
+            rows.append({"id": item.id, **changes, "updated_at": now})
+            task_status, priority = keys[item.id]
+            if changes.get("status") is not None:
+                task_status = changes["status"]
+            if changes.get("priority") is not None:
+                priority = changes["priority"]
+            keys[item.id] = (task_status, priority)
+    if rows:
+        # ORM bulk UPDATE by primary key: one executemany per distinct column set
+        await session.execute(update(Task), rows)
+        await _update_task_counters(
+            session=session,
+            owner_id=owner_id,
+            added=keys.values(),
+            removed=old_keys.values(),
+        )
+    await session.commit()
+    await event_broker.publish(
+        [
+            TaskEvent(type="updated", owner_id=owner_id, task_id=row["id"])
+            for row in rows
+        ]
+    )
+    return set(keys)
+
+
+async def delete_tasks(
+    *, session: AsyncSession, task_ids: list[uuid.UUID], owner_id: uuid.UUID
+) -> set[uuid.UUID]:
+    """Delete many tasks of one owner with a single DELETE ... WHERE id IN (...)."""
+    now = await lock_task_writes(session=session, owner_ids=[owner_id])
+    result = await session.execute(
+        delete(Task)
+        .where(col(Task.id).in_(set(task_ids)), Task.owner_id == owner_id)
+        .returning(Task.id, Task.status, Task.priority)
+        .execution_options(synchronize_session=False)
+    )
+    deleted = {
+        task_id: (task_status, priority) for task_id, task_status, priority in result.all()
+    }
+    if deleted:
+        await session.execute(
+            insert(TaskTombstone),
+            [
+                {"task_id": task_id, "owner_id": owner_id, "deleted_at": now}
+                for task_id in deleted
+            ],
+        )
+        await _update_task_counters(
+            session=session, owner_id=owner_id, removed=deleted.values()
+        )
+    await session.commit()
+    await event_broker.publish(
+        [
+            TaskEvent(type="deleted", owner_id=owner_id, task_id=task_id)
+            for task_id in deleted
+        ]
+    )
+    return set(deleted)
+
+
+async def _update_task_counters(
+    *,
+    session: AsyncSession,
+    owner_id: uuid.UUID,
+    added: Iterable[tuple[TaskStatus, TaskPriority]] = (),
+    removed: Iterable[tuple[TaskStatus, TaskPriority]] = (),
+) -> None:
+    """
+    Apply task count deltas to the owner's TaskCounter row in the caller's
+    transaction, and bump its version. Tasks are given as (status, priority)
+    pairs; unchanged ones cancel out, so updates pass both new and old pairs.
+    """
+    deltas: Counter[str] = Counter()
+    for sign, keys in ((1, added), (-1, removed)):
+        for task_status, priority in keys:
+            deltas[TaskStatus(task_status).value] += sign
+            deltas[TaskCounter.priority_field(priority)] += sign
+    values = {
+        field: getattr(TaskCounter, field) + delta
+        for field, delta in deltas.items()
+        if delta
+    }
+    total = sum(deltas[status.value] for status in TaskStatus)
+    if total:
+        values["total"] = TaskCounter.total + total
+    result = await session.execute(
+        update(TaskCounter)
+        .where(TaskCounter.owner_id == owner_id)
+        .values(**values, version=TaskCounter.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        # No counter row yet (user created outside crud.create_user).
+        await reconcile_task_counters(session=session, owner_id=owner_id, commit=False)
+
+
+async def reconcile_task_counters(
+    *, session: AsyncSession, owner_id: uuid.UUID | None = None, commit: bool = True
+) -> int:
+    """
+    Recompute TaskCounter rows from the task table, for one owner or all
+    users, repairing any drift. Returns the number of rows changed.
+    """
+    statement = (
+        select(Task.owner_id, Task.status, Task.priority, func.count())
+        .group_by(Task.owner_id, Task.status, Task.priority)
+    )
+    users = select(User.id)
+    counters = select(TaskCounter)
+    if owner_id is not None:
+        statement = statement.where(Task.owner_id == owner_id)
+        users = users.where(User.id == owner_id)
+        counters = counters.where(TaskCounter.owner_id == owner_id)
+
+    empty = {
+        **{status.value: 0 for status in TaskStatus},
+        **{TaskCounter.priority_field(priority): 0 for priority in TaskPriority},
+    }
+    actual: dict[uuid.UUID, dict[str, int]] = {}
+    for user_id in (await session.exec(users)).all():
+        actual[user_id] = dict(empty)
+    for task_owner_id, task_status, priority, count in (await session.exec(statement)).all():
+        counts = actual.setdefault(task_owner_id, dict(empty))
+        counts[TaskStatus(task_status).value] += count
+        counts[TaskCounter.priority_field(priority)] += count
+    existing = {
+        counter.owner_id: counter for counter in (await session.exec(counters)).all()
+    }
+
+    repaired = 0
+    for user_id, counts in actual.items():
+        expected = {**counts, "total": sum(counts[status.value] for status in TaskStatus)}
+        counter = existing.get(user_id)
+        if counter is None:
+            session.add(TaskCounter(owner_id=user_id, **expected))
+            repaired += 1
+        elif any(getattr(counter, key) != value for key, value in expected.items()):
+            counter.sqlmodel_update(expected)
+            counter.version += 1
+            session.add(counter)
+            repaired += 1
+    if commit:
+        await session.commit()
+    else:
+        await session.flush()
+    return repaired
+
+
+async def get_task_stats(
+    *, session: AsyncSession, owner_id: uuid.UUID | None = None
+) -> TaskStats:
+    """
+    Task counts by status and priority, plus the overdue count, for one
+    owner or (owner_id=None) summed over all users. Counts come from the
+    TaskCounter rows and the overdue count from the open-tasks due-date
+    index, in a single query.
+    """
+    overdue = select(func.count()).select_from(Task).where(
+        col(Task.due_date) < datetime.now(timezone.utc),
+        Task.status != TaskStatus.COMPLETED,
+    )
+    fields = [
+        "total",
+        *(status.value for status in TaskStatus),
+        *(TaskCounter.priority_field(priority) for priority in TaskPriority),
+    ]
+    if owner_id is None:
+        statement = select(
+            *(func.coalesce(func.sum(getattr(TaskCounter, field)), 0) for field in fields),
+            overdue.scalar_subquery(),
+            func.count(),
+        )
+    else:
+        statement = select(
+            *(getattr(TaskCounter, field) for field in fields),
+            overdue.where(Task.owner_id == owner_id).scalar_subquery(),
+        ).where(TaskCounter.owner_id == owner_id)
+    row = (await session.exec(statement)).first()
+    users = None
+    if row is None:
+        # No counter row for this user: one GROUP BY over their tasks instead.
+        counts = dict.fromkeys(fields, 0)
+        grouped = await session.exec(
+            select(Task.status, Task.priority, func.count())
+            .where(Task.owner_id == owner_id)
+            .group_by(Task.status, Task.priority)
+        )
+        for task_status, priority, count in grouped.all():
+            counts["total"] += count
+            counts[TaskStatus(task_status).value] += count
+            counts[TaskCounter.priority_field(priority)] += count
+        overdue_count = (
+            await session.exec(overdue.where(Task.owner_id == owner_id))
+        ).one()
+    else:
+        counts = dict(zip(fields, row))
+        overdue_count = row[len(fields)]
+        if owner_id is None:
+            users = row[len(fields) + 1]
+    return TaskStats(
+        total=counts["total"],
+        by_status={status: counts[status.value] for status in TaskStatus},
+        by_priority={
+            priority: counts[TaskCounter.priority_field(priority)] for priority in TaskPriority
+        },
+        overdue=overdue_count,
+        users=users,
+    )
+
+
+async def prune_task_tombstones(*, session: AsyncSession, older_than: datetime) -> int:
+    """Delete tombstones recorded before `older_than`; returns how many."""
+    result = await session.execute(
+        delete(TaskTombstone).where(col(TaskTombstone.deleted_at) < older_than)
+    )
+    await session.commit()
+    return result.rowcount
+
+
+async def _create_archive_partitions(
+    *, session: AsyncSession, timestamps: Iterable[datetime]
+) -> None:
+    """
+    Create the monthly task_archive partitions (PostgreSQL) that the given
+    updated_at values fall in, unless they exist already.
+    """
+    for year, month in sorted({(value.year, value.month) for value in timestamps}):
+        name = f"task_archive_y{year:04d}m{month:02d}"
+        exists = (
+            await session.execute(text("SELECT to_regclass(:name)"), {"name": name})
+        ).scalar()
+        if exists is None:
+            next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+            await session.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF task_archive "
+                    f"FOR VALUES FROM ('{year:04d}-{month:02d}-01') "
+                    f"TO ('{next_year:04d}-{next_month:02d}-01')"
+                )
+            )
+
+
+async def archive_tasks(
+    *, session: AsyncSession, older_than: datetime, batch_size: int
+) -> int:
+    """
+    Move up to batch_size tasks completed (last updated) before older_than
+    from the task table to task_archive, in one transaction. Like a delete,
+    this leaves a tombstone per task (so /tasks/changes reports it under
+    `deleted`) and takes the task out of its owner's counters. Returns how
+    many moved; repeat until 0.
+    """
+    archivable = (Task.status == TaskStatus.COMPLETED, col(Task.updated_at) < older_than)
+    candidates = (
+        await session.execute(
+            select(Task.id, Task.owner_id)
+            .where(*archivable)
+            .order_by(col(Task.updated_at))
+            .limit(batch_size)
+        )
+    ).all()
+    if not candidates:
+        return 0
+    # Counter locks come before task row locks, as on every write path.
+    now = await lock_task_writes(
+        session=session, owner_ids=(owner_id for _, owner_id in candidates)
+    )
+    statement = select(*Task.__table__.columns).where(
+        col(Task.id).in_([task_id for task_id, _ in candidates]), *archivable
+    )
+    if settings.DB_ENGINE == "postgresql":
+        # A concurrent run moves other rows instead of waiting for these.
+        statement = statement.with_for_update(skip_locked=True)
+    rows = [dict(row._mapping) for row in (await session.execute(statement)).all()]
+    if not rows:
+        await session.commit()
+        return 0
+    if settings.DB_ENGINE == "postgresql":
+        await _create_archive_partitions(
+            session=session, timestamps=(row["updated_at"] for row in rows)
+        )
+    await session.execute(insert(TaskArchive), [{**row, "archived_at": now} for row in rows])
+    await session.execute(
+        delete(Task)
+        .where(col(Task.id).in_([row["id"] for row in rows]))
+        .execution_options(synchronize_session=False)
+    )
+    await session.execute(
+        insert(TaskTombstone),
+        [{"task_id": row["id"], "owner_id": row["owner_id"], "deleted_at": now} for row in rows],
+    )
+    removed: defaultdict[uuid.UUID, list[tuple[TaskStatus, TaskPriority]]] = defaultdict(list)
+    for row in rows:
+        removed[row["owner_id"]].append((row["status"], row["priority"]))
+    for owner_id, keys in removed.items():
+        await _update_task_counters(session=session, owner_id=owner_id, removed=keys)
+    await session.commit()
+    await event_broker.publish(
+        [TaskEvent(type="deleted", owner_id=row["owner_id"], task_id=row["id"]) for row in rows]
+    )
+    return len(rows)
+
+
+async def get_archived_task(
+    *, session: AsyncSession, task_id: uuid.UUID
+) -> TaskArchive | None:
+    return (
+        await session.exec(select(TaskArchive).where(TaskArchive.id == task_id))
+    ).first()
+
+
+async def restore_task(*, session: AsyncSession, archived: TaskArchive) -> Task:
+    """
+    Move an archived task back into the task table. Its tombstone goes and
+    its updated_at is bumped, so delta sync reports it as changed.
+    """
+    now = await lock_task_writes(session=session, owner_ids=[archived.owner_id])
+    db_task = Task(
+        **archived.model_dump(exclude={"archived_at", "updated_at"}),
+        updated_at=now,
+    )
+    await session.delete(archived)
+    await session.execute(delete(TaskTombstone).where(TaskTombstone.task_id == archived.id))
+    session.add(db_task)
+    await _update_task_counters(
+        session=session, owner_id=db_task.owner_id, added=[(db_task.status, db_task.priority)]
+    )
+    await session.commit()
+    await session.refresh(db_task)
+    await event_broker.publish([_task_event("created", db_task)])
     return db_task
+
+
+SEARCH_TS_CONFIG = "english"
+SEARCH_HIGHLIGHT = ("<mark>", "</mark>")
+
+
+def _fts5_query(query: str) -> str:
+    """Quote each term so user input cannot use FTS5 query syntax."""
+    return " ".join('"' + term.replace('"', '""') + '"' for term in query.split())
+
+
+async def search_tasks(
+    *, session: AsyncSession, owner_id: uuid.UUID, query: str, skip: int = 0, limit: int = 20
+) -> list[tuple[Task, float, str | None]]:
+    """
+    Ranked full-text search over an owner's task titles and descriptions.
+
+    Uses the generated tsvector column on PostgreSQL and the task_fts FTS5
+    table on SQLite (see migrations 5b8f3d6e1a27 and 7d2e9b4f1c38). On
+    SQLite the owner is part of the MATCH, so other users' rows are never
+    enumerated. Returns (task, rank, snippet) tuples, best match first.
+    """
+    start, stop = SEARCH_HIGHLIGHT
+    if settings.DB_ENGINE == "postgresql":
+        vector = literal_column("task.search_vector")
+        ts_query = func.websearch_to_tsquery(SEARCH_TS_CONFIG, query)
+        statement = (
+            select(
+                Task,
+                func.ts_rank_cd(vector, ts_query).label("rank"),
+                func.ts_headline(
+                    SEARCH_TS_CONFIG,
+                    func.concat_ws(" ", Task.title, Task.description),
+                    ts_query,
+                    f"StartSel={start}, StopSel={stop}, MaxFragments=2, MaxWords=20, MinWords=5",
+                ).label("snippet"),
+            )
+            .where(vector.op("@@")(ts_query), Task.owner_id == owner_id)
+            .order_by(desc("rank"), col(Task.id))
+        )
+    else:
+        match = _fts5_query(query)
+        if not match:
+            return []
+        # Owner ids are stored (and indexed) as 32 hex digits on SQLite.
+        match = f'owner_id : "{owner_id.hex}" AND {{title description}} : ({match})'
+        task_fts = table("task_fts", column("rowid"))
+        fts = literal_column("task_fts")
+        statement = (
+            select(
+                Task,
+                # bm25() is lower-is-better; titles weigh ten times
+                # descriptions, and the owner column not at all
+                (-func.bm25(fts, 10.0, 1.0, 0.0)).label("rank"),
+                func.snippet(fts, -1, start, stop, "…", 12).label("snippet"),
+            )
+            .select_from(task_fts)
+            .join(Task, literal_column("task.rowid") == task_fts.c.rowid)
+            .where(fts.op("MATCH")(match), Task.owner_id == owner_id)
+            .order_by(desc("rank"), col(Task.id))
+        )
+    result = await session.exec(statement.offset(skip).limit(limit))
+    return [(task, float(rank), snippet) for task, rank, snippet in result.all()]
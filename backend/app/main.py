@@ -1,15 +1,72 @@
-from fastapi import FastAPI
+import logging
+import math
+import sys
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+from sqlalchemy.exc import IntegrityError
+
+from app.core.cache import user_cache
 from app.core.config import settings
+from app.core.db import (
+    dispose_engines,
+    get_pool_stats,
+    init_db,
+    replicas,
+    session_scope,
+    warm_pool,
+)
+from app.core.events import event_broker
+from app.core.metrics import MetricsMiddleware, register_counter, register_gauge, render_metrics
+from app.core.rate_limit import RateLimitExceeded
+from app.core.reminders import reminder_scheduler
+from app.core.security import PasswordHashingBusyError, password_hasher
 from app.api.v1.api import api_router as api_v1_router
+from app.task_archive import task_archiver
+
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    try:
+        async with session_scope() as session:
+            await init_db(session)
+    except IntegrityError:
+        # Another worker created the first superuser at the same moment.
+        logger.info("First superuser already created by another worker")
+    await warm_pool(settings.DB_POOL_WARMUP)
+    await replicas.start()
+    if settings.REMINDERS_ENABLED:
+        reminder_scheduler.start()
+    if settings.ARCHIVE_ENABLED:
+        task_archiver.start()
+    yield
+    await reminder_scheduler.close()
+    await task_archiver.close()
+    await event_broker.close()
+    # Only imported when Supabase is configured (see app/api/v1/api.py).
+    if "app.core.supabase_client" in sys.modules:
+        from app.core.supabase_client import close_supabase_client
+
+        await close_supabase_client()
+    password_hasher.shutdown()
+    await dispose_engines()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     description="TaskLine - A simple and powerful To-Do List API",
     version="0.1.0",
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
 )
 
+app.add_middleware(MetricsMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.all_cors_origins,
@@ -19,6 +76,25 @@ app.add_middleware(
 )
 
 
+@app.exception_handler(PasswordHashingBusyError)
+def password_hashing_busy_handler(request: Request, exc: PasswordHashingBusyError):
+    """Shed login/signup load instead of queueing unbounded bcrypt work."""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server is busy, please retry shortly"},
+        headers={"Retry-After": "1"},
+    )
+
+
+@app.exception_handler(RateLimitExceeded)
+def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"detail": "Too many requests, please retry later"},
+        headers={"Retry-After": str(math.ceil(exc.retry_after))},
+    )
+
+
 @app.get("/")
 def root():
     """Root endpoint - health check"""
@@ -30,4 +106,84 @@ def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "project": settings.PROJECT_NAME}
 
+
+@app.get("/health/db")
+def db_pool_health():
+    """Connection pool occupancy and checkout/wait statistics, replica health"""
+    return {"pools": get_pool_stats(), "replicas": replicas.stats()}
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics():
+    """Prometheus scrape endpoint (per worker process)"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
+register_gauge(
+    "db_pool_connections",
+    "Connection pool occupancy.",
+    lambda: {
+        f'{{pool="{name}",state="{state}"}}': pool[state]
+        for name, pool in get_pool_stats().items()
+        for state in ("size", "checked_out", "overflow")
+    },
+)
+register_counter(
+    "db_pool_checkout_timeouts_total",
+    "Pool checkouts that timed out.",
+    lambda: {f'{{pool="{name}"}}': pool["timeouts"] for name, pool in get_pool_stats().items()},
+)
+register_gauge(
+    "db_replica_healthy",
+    "1 if the read replica is in rotation, else 0.",
+    lambda: {f'{{replica="{name}"}}': int(stats["healthy"]) for name, stats in replicas.stats().items()},
+)
+register_gauge(
+    "db_replica_lag_seconds",
+    "Replication lag at the last health check.",
+    lambda: {
+        f'{{replica="{name}"}}': stats["lag_seconds"]
+        for name, stats in replicas.stats().items()
+        if stats["lag_seconds"] is not None
+    },
+)
+register_counter(
+    "user_cache_requests_total",
+    "Authenticated-user cache lookups.",
+    lambda: {
+        '{result="hit"}': user_cache.stats()["hits"],
+        '{result="miss"}': user_cache.stats()["misses"],
+    },
+)
+register_gauge(
+    "password_hash_queue_depth",
+    "bcrypt jobs submitted to the process pool and not yet finished.",
+    lambda: {"": password_hasher.queue_depth},
+)
+register_gauge(
+    "reminder_scheduler_leader",
+    "1 if this worker holds the reminder lease, else 0.",
+    lambda: {"": int(reminder_scheduler.leader)},
+)
+register_gauge(
+    "reminders_scheduled",
+    "Reminders queued in this worker's heap.",
+    lambda: {"": reminder_scheduler.stats()["scheduled"]},
+)
+register_counter(
+    "reminders_sent_total",
+    "Reminders handed to the sink.",
+    lambda: {f'{{kind="{kind}"}}': count for kind, count in reminder_scheduler.sent.items()},
+)
+register_counter(
+    "tasks_archived_total",
+    "Tasks moved to task_archive by this worker.",
+    lambda: {"": task_archiver.archived},
+)
+register_gauge(
+    "task_event_subscribers",
+    "Open /tasks/stream connections.",
+    lambda: {"": event_broker.subscriber_count()},
+)
+
 app.include_router(api_v1_router, prefix="/api/v1")
@@ -1,7 +1,8 @@
 import uuid
 from datetime import datetime, timezone
 from enum import Enum
-from pydantic import EmailStr
+from pydantic import EmailStr, field_validator
+from sqlalchemy import Index, Update, text, update
 from sqlmodel import Field, Relationship, SQLModel
 
 class TaskPriority(str, Enum):
@@ -74,16 +75,156 @@ class TaskUpdate(SQLModel):
     priority: TaskPriority | None = None
     due_date: datetime | None = None
 
+    @field_validator("title", "status", "priority")
+    @classmethod
+    def reject_null(cls, value: object) -> object:
+        # Omit a field to leave it unchanged; only description and due_date
+        # can be cleared with null.
+        if value is None:
+            raise ValueError("may not be null")
+        return value
+
 
 class Task(TaskBase, table=True):
     """Database model for Task (this creates the 'task' table)"""
+    __table_args__ = (
+        # Serves the owner-scoped, (created_at, id)-ordered task listing.
+        Index("ix_task_owner_id_created_at_id", "owner_id", "created_at", "id"),
+        # Filtered listings: ?status= with due-date ranges, and ?priority=.
+        Index("ix_task_owner_id_status_due_date", "owner_id", "status", "due_date"),
+        Index("ix_task_owner_id_priority", "owner_id", "priority"),
+        # Open tasks by due date (?overdue=, due-date ranges); partial on both
+        # PostgreSQL and SQLite so completed tasks do not bloat it.
+        Index(
+            "ix_task_owner_id_due_date_open",
+            "owner_id",
+            "due_date",
+            postgresql_where=text("status <> 'COMPLETED'"),
+            sqlite_where=text("status <> 'COMPLETED'"),
+        ),
+        # Reminder scheduler: open tasks by due date across all owners.
+        Index(
+            "ix_task_due_date_open",
+            "due_date",
+            postgresql_where=text("status <> 'COMPLETED'"),
+            sqlite_where=text("status <> 'COMPLETED'"),
+        ),
+        # Delta sync: rows changed since a cursor (GET /tasks/changes).
+        Index("ix_task_owner_id_updated_at_id", "owner_id", "updated_at", "id"),
+        # Archiver: completed tasks by completion (last update) time.
+        Index(
+            "ix_task_updated_at_completed",
+            "updated_at",
+            postgresql_where=text("status = 'COMPLETED'"),
+            sqlite_where=text("status = 'COMPLETED'"),
+        ),
+    )
+
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    # Bumped on every UPDATE issued through SQLAlchemy, ORM or Core.
+    updated_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column_kwargs={"onupdate": lambda: datetime.now(timezone.utc)},
+    )
     owner_id: uuid.UUID = Field(foreign_key="user.id", nullable=False, ondelete="CASCADE")
     owner: User | None = Relationship(back_populates="tasks")
 
 
+class TaskArchive(TaskBase, table=True):
+    """
+    Completed tasks moved out of the task table by app/task_archive.py.
+
+    Same columns as Task plus archived_at. On PostgreSQL the table is
+    range-partitioned by month of updated_at (the completion time), with one
+    task_archive_yYYYYmMM partition per month, so the partition key is part
+    of the primary key. Archived tasks are not in TaskCounter.
+    """
+    __tablename__ = "task_archive"
+    __table_args__ = (
+        Index("ix_task_archive_owner_id_created_at_id", "owner_id", "created_at", "id"),
+        {"postgresql_partition_by": "RANGE (updated_at)"},
+    )
+
+    id: uuid.UUID = Field(primary_key=True)
+    updated_at: datetime = Field(primary_key=True)
+    created_at: datetime
+    owner_id: uuid.UUID = Field(foreign_key="user.id", nullable=False, ondelete="CASCADE")
+    archived_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class TaskCounter(SQLModel, table=True):
+    """
+    Per-user task totals, kept in step by the write paths in app/crud.py.
+
+    Status counts are in columns named after the status, priority counts in
+    priority_<priority>. `version` increases on every write to the user's
+    tasks and serves as the list version for ETags.
+    """
+    owner_id: uuid.UUID = Field(foreign_key="user.id", primary_key=True, ondelete="CASCADE")
+    total: int = 0
+    todo: int = 0
+    in_progress: int = 0
+    completed: int = 0
+    priority_low: int = 0
+    priority_medium: int = 0
+    priority_high: int = 0
+    priority_urgent: int = 0
+    version: int = 0
+
+    @staticmethod
+    def priority_field(priority: TaskPriority | str) -> str:
+        return f"priority_{TaskPriority(priority).value}"
+
+    @classmethod
+    def lock(cls, owner_id: uuid.UUID) -> Update:
+        """
+        No-op UPDATE that write-locks the owner's row (on SQLite, the
+        database) until the transaction ends; see crud.lock_task_writes.
+        """
+        return (
+            update(cls)
+            .where(cls.owner_id == owner_id)
+            .values(version=cls.version)
+            .execution_options(synchronize_session=False)
+        )
+
+
+class TaskTombstone(SQLModel, table=True):
+    """
+    Marker left behind by a deleted task so that /tasks/changes can report
+    the deletion. Pruned after TOMBSTONE_RETENTION_DAYS.
+    """
+    __table_args__ = (
+        Index("ix_tasktombstone_owner_id_deleted_at_task_id", "owner_id", "deleted_at", "task_id"),
+    )
+
+    task_id: uuid.UUID = Field(primary_key=True)
+    owner_id: uuid.UUID = Field(foreign_key="user.id", nullable=False, ondelete="CASCADE")
+    deleted_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class RateLimitBucket(SQLModel, table=True):
+    """Token bucket shared by all workers (RATE_LIMIT_BACKEND=sql)"""
+    key: str = Field(primary_key=True, max_length=255)
+    tokens: float
+    # Unix time of the last refill
+    updated_at: float
+
+
+class SchedulerLease(SQLModel, table=True):
+    """
+    Leadership of a singleton background job, held by one worker at a time
+    (see app/core/lease.py).
+    """
+    name: str = Field(primary_key=True, max_length=64)
+    holder: str = Field(max_length=255)
+    # Unix time after which another worker may take over
+    expires_at: float
+    # Job progress handed over to the next leader
+    watermark: float | None = None
+
+
 class TaskPublic(TaskBase):
     """Properties to return via API"""
     id: uuid.UUID
@@ -96,6 +237,76 @@ class TasksPublic(SQLModel):
     """List of tasks with count"""
     data: list[TaskPublic]
     count: int
+    next_cursor: str | None = None
+
+
+class TaskChanges(SQLModel):
+    """Tasks changed and deleted since a sync cursor"""
+    changed: list[TaskPublic]
+    deleted: list[uuid.UUID]
+    next_cursor: str
+    has_more: bool
+
+
+class TaskStats(SQLModel):
+    """Task counts for dashboards (GET /tasks/stats)"""
+    total: int
+    by_status: dict[TaskStatus, int]
+    by_priority: dict[TaskPriority, int]
+    # Open tasks whose due date has passed
+    overdue: int
+    # Number of users covered; only set for the all-users rollup
+    users: int | None = None
+
+
+class TaskSearchHit(TaskPublic):
+    """A full-text search match with its relevance and highlighted excerpt"""
+    rank: float
+    snippet: str | None = None
+
+
+class TaskSearchResults(SQLModel):
+    data: list[TaskSearchHit]
+
+
+class TaskBulkUpdateItem(TaskUpdate):
+    """One entry of a bulk update: the task id plus the fields to change"""
+    id: uuid.UUID
+
+
+class TasksBulkCreate(SQLModel):
+    items: list[TaskCreate] = Field(min_length=1)
+
+
+class TasksBulkUpdate(SQLModel):
+    items: list[TaskBulkUpdateItem] = Field(min_length=1)
+
+
+class TasksBulkDelete(SQLModel):
+    ids: list[uuid.UUID] = Field(min_length=1)
+
+
+class BulkItemResult(SQLModel):
+    """Outcome for one item of a bulk request, in request order"""
+    index: int
+    id: uuid.UUID
+    status: str  # "created", "updated", "deleted" or "not_found"
+
+
+class BulkResults(SQLModel):
+    results: list[BulkItemResult]
+
+
+class TaskImportError(SQLModel):
+    row: int  # line number in the uploaded file
+    error: str
+
+
+class TaskImportReport(SQLModel):
+    imported: int = 0
+    failed: int = 0
+    errors: list[TaskImportError] = []
+
 
 class Message(SQLModel):
     message: str
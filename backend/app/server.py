@@ -0,0 +1,71 @@
+"""
+Production entry point: serve the app with WEB_CONCURRENCY uvicorn workers.
+
+    WEB_CONCURRENCY=4 python -m app.server
+
+With SERVER_PRELOAD on (the default), the parent process imports app.main
+once before starting any worker, so bad settings or a broken import fail
+once and fast instead of crash-looping every worker. Workers are separate
+processes and share nothing in memory; the warnings below point out the
+settings that then need a shared backend.
+"""
+import copy
+import logging
+import os
+
+import uvicorn
+from uvicorn.config import LOGGING_CONFIG
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _check_multiprocess_settings() -> None:
+    if settings.RATE_LIMIT_ENABLED and settings.RATE_LIMIT_BACKEND == "memory":
+        logger.warning(
+            "RATE_LIMIT_BACKEND=memory: each of the %d workers enforces its own "
+            "allowance; use \"sql\" to share one",
+            settings.WEB_CONCURRENCY,
+        )
+    if settings.AI_ENABLED and settings.RATE_LIMIT_BACKEND == "memory":
+        logger.warning(
+            "RATE_LIMIT_BACKEND=memory: each of the %d workers allows AI_DAILY_LIMIT "
+            "AI requests, so a user can make up to %d a day; use \"sql\" to share one",
+            settings.WEB_CONCURRENCY,
+            settings.WEB_CONCURRENCY * settings.AI_DAILY_LIMIT,
+        )
+    if settings.EVENTS_BACKEND == "memory":
+        logger.warning(
+            "EVENTS_BACKEND=memory: /tasks/stream clients only see changes made "
+            "through their own worker; use \"postgres\""
+        )
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    workers = max(1, settings.WEB_CONCURRENCY)
+    if workers > 1:
+        _check_multiprocess_settings()
+        if settings.ephemeral_secret_key:
+            # Only allowed locally (see Settings.check_signing_keys): share
+            # this process's random key so workers accept each other's tokens.
+            os.environ["SECRET_KEY"] = settings.SECRET_KEY
+    if settings.SERVER_PRELOAD:
+        import app.main  # noqa: F401
+
+    # uvicorn's logging setup, plus our own INFO logs (reminders, replica
+    # health, ...), applied in every worker.
+    log_config = copy.deepcopy(LOGGING_CONFIG)
+    log_config["loggers"]["app"] = {"handlers": ["default"], "level": "INFO", "propagate": False}
+    uvicorn.run(
+        "app.main:app",
+        host=settings.SERVER_HOST,
+        port=settings.SERVER_PORT,
+        workers=workers,
+        log_config=log_config,
+    )
+
+
+if __name__ == "__main__":
+    main()
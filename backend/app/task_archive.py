@@ -0,0 +1,115 @@
+"""
+Archival of completed tasks.
+
+Tasks completed (last updated) more than ARCHIVE_AFTER_DAYS ago are moved
+from the task table to task_archive by crud.archive_tasks, ARCHIVE_BATCH_SIZE
+rows per transaction, so the hot table and its indexes only hold live work
+and no run holds locks for long. Archived tasks are listed with
+`GET /tasks/?include_archived=true` and moved back with
+`POST /tasks/{id}/restore`.
+
+Run it with `python -m app.cli archive-tasks`, or set ARCHIVE_ENABLED to
+have the workers do it every ARCHIVE_INTERVAL_MINUTES. Every worker then
+runs a TaskArchiver, but only the holder of the "archiver" lease
+(app/core/lease.py) archives. The time of the last completed run is kept
+as the lease watermark, so one run happens per interval, however many
+workers there are.
+"""
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta, timezone
+
+from app import crud
+from app.core.config import settings
+from app.core.db import session_scope
+from app.core.lease import Lease
+
+logger = logging.getLogger(__name__)
+
+LEASE_SECONDS = 60.0
+
+
+async def archive_completed_tasks(
+    *,
+    older_than: datetime,
+    batch_size: int = settings.ARCHIVE_BATCH_SIZE,
+    keep_going: Callable[[], Awaitable[bool]] | None = None,
+) -> int:
+    """
+    Archive all tasks completed before older_than, one batch (and
+    transaction) at a time. keep_going is asked before every batch and can
+    stop the run early. Returns how many tasks were archived.
+    """
+    archived = 0
+    while keep_going is None or await keep_going():
+        async with session_scope() as session:
+            moved = await crud.archive_tasks(
+                session=session, older_than=older_than, batch_size=batch_size
+            )
+        archived += moved
+        if moved < batch_size:
+            break
+    return archived
+
+
+class TaskArchiver:
+    def __init__(self, lease: Lease, interval: float) -> None:
+        self.lease = lease
+        self.interval = interval
+        self.archived = 0
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        self._task = None
+        await self.lease.release()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._tick()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Task archival run failed")
+            await asyncio.sleep(self.interval)
+
+    async def _tick(self) -> None:
+        if not await self.lease.acquire():
+            return
+        last_run = await self.lease.watermark()
+        started = time.time()
+        if last_run is not None and started - last_run < self.interval:
+            # Another worker ran it recently.
+            await self.lease.release()
+            return
+        renewed = started
+
+        async def keep_going() -> bool:
+            # Renew between batches; stop if the lease was lost.
+            nonlocal renewed
+            if time.time() - renewed < self.lease.ttl / 3:
+                return True
+            renewed = time.time()
+            return await self.lease.acquire()
+
+        older_than = datetime.now(timezone.utc) - timedelta(days=settings.ARCHIVE_AFTER_DAYS)
+        archived = await archive_completed_tasks(older_than=older_than, keep_going=keep_going)
+        self.archived += archived
+        await self.lease.release(started)
+        if archived:
+            logger.info("Archived %d completed task(s) older than %s", archived, older_than.date())
+
+
+task_archiver = TaskArchiver(
+    lease=Lease("archiver", ttl=LEASE_SECONDS),
+    interval=settings.ARCHIVE_INTERVAL_MINUTES * 60,
+)
@@ -0,0 +1,259 @@
+"""
+Task export and import formats.
+
+Exported rows are plain Core result rows (see app.core.db.stream_rows)
+carrying the TaskPublic columns, so no ORM objects are built while
+exporting. Imports parse the file incrementally and load validated rows in
+chunks: COPY FROM STDIN on PostgreSQL, a batched executemany elsewhere.
+"""
+import csv
+import io
+import json
+import uuid
+from collections.abc import AsyncIterator, Iterator, Sequence
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import IO, Any, Literal
+
+from pydantic import ValidationError
+from sqlalchemy import Connection, Row, insert
+
+from app.core.db import engine
+from app.models import (
+    Task,
+    TaskCounter,
+    TaskCreate,
+    TaskImportError,
+    TaskImportReport,
+    TaskPublic,
+)
+
+ExportFormat = Literal["ndjson", "csv"]
+ImportFormat = Literal["ndjson", "csv"]
+
+# Only the first errors are listed in a report; all of them are counted.
+MAX_REPORTED_ERRORS = 1000
+
+EXPORT_FIELDS = list(TaskPublic.model_fields)
+EXPORT_COLUMNS = [getattr(Task, field) for field in EXPORT_FIELDS]
+
+MEDIA_TYPES: dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def _ndjson_chunk(rows: Sequence[Row[Any]]) -> str:
+    return "".join(
+        json.dumps(dict(zip(EXPORT_FIELDS, map(_plain, row))), ensure_ascii=False) + "\n"
+        for row in rows
+    )
+
+
+def _csv_chunk(rows: Sequence[Row[Any]], header: bool = False) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_FIELDS)
+    writer.writerows(
+        ["" if value is None else _plain(value) for value in row] for row in rows
+    )
+    return buffer.getvalue()
+
+
+async def encode_export(
+    partitions: AsyncIterator[Sequence[Row[Any]]], export_format: ExportFormat
+) -> AsyncIterator[str]:
+    """Render streamed row chunks as NDJSON lines or CSV (with a header row)."""
+    if export_format == "csv":
+        yield _csv_chunk([], header=True)
+        async for rows in partitions:
+            yield _csv_chunk(rows)
+    else:
+        async for rows in partitions:
+            yield _ndjson_chunk(rows)
+
+
+IMPORT_COLUMNS = [
+    "id",
+    "title",
+    "description",
+    "status",
+    "priority",
+    "due_date",
+    "created_at",
+    "updated_at",
+    "owner_id",
+]
+
+
+def _iter_records(text: IO[str], import_format: ImportFormat) -> Iterator[tuple[int, Any]]:
+    """Yield (line number, raw record) pairs; raw is None for unparsable lines."""
+    if import_format == "csv":
+        reader = csv.DictReader(text)
+        for record in reader:
+            # Empty CSV cells mean "not set", letting TaskCreate apply defaults.
+            yield reader.line_num, {
+                key: value for key, value in record.items() if key and value != ""
+            }
+        return
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError:
+            yield line_number, None
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Aware UTC datetime; naive ones (common in CSV) are taken as UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _format_errors(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc']) or 'row'}: {detail['msg']}"
+        for detail in error.errors()
+    )
+
+
+def _copy_rows(connection: Connection, rows: list[dict[str, Any]]) -> None:
+    """Load rows with PostgreSQL COPY FROM STDIN (CSV) over psycopg2."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(
+            [
+                # Enum columns store member names; NULL is an unquoted empty
+                # field. Timestamps go in as UTC: the columns have no zone,
+                # and COPY would drop an offset rather than convert it.
+                value.name if isinstance(value, Enum)
+                else _as_utc(value).isoformat() if isinstance(value, datetime)
+                else "" if value is None
+                else value
+                for value in (row[column] for column in IMPORT_COLUMNS)
+            ]
+        )
+    buffer.seek(0)
+    cursor = connection.connection.dbapi_connection.cursor()  # type: ignore[union-attr]
+    try:
+        cursor.copy_expert(
+            f"COPY task ({', '.join(IMPORT_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+    finally:
+        cursor.close()
+
+
+def load_task_rows(rows: list[dict[str, Any]]) -> None:
+    """
+    Insert task row dicts in one transaction, with COPY where available.
+    updated_at is stamped under the owners' counter locks, as in
+    crud.lock_task_writes, so /tasks/changes waits for the commit.
+    """
+    with engine.begin() as connection:
+        for owner_id in sorted({row["owner_id"] for row in rows}):
+            connection.execute(TaskCounter.lock(owner_id))
+        loaded_at = datetime.now(timezone.utc)
+        for row in rows:
+            row["updated_at"] = max(loaded_at, row["created_at"])
+        if connection.dialect.name == "postgresql":
+            _copy_rows(connection, rows)
+        else:
+            connection.execute(insert(Task.__table__), rows)
+
+
+def import_tasks(
+    file: IO[bytes],
+    *,
+    owner_id: uuid.UUID,
+    import_format: ImportFormat,
+    chunk_size: int = 1000,
+) -> TaskImportReport:
+    """
+    Validate each record of an uploaded file against TaskCreate and load the
+    valid ones for `owner_id`, committing every `chunk_size` rows.
+
+    Blocking: call from a worker thread. Invalid rows are reported and
+    skipped; a chunk the database rejects is split and retried in halves, so
+    only the rows it actually rejects are reported and the rest still load.
+    Task counters are not touched here, so callers should reconcile the
+    owner's counters afterwards.
+
+    created_at follows the file order. updated_at is stamped when each chunk
+    is loaded (see load_task_rows), so a /tasks/changes cursor handed out
+    while an earlier chunk was committing never gets ahead of rows that are
+    still to come.
+    """
+    report = TaskImportReport()
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    started = datetime.now(timezone.utc)
+    chunk: list[dict[str, Any]] = []
+    chunk_lines: list[int] = []
+
+    def fail(line_number: int, message: str) -> None:
+        report.failed += 1
+        if len(report.errors) < MAX_REPORTED_ERRORS:
+            report.errors.append(TaskImportError(row=line_number, error=message))
+
+    def load(rows: list[dict[str, Any]], line_numbers: list[int]) -> None:
+        try:
+            load_task_rows(rows)
+            report.imported += len(rows)
+        except Exception as e:
+            if len(rows) > 1:
+                # Bisect: a few bad rows cost O(log chunk_size) retries each.
+                middle = len(rows) // 2
+                load(rows[:middle], line_numbers[:middle])
+                load(rows[middle:], line_numbers[middle:])
+                return
+            reason = str(getattr(e, "orig", e)).strip().splitlines()[:1]
+            fail(line_numbers[0], f"database error: {' '.join(reason) or e.__class__.__name__}")
+
+    def flush() -> None:
+        load(chunk, chunk_lines)
+        chunk.clear()
+        chunk_lines.clear()
+
+    for index, (line_number, record) in enumerate(_iter_records(text, import_format)):
+        if not isinstance(record, dict):
+            fail(line_number, "not a JSON object")
+            continue
+        try:
+            task_in = TaskCreate.model_validate(record)
+        except ValidationError as e:
+            fail(line_number, _format_errors(e))
+            continue
+        row = task_in.model_dump()
+        if row["due_date"] is not None:
+            row["due_date"] = _as_utc(row["due_date"])
+        # Offset creation times so listings keep the file's order.
+        created_at = started + timedelta(microseconds=index)
+        chunk.append(
+            {
+                **row,
+                "id": uuid.uuid4(),
+                "owner_id": owner_id,
+                "created_at": created_at,
+            }
+        )
+        chunk_lines.append(line_number)
+        if len(chunk) >= chunk_size:
+            flush()
+    if chunk:
+        flush()
+    text.detach()
+    return report
@@ -0,0 +1,11 @@
+"""
+Benchmarks and load tests (run from the backend directory):
+
+    python -m benchmarks.seed --users 1000 --tasks 1000000
+    python -m benchmarks.crud_bench --output crud.json
+    python -m benchmarks.load_test --duration 60 --output load.json
+    python -m benchmarks.import_time --budget 1.5
+
+Each writes machine-readable JSON (see benchmarks.common.write_report) so
+runs from different commits can be compared with benchmarks.compare.
+"""
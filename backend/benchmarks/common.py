@@ -0,0 +1,78 @@
+"""Shared helpers: latency summaries and the JSON report format."""
+import json
+import math
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import Any
+
+from app.core.config import settings
+
+# Written by benchmarks.seed, read by the benchmarks that log in as seeded users.
+MANIFEST_PATH = "benchmarks/.seed.json"
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies: list[float], elapsed: float | None = None) -> dict[str, float]:
+    """Count, throughput and latency percentiles (milliseconds) of samples in seconds."""
+    values = sorted(latencies)
+    total = sum(values)
+    summary = {
+        "count": len(values),
+        "mean_ms": round(total / len(values) * 1000, 3) if values else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 3),
+        "p95_ms": round(percentile(values, 95) * 1000, 3),
+        "p99_ms": round(percentile(values, 99) * 1000, 3),
+        "max_ms": round(values[-1] * 1000, 3) if values else 0.0,
+    }
+    duration = elapsed if elapsed is not None else total
+    summary["ops_per_sec"] = round(len(values) / duration, 2) if duration else 0.0
+    return summary
+
+
+def environment() -> dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "db_engine": settings.DB_ENGINE,
+        "db_async": settings.DB_ASYNC,
+    }
+
+
+def write_report(path: str | None, name: str, parameters: dict[str, Any], results: dict[str, Any]) -> None:
+    report = {
+        "benchmark": name,
+        "environment": environment(),
+        "parameters": parameters,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2, default=str)
+    if path:
+        with open(path, "w") as file:
+            file.write(text + "\n")
+    print(text)
+
+
+def load_manifest() -> dict[str, Any]:
+    try:
+        with open(MANIFEST_PATH) as file:
+            return json.load(file)
+    except FileNotFoundError:
+        raise SystemExit(f"{MANIFEST_PATH} not found; run python -m benchmarks.seed first")
@@ -0,0 +1,60 @@
+"""
+Compare two benchmark reports written by crud_bench or load_test.
+
+    python -m benchmarks.compare before.json after.json
+
+Prints the change in p50/p95/p99 latency and throughput per operation;
+exits with status 1 if any p95 regressed by more than --threshold percent.
+"""
+import argparse
+import json
+from typing import Any
+
+METRICS = ("p50_ms", "p95_ms", "p99_ms", "ops_per_sec")
+
+
+def _operations(report: dict[str, Any]) -> dict[str, dict[str, float]]:
+    results = report["results"]
+    operations = dict(results.get("operations", {}))
+    if "total" in results:
+        operations["(total)"] = results["total"]
+    return operations
+
+
+def _change(before: float, after: float) -> float | None:
+    if not before:
+        return None
+    return (after - before) / before * 100
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.compare", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Allowed p95 regression, percent")
+    args = parser.parse_args(argv)
+    with open(args.before) as file:
+        before = json.load(file)
+    with open(args.after) as file:
+        after = json.load(file)
+
+    print(f"{before['environment'].get('commit')} -> {after['environment'].get('commit')}")
+    print(f"{'operation':<36}" + "".join(f"{metric:>22}" for metric in METRICS))
+    regressions = []
+    old_operations, new_operations = _operations(before), _operations(after)
+    for name in sorted(old_operations.keys() & new_operations.keys()):
+        cells = []
+        for metric in METRICS:
+            old, new = old_operations[name][metric], new_operations[name][metric]
+            change = _change(old, new)
+            cells.append(f"{old:>9.2f} → {new:>9.2f}" + (f" ({change:+.0f}%)" if change is not None else ""))
+            if metric == "p95_ms" and change is not None and change > args.threshold:
+                regressions.append(name)
+        print(f"{name:<36}" + "".join(f"{cell:>22}" for cell in cells))
+    if regressions:
+        print(f"p95 regressed by more than {args.threshold:.0f}%: {', '.join(regressions)}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Microbenchmarks for app.crud and get_current_user against a seeded database.
+
+Each operation runs in its own session, as it would in a request, on the
+seeded user with the most tasks (--user-rank picks another). Writes made by
+the benchmark are deleted again, so the dataset stays comparable.
+
+    python -m benchmarks.crud_bench --iterations 200 --output crud.json
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from datetime import timedelta
+from typing import Any
+
+from sqlmodel import func, select
+
+from app import crud
+from app.api.deps import get_current_user
+from app.core.cache import user_cache
+from app.core.db import session_scope
+from app.core.security import create_access_token, password_hasher
+from app.models import Task, TaskBulkUpdateItem, TaskCreate, TaskStatus, TaskUpdate, User
+from benchmarks.common import load_manifest, summarize, write_report
+
+BULK_SIZE = 100
+
+
+async def measure(
+    iterations: int,
+    operation: Callable[[int], Awaitable[Any]],
+    before_each: Callable[[], None] | None = None,
+) -> dict[str, float]:
+    latencies = []
+    for iteration in range(iterations):
+        if before_each is not None:
+            before_each()
+        started = time.perf_counter()
+        await operation(iteration)
+        latencies.append(time.perf_counter() - started)
+    return summarize(latencies)
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    manifest = load_manifest()
+    seeded = sorted(manifest["users"], key=lambda user: user["tasks"], reverse=True)
+    target = seeded[min(args.user_rank, len(seeded) - 1)]
+    owner_id = uuid.UUID(target["id"])
+    token = create_access_token(owner_id, timedelta(hours=1))
+    n = args.iterations
+    results: dict[str, Any] = {}
+
+    async def current_user(_: int) -> None:
+        async with session_scope() as session:
+            await get_current_user(session=session, token=token)
+
+    results["get_current_user.cache_hit"] = await measure(n, current_user)
+    results["get_current_user.cache_miss"] = await measure(n, current_user, user_cache.clear)
+
+    async def authenticate(_: int) -> None:
+        async with session_scope() as session:
+            await crud.authenticate(
+                session=session, email=target["email"], password=manifest["password"]
+            )
+
+    results["authenticate"] = await measure(max(1, n // 10), authenticate)
+
+    created: list[Task] = []
+
+    async def create_task(iteration: int) -> None:
+        async with session_scope() as session:
+            created.append(
+                await crud.create_task(
+                    session=session,
+                    task_create=TaskCreate(title=f"bench task {iteration}"),
+                    owner_id=owner_id,
+                )
+            )
+
+    results["create_task"] = await measure(n, create_task)
+
+    async def update_task(iteration: int) -> None:
+        async with session_scope() as session:
+            db_task = await session.get(Task, created[iteration].id)
+            await crud.update_task(
+                session=session,
+                db_task=db_task,
+                task_update=TaskUpdate(status=TaskStatus.IN_PROGRESS, title=f"renamed {iteration}"),
+            )
+
+    results["update_task"] = await measure(n, update_task)
+
+    async def delete_task(iteration: int) -> None:
+        async with session_scope() as session:
+            db_task = await session.get(Task, created[iteration].id)
+            await crud.delete_task(session=session, db_task=db_task)
+
+    results["delete_task"] = await measure(n, delete_task)
+
+    bulk_ids: list[list[uuid.UUID]] = []
+    bulk_iterations = max(1, n // 10)
+
+    async def create_tasks(iteration: int) -> None:
+        async with session_scope() as session:
+            bulk_ids.append(
+                await crud.create_tasks(
+                    session=session,
+                    tasks_create=[TaskCreate(title=f"bulk {iteration}.{i}") for i in range(BULK_SIZE)],
+                    owner_id=owner_id,
+                )
+            )
+
+    results[f"create_tasks.x{BULK_SIZE}"] = await measure(bulk_iterations, create_tasks)
+
+    async def update_tasks(iteration: int) -> None:
+        async with session_scope() as session:
+            await crud.update_tasks(
+                session=session,
+                items=[
+                    TaskBulkUpdateItem(id=task_id, status=TaskStatus.COMPLETED)
+                    for task_id in bulk_ids[iteration]
+                ],
+                owner_id=owner_id,
+            )
+
+    results[f"update_tasks.x{BULK_SIZE}"] = await measure(bulk_iterations, update_tasks)
+
+    async def delete_tasks(iteration: int) -> None:
+        async with session_scope() as session:
+            await crud.delete_tasks(session=session, task_ids=bulk_ids[iteration], owner_id=owner_id)
+
+    results[f"delete_tasks.x{BULK_SIZE}"] = await measure(bulk_iterations, delete_tasks)
+
+    async def search_tasks(_: int) -> None:
+        async with session_scope() as session:
+            await crud.search_tasks(session=session, owner_id=owner_id, query="report")
+
+    results["search_tasks"] = await measure(n, search_tasks)
+
+    async def reconcile(_: int) -> None:
+        async with session_scope() as session:
+            await crud.reconcile_task_counters(session=session, owner_id=owner_id)
+
+    results["reconcile_task_counters.one_user"] = await measure(max(1, n // 10), reconcile)
+
+    async with session_scope() as session:
+        user = await session.get(User, owner_id)
+        task_count = (
+            await session.exec(select(func.count()).where(Task.owner_id == owner_id))
+        ).one()
+    return {"user_tasks": task_count, "user_email": user.email if user else None, "operations": results}
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.crud_bench", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--user-rank", type=int, default=0, help="0 = the user with the most tasks")
+    parser.add_argument("--output", default=None, help="Write the JSON report here")
+    args = parser.parse_args(argv)
+    try:
+        results = asyncio.run(run(args))
+    finally:
+        password_hasher.shutdown()
+    write_report(args.output, "crud", vars(args), results)
+
+
+if __name__ == "__main__":
+    main()
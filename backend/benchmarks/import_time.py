@@ -0,0 +1,85 @@
+"""
+Import-time budget for app.main, the cold-start cost of every worker.
+
+Imports the app in fresh interpreters (--runs of them) and fails with
+status 1 if the median import time exceeds --budget seconds, or if the
+Supabase client stack was loaded although Supabase is not configured.
+
+    python -m benchmarks.import_time --budget 1.5 --output import.json
+
+Run with `python -X importtime -c "import app.main"` to see which module
+blew the budget.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import Any
+
+from app.core.config import settings
+from benchmarks.common import write_report
+
+# Modules that only the optional Supabase routes need.
+LAZY_MODULES = ("supabase", "postgrest", "app.api.v1.routes.supabase_routes")
+
+_PROBE = f"""
+import json, sys, time
+started = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - started
+print(json.dumps({{
+    "seconds": elapsed,
+    "modules": len(sys.modules),
+    "lazy_loaded": [name for name in {LAZY_MODULES!r} if name in sys.modules],
+}}))
+"""
+
+
+def probe() -> dict[str, Any]:
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE], check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.import_time", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=1.5, help="Allowed median, seconds")
+    parser.add_argument("--output", default=None, help="Write the JSON report here")
+    args = parser.parse_args(argv)
+
+    samples = [probe() for _ in range(args.runs)]
+    seconds = sorted(sample["seconds"] for sample in samples)
+    median = statistics.median(seconds)
+    lazy_loaded = sorted({name for sample in samples for name in sample["lazy_loaded"]})
+    supabase_configured = bool(settings.SUPABASE_URL and settings.SUPABASE_KEY)
+    print(
+        f"import app.main: median {median:.3f}s, min {seconds[0]:.3f}s, "
+        f"max {seconds[-1]:.3f}s, {samples[-1]['modules']} modules (budget {args.budget:.3f}s)"
+    )
+    write_report(
+        args.output,
+        "import_time",
+        vars(args),
+        {
+            "median_seconds": round(median, 4),
+            "seconds": [round(value, 4) for value in seconds],
+            "modules": samples[-1]["modules"],
+            "lazy_loaded": lazy_loaded,
+        },
+    )
+
+    failures = []
+    if median > args.budget:
+        failures.append(f"median import time {median:.3f}s exceeds the {args.budget:.3f}s budget")
+    if lazy_loaded and not supabase_configured:
+        failures.append(f"imported without Supabase configured: {', '.join(lazy_loaded)}")
+    if failures:
+        print("\n".join(failures))
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
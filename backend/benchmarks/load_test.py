@@ -0,0 +1,195 @@
+"""
+HTTP load test: concurrent virtual users running a weighted mix of login,
+list, create, patch and delete requests against the API.
+
+By default the app is served in-process (httpx ASGI transport, rate limits
+off); pass --base-url to target a running server instead, started with
+RATE_LIMIT_ENABLED=false so logins are not throttled. Virtual users log in
+as seeded users, picked in proportion to their task counts.
+
+    python -m benchmarks.load_test --concurrency 20 --duration 60 --output load.json
+"""
+import argparse
+import asyncio
+import random
+import time
+from collections import defaultdict
+from typing import Any
+
+import httpx
+
+from benchmarks.common import load_manifest, summarize, write_report
+
+API = "/api/v1"
+DEFAULT_MIX = "login=5,list=50,create=20,patch=15,delete=10"
+
+
+class VirtualUser:
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        email: str,
+        password: str,
+        rng: random.Random,
+        record: Any,
+    ) -> None:
+        self.client = client
+        self.email = email
+        self.password = password
+        self.rng = rng
+        self.record = record
+        self.headers: dict[str, str] = {}
+        self.created: list[str] = []
+
+    async def request(self, operation: str, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        started = time.perf_counter()
+        response = await self.client.request(method, url, headers=self.headers, **kwargs)
+        self.record(operation, time.perf_counter() - started, response.status_code)
+        return response
+
+    async def login(self) -> None:
+        response = await self.request(
+            "login",
+            "POST",
+            f"{API}/login/access-token",
+            data={"username": self.email, "password": self.password},
+        )
+        if response.status_code == 200:
+            self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    async def list(self) -> None:
+        sort = self.rng.choice(["created_at", "-created_at", "due_date", "-priority"])
+        await self.request("list", "GET", f"{API}/tasks/", params={"limit": 50, "sort": sort})
+
+    async def create(self) -> None:
+        response = await self.request(
+            "create",
+            "POST",
+            f"{API}/tasks/",
+            json={"title": f"load test {self.rng.randrange(1_000_000)}", "priority": "high"},
+        )
+        if response.status_code == 200:
+            self.created.append(response.json()["id"])
+
+    async def patch(self) -> None:
+        if not self.created:
+            return await self.create()
+        task_id = self.rng.choice(self.created)
+        await self.request(
+            "patch", "PATCH", f"{API}/tasks/{task_id}", json={"status": "in_progress"}
+        )
+
+    async def delete(self) -> None:
+        if not self.created:
+            return await self.create()
+        task_id = self.created.pop(self.rng.randrange(len(self.created)))
+        await self.request("delete", "DELETE", f"{API}/tasks/{task_id}")
+
+    async def cleanup(self) -> None:
+        # Leave the seeded dataset as we found it.
+        for task_id in self.created:
+            await self.client.delete(f"{API}/tasks/{task_id}", headers=self.headers)
+
+
+def parse_mix(mix: str) -> dict[str, int]:
+    weights = {}
+    for part in mix.split(","):
+        operation, _, weight = part.partition("=")
+        if operation.strip() not in {"login", "list", "create", "patch", "delete"}:
+            raise SystemExit(f"Unknown operation in --mix: {operation!r}")
+        weights[operation.strip()] = int(weight)
+    return weights
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    manifest = load_manifest()
+    users = manifest["users"]
+    weights = parse_mix(args.mix)
+    operations, operation_weights = list(weights), list(weights.values())
+
+    latencies: dict[str, list[float]] = defaultdict(list)
+    statuses: dict[str, dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+    def record(operation: str, latency: float, status_code: int) -> None:
+        latencies[operation].append(latency)
+        statuses[operation][status_code] += 1
+
+    if args.base_url:
+        transport = None
+        base_url = args.base_url
+    else:
+        from app.core.rate_limit import rate_limiter
+        from app.main import app
+
+        rate_limiter.enabled = False
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://loadtest"
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        transport=transport, base_url=base_url, limits=limits, timeout=args.timeout
+    ) as client:
+        rng = random.Random(args.seed)
+        picked = rng.choices(users, weights=[user["tasks"] + 1 for user in users], k=args.concurrency)
+        virtual_users = [
+            VirtualUser(client, user["email"], manifest["password"], random.Random(rng.random()), record)
+            for user in picked
+        ]
+        await asyncio.gather(*(vu.login() for vu in virtual_users))
+        latencies.clear()
+        statuses.clear()
+
+        deadline = time.perf_counter() + args.duration
+        started = time.perf_counter()
+
+        async def drive(vu: VirtualUser) -> None:
+            while time.perf_counter() < deadline:
+                operation = vu.rng.choices(operations, weights=operation_weights)[0]
+                await getattr(vu, operation)()
+
+        await asyncio.gather(*(drive(vu) for vu in virtual_users))
+        elapsed = time.perf_counter() - started
+        await asyncio.gather(*(vu.cleanup() for vu in virtual_users))
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    errors = sum(
+        count
+        for by_status in statuses.values()
+        for status_code, count in by_status.items()
+        if status_code >= 400
+    )
+    return {
+        "elapsed_seconds": round(elapsed, 3),
+        "total": summarize(all_latencies, elapsed),
+        "errors": errors,
+        "operations": {
+            operation: {
+                **summarize(values, elapsed),
+                "status_codes": dict(statuses[operation]),
+            }
+            for operation, values in sorted(latencies.items())
+        },
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load_test", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default=None, help="Target a running server (default: in-process)")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Operation weights")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Write the JSON report here")
+    args = parser.parse_args(argv)
+    try:
+        results = asyncio.run(run(args))
+    finally:
+        if not args.base_url:
+            from app.core.security import password_hasher
+
+            password_hasher.shutdown()
+    write_report(args.output, "load", vars(args), results)
+
+
+if __name__ == "__main__":
+    main()
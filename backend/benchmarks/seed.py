@@ -0,0 +1,159 @@
+"""
+Seed the configured database with synthetic users and tasks.
+
+Task counts per user follow a Zipf distribution (a few heavy users, a long
+tail of light ones), and statuses, priorities, due dates and timestamps are
+drawn from fixed proportions, so a given --seed always produces the same
+dataset. Rows are loaded with app.task_io.load_task_rows (COPY on
+PostgreSQL), then the task counters are rebuilt.
+
+    python -m benchmarks.seed --users 1000 --tasks 1000000
+
+All seeded users share one password, recorded with their emails in
+benchmarks/.seed.json for the other benchmarks.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from collections.abc import Iterator
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import insert
+
+from app import crud
+from app.core.db import engine, session_scope
+from app.core.security import pwd_context
+from app.models import TaskPriority, TaskStatus, User
+from app.task_io import load_task_rows
+from benchmarks.common import MANIFEST_PATH
+
+PASSWORD = "benchmark-password"
+STATUS_WEIGHTS = {TaskStatus.COMPLETED: 55, TaskStatus.TODO: 30, TaskStatus.IN_PROGRESS: 15}
+PRIORITY_WEIGHTS = {
+    TaskPriority.LOW: 30,
+    TaskPriority.MEDIUM: 45,
+    TaskPriority.HIGH: 20,
+    TaskPriority.URGENT: 5,
+}
+VERBS = ["Write", "Review", "Fix", "Plan", "Call", "Email", "Update", "Refactor", "Test", "Ship"]
+NOUNS = ["report", "invoice", "release notes", "budget", "roadmap", "login page",
+         "database backup", "team meeting", "onboarding doc", "search index"]
+HISTORY = timedelta(days=730)
+
+
+def task_counts(users: int, tasks: int, skew: float) -> list[int]:
+    """Split `tasks` over `users` proportionally to 1 / rank ** skew."""
+    weights = [1 / (rank ** skew) for rank in range(1, users + 1)]
+    total = sum(weights)
+    counts = [int(tasks * weight / total) for weight in weights]
+    for index in range(tasks - sum(counts)):
+        counts[index % users] += 1
+    return counts
+
+
+def generate_tasks(
+    rng: random.Random, owner_id: uuid.UUID, count: int, now: datetime
+) -> Iterator[dict[str, Any]]:
+    statuses = rng.choices(list(STATUS_WEIGHTS), weights=list(STATUS_WEIGHTS.values()), k=count)
+    priorities = rng.choices(
+        list(PRIORITY_WEIGHTS), weights=list(PRIORITY_WEIGHTS.values()), k=count
+    )
+    # Creation times ascend over the history window, like a real account.
+    offsets = sorted(rng.random() for _ in range(count))
+    for status, priority, offset in zip(statuses, priorities, offsets):
+        created_at = now - HISTORY * (1 - offset)
+        updated_at = min(now, created_at + timedelta(hours=rng.expovariate(1 / 48)))
+        due_date = None
+        if rng.random() < 0.5:
+            due_date = created_at + timedelta(days=rng.uniform(-5, 60))
+        yield {
+            "id": uuid.UUID(int=rng.getrandbits(128), version=4),
+            "owner_id": owner_id,
+            "title": f"{rng.choice(VERBS)} {rng.choice(NOUNS)} #{rng.randrange(10_000)}",
+            "description": (
+                f"Follow up on the {rng.choice(NOUNS)} before the {rng.choice(NOUNS)}."
+                if rng.random() < 0.3 else None
+            ),
+            "status": status,
+            "priority": priority,
+            "due_date": due_date,
+            "created_at": created_at,
+            "updated_at": updated_at,
+        }
+
+
+def seed(args: argparse.Namespace) -> dict[str, Any]:
+    rng = random.Random(args.seed)
+    now = datetime.now(timezone.utc)
+    hashed_password = pwd_context.hash(PASSWORD)
+    users = [
+        {
+            "id": uuid.UUID(int=rng.getrandbits(128), version=4),
+            "email": f"{args.prefix}{index}@example.com",
+            "full_name": f"Benchmark User {index}",
+            "is_active": True,
+            "is_superuser": False,
+            "hashed_password": hashed_password,
+            "created_at": now - HISTORY,
+        }
+        for index in range(args.users)
+    ]
+    with engine.begin() as connection:
+        connection.execute(insert(User.__table__), users)
+
+    counts = task_counts(args.users, args.tasks, args.skew)
+    started = time.perf_counter()
+    loaded = 0
+    chunk: list[dict[str, Any]] = []
+    for user, count in zip(users, counts):
+        for row in generate_tasks(rng, user["id"], count, now):
+            chunk.append(row)
+            if len(chunk) >= args.chunk_size:
+                load_task_rows(chunk)
+                loaded += len(chunk)
+                chunk.clear()
+                print(f"\r{loaded:,} / {args.tasks:,} tasks", end="", flush=True)
+    if chunk:
+        load_task_rows(chunk)
+        loaded += len(chunk)
+    elapsed = time.perf_counter() - started
+    print(f"\r{loaded:,} tasks loaded in {elapsed:.1f}s ({loaded / elapsed:,.0f} rows/s)")
+
+    async def rebuild_counters() -> None:
+        async with session_scope() as session:
+            await crud.reconcile_task_counters(session=session)
+
+    asyncio.run(rebuild_counters())
+    return {
+        "password": PASSWORD,
+        "users": [
+            {"email": user["email"], "id": str(user["id"]), "tasks": count}
+            for user, count in zip(users, counts)
+        ],
+        "tasks": loaded,
+        "seed": args.seed,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.seed", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--skew", type=float, default=1.1, help="Zipf exponent of tasks per user")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--prefix", default="bench", help="Email prefix, to seed more than once")
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    args = parser.parse_args(argv)
+
+    manifest = seed(args)
+    with open(MANIFEST_PATH, "w") as file:
+        json.dump(manifest, file)
+    print(f"Wrote {MANIFEST_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Test setup: a throwaway SQLite database migrated to head, shared by the
+whole run. Tests create their own users, so they do not see each other's
+tasks.
+
+    cd backend && python -m pytest -q
+"""
+import os
+import tempfile
+import uuid
+from collections.abc import AsyncIterator, Iterator
+from datetime import timedelta
+
+# Settings are read at import time, so configure them before importing app.
+_database_dir = tempfile.mkdtemp(prefix="taskline-tests-")
+os.environ.update(
+    DB_ENGINE="sqlite",
+    DB_ASYNC="false",
+    SQLITE_DATABASE_NAME=os.path.join(_database_dir, "test.db"),
+    FIRST_SUPERUSER_EMAIL="admin@example.com",
+    FIRST_SUPERUSER_PASSWORD="supersecret1",
+    SECRET_KEY="test-secret-key-test-secret-key-00",
+    RATE_LIMIT_ENABLED="false",
+)
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from fastapi.testclient import TestClient
+
+from app import crud
+from app.core.db import session_scope
+from app.core.security import create_access_token
+from app.models import User, UserCreate
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope="session")
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database() -> None:
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "app", "alembic"))
+    command.upgrade(config, "head")
+
+
+@pytest.fixture
+async def session() -> AsyncIterator:
+    async with session_scope() as session:
+        yield session
+
+
+@pytest.fixture
+async def owner(session) -> User:
+    return await crud.create_user(
+        session=session,
+        user_create=UserCreate(
+            email=f"user-{uuid.uuid4().hex[:8]}@example.com", password="password123"
+        ),
+    )
+
+
+@pytest.fixture
+def auth_headers(owner: User) -> dict[str, str]:
+    return {"Authorization": f"Bearer {create_access_token(owner.id, timedelta(hours=1))}"}
+
+
+@pytest.fixture
+def client() -> Iterator[TestClient]:
+    from app.main import app
+
+    with TestClient(app) as client:
+        yield client
@@ -0,0 +1,19 @@
+"""AI_DAILY_LIMIT is a quota: it holds even with rate limiting switched off."""
+import pytest
+
+from app.api.deps import consume_ai_quota
+from app.core.config import settings
+from app.core.rate_limit import RateLimitExceeded, rate_limiter
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_ai_quota_ignores_rate_limit_switch(owner, monkeypatch):
+    assert not rate_limiter.enabled
+    monkeypatch.setattr(settings, "AI_ENABLED", True)
+    monkeypatch.setattr(settings, "AI_DAILY_LIMIT", 2)
+
+    await consume_ai_quota(owner)
+    await consume_ai_quota(owner)
+    with pytest.raises(RateLimitExceeded):
+        await consume_ai_quota(owner)
@@ -0,0 +1,17 @@
+"""GET /metrics exposition."""
+import pytest
+
+from app.core.metrics import register_counter
+
+
+def test_cumulative_values_are_counters(client):
+    client.get("/api/v1/users/me")  # populate a few series
+    lines = client.get("/metrics").text.splitlines()
+    assert "# TYPE user_cache_requests_total counter" in lines
+    assert "# TYPE db_pool_checkout_timeouts_total counter" in lines
+    assert any(line.startswith('user_cache_requests_total{result="hit"} ') for line in lines)
+
+
+def test_counter_names_need_total_suffix():
+    with pytest.raises(ValueError):
+        register_counter("user_cache_requests", "Wrong name.", dict)
@@ -0,0 +1,66 @@
+"""Reminder delivery: a failed send is retried, and the watermark follows sends."""
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app import crud
+from app.core import reminders
+from app.core.lease import Lease
+from app.core.reminders import ReminderScheduler
+from app.models import TaskCreate
+
+pytestmark = pytest.mark.anyio
+
+
+class FlakySink:
+    def __init__(self) -> None:
+        self.down = True
+        self.received: list[reminders.Reminder] = []
+
+    async def send(self, batch: list[reminders.Reminder]) -> None:
+        if self.down:
+            raise ConnectionError("sink unavailable")
+        self.received.extend(batch)
+
+    async def close(self) -> None:
+        pass
+
+
+async def test_failed_send_is_retried_before_the_watermark_moves(session, owner, monkeypatch):
+    monkeypatch.setattr(reminders, "SEND_RETRY_SECONDS", 0.2)
+    sink = FlakySink()
+    scheduler = ReminderScheduler(sink, Lease(f"reminders-{uuid.uuid4().hex}", ttl=30))
+    await scheduler._renew(time.time())
+    assert scheduler.leader
+    task = await crud.create_task(
+        session=session,
+        task_create=TaskCreate(
+            title="pay rent", due_date=datetime.now(timezone.utc) + timedelta(seconds=0.1)
+        ),
+        owner_id=owner.id,
+    )
+    await scheduler._scan(time.time())
+    await asyncio.sleep(0.15)
+
+    # The sink is down: nothing is lost, and the watermark stays put.
+    watermark = scheduler._watermark
+    await scheduler._fire(time.time())
+    assert (sink.received, scheduler.sent["overdue"]) == ([], 0)
+    assert scheduler._watermark == watermark
+    # Not retried before SEND_RETRY_SECONDS.
+    sink.down = False
+    await scheduler._fire(time.time())
+    assert sink.received == []
+
+    await asyncio.sleep(0.2)
+    await scheduler._fire(time.time())
+    assert [(reminder.kind, reminder.task_id) for reminder in sink.received] == [
+        ("overdue", task.id)
+    ]
+    assert scheduler._watermark > task.due_date.replace(tzinfo=timezone.utc).timestamp()
+    # Stored right after the send, for a leader taking over.
+    assert await scheduler.lease.watermark() == scheduler._watermark
+    await scheduler.lease.release()
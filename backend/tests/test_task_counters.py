@@ -0,0 +1,154 @@
+"""
+TaskCounter bookkeeping: every write path must leave the owner's counter
+row equal to what reconcile_task_counters computes from the task table.
+"""
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app import crud
+from app.models import (
+    TaskBulkUpdateItem,
+    TaskCounter,
+    TaskCreate,
+    TaskPriority,
+    TaskStatus,
+    TaskUpdate,
+)
+
+pytestmark = pytest.mark.anyio
+
+COUNT_FIELDS = [
+    "total",
+    *(status.value for status in TaskStatus),
+    *(TaskCounter.priority_field(priority) for priority in TaskPriority),
+]
+
+
+async def counts(session, owner_id) -> dict[str, int]:
+    counter = await session.get(TaskCounter, owner_id, populate_existing=True)
+    return {field: getattr(counter, field) for field in COUNT_FIELDS}
+
+
+async def version(session, owner_id) -> int:
+    return (await session.get(TaskCounter, owner_id, populate_existing=True)).version
+
+
+async def assert_reconciled(session, owner_id) -> None:
+    """The counter row already matches the task table: reconcile changes nothing."""
+    assert await crud.reconcile_task_counters(session=session, owner_id=owner_id) == 0
+
+
+async def test_create_and_update_task(session, owner):
+    task = await crud.create_task(
+        session=session,
+        task_create=TaskCreate(title="write report", priority=TaskPriority.HIGH),
+        owner_id=owner.id,
+    )
+    assert await counts(session, owner.id) == {
+        **dict.fromkeys(COUNT_FIELDS, 0),
+        "total": 1,
+        "todo": 1,
+        "priority_high": 1,
+    }
+
+    before = await version(session, owner.id)
+    await crud.update_task(
+        session=session,
+        db_task=task,
+        task_update=TaskUpdate(status=TaskStatus.COMPLETED, priority=TaskPriority.LOW),
+    )
+    assert await counts(session, owner.id) == {
+        **dict.fromkeys(COUNT_FIELDS, 0),
+        "total": 1,
+        "completed": 1,
+        "priority_low": 1,
+    }
+    assert await version(session, owner.id) > before
+    await assert_reconciled(session, owner.id)
+
+    await crud.delete_task(session=session, db_task=task)
+    assert await counts(session, owner.id) == dict.fromkeys(COUNT_FIELDS, 0)
+    await assert_reconciled(session, owner.id)
+
+
+async def test_bulk_create_update_delete(session, owner):
+    ids = await crud.create_tasks(
+        session=session,
+        tasks_create=[
+            TaskCreate(title=f"task {i}", priority=list(TaskPriority)[i % 4]) for i in range(8)
+        ],
+        owner_id=owner.id,
+    )
+    assert (await counts(session, owner.id))["total"] == 8
+    await assert_reconciled(session, owner.id)
+
+    # Items for unknown ids and no-op items must not move the counters.
+    await crud.update_tasks(
+        session=session,
+        items=[
+            TaskBulkUpdateItem(id=ids[0], status=TaskStatus.IN_PROGRESS),
+            TaskBulkUpdateItem(id=ids[1], status=TaskStatus.COMPLETED, priority=TaskPriority.URGENT),
+            TaskBulkUpdateItem(id=ids[2], title="renamed"),
+            TaskBulkUpdateItem(id=uuid.uuid4(), status=TaskStatus.COMPLETED),
+        ],
+        owner_id=owner.id,
+    )
+    current = await counts(session, owner.id)
+    assert (current["todo"], current["in_progress"], current["completed"]) == (6, 1, 1)
+    assert current["priority_urgent"] == 3
+    await assert_reconciled(session, owner.id)
+
+    deleted = await crud.delete_tasks(
+        session=session, task_ids=[ids[0], ids[1], ids[5], uuid.uuid4()], owner_id=owner.id
+    )
+    assert deleted == {ids[0], ids[1], ids[5]}
+    current = await counts(session, owner.id)
+    assert (current["total"], current["todo"], current["in_progress"], current["completed"]) == (5, 5, 0, 0)
+    await assert_reconciled(session, owner.id)
+
+
+async def test_archive_and_restore(session, owner):
+    ids = await crud.create_tasks(
+        session=session,
+        tasks_create=[TaskCreate(title=f"task {i}") for i in range(3)],
+        owner_id=owner.id,
+    )
+    await crud.update_tasks(
+        session=session,
+        items=[TaskBulkUpdateItem(id=task_id, status=TaskStatus.COMPLETED) for task_id in ids[:2]],
+        owner_id=owner.id,
+    )
+
+    archived = 0
+    older_than = datetime.now(timezone.utc) + timedelta(days=1)
+    while moved := await crud.archive_tasks(session=session, older_than=older_than, batch_size=1):
+        archived += moved
+    assert archived >= 2
+    current = await counts(session, owner.id)
+    assert (current["total"], current["todo"], current["completed"]) == (1, 1, 0)
+    await assert_reconciled(session, owner.id)
+
+    restored = await crud.restore_task(
+        session=session,
+        archived=await crud.get_archived_task(session=session, task_id=ids[0]),
+    )
+    assert restored.status == TaskStatus.COMPLETED
+    current = await counts(session, owner.id)
+    assert (current["total"], current["todo"], current["completed"]) == (2, 1, 1)
+    await assert_reconciled(session, owner.id)
+
+
+async def test_reconcile_repairs_drift(session, owner):
+    await crud.create_task(session=session, task_create=TaskCreate(title="a"), owner_id=owner.id)
+    counter = await session.get(TaskCounter, owner.id)
+    counter.total = 42
+    counter.todo = 0
+    session.add(counter)
+    await session.commit()
+
+    assert await crud.reconcile_task_counters(session=session, owner_id=owner.id) == 1
+    current = await counts(session, owner.id)
+    assert (current["total"], current["todo"]) == (1, 1)
+    await assert_reconciled(session, owner.id)
@@ -0,0 +1,75 @@
+"""Task imports: time zones and per-row error reports."""
+import io
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app import task_io
+
+pytestmark = pytest.mark.anyio
+
+
+def ndjson(*records: dict) -> io.BytesIO:
+    return io.BytesIO(b"".join(json.dumps(record).encode() + b"\n" for record in records))
+
+
+async def test_datetimes_are_loaded_as_utc(owner, monkeypatch):
+    # COPY into the zone-less timestamp columns drops offsets instead of
+    # converting them, so every datetime must already be UTC.
+    loaded = []
+    load_task_rows = task_io.load_task_rows
+
+    def capture(rows):
+        load_task_rows(rows)
+        loaded.extend(rows)
+
+    monkeypatch.setattr(task_io, "load_task_rows", capture)
+    report = task_io.import_tasks(
+        ndjson(
+            {"title": "offset", "due_date": "2030-01-01T12:00:00+02:00"},
+            {"title": "utc", "due_date": "2030-01-01T12:00:00Z"},
+            {"title": "naive", "due_date": "2030-01-01T12:00:00"},
+        ),
+        owner_id=owner.id,
+        import_format="ndjson",
+    )
+    assert report.imported == 3
+
+    for row in loaded:
+        for field in ("due_date", "created_at", "updated_at"):
+            assert row[field].utcoffset() == timedelta(0)
+    assert {row["title"]: row["due_date"] for row in loaded} == {
+        "offset": datetime(2030, 1, 1, 10, tzinfo=timezone.utc),
+        "utc": datetime(2030, 1, 1, 12, tzinfo=timezone.utc),
+        "naive": datetime(2030, 1, 1, 12, tzinfo=timezone.utc),
+    }
+
+
+async def test_rejected_chunk_reports_only_the_failing_rows(owner, monkeypatch):
+    load_task_rows = task_io.load_task_rows
+    calls = []
+
+    def reject_bad_titles(rows):
+        calls.append(len(rows))
+        if any(row["title"].startswith("bad") for row in rows):
+            raise ValueError("rejected by the database")
+        load_task_rows(rows)
+
+    monkeypatch.setattr(task_io, "load_task_rows", reject_bad_titles)
+    titles = [f"task {i}" for i in range(16)]
+    titles[3], titles[12] = "bad 3", "bad 12"
+    report = task_io.import_tasks(
+        ndjson(*({"title": title} for title in titles)),
+        owner_id=owner.id,
+        import_format="ndjson",
+        chunk_size=16,
+    )
+
+    assert (report.imported, report.failed) == (14, 2)
+    assert [(error.row, error.error) for error in report.errors] == [
+        (4, "database error: rejected by the database"),
+        (13, "database error: rejected by the database"),
+    ]
+    # Bisected, not retried one row at a time.
+    assert len(calls) < len(titles)
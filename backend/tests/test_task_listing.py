@@ -0,0 +1,80 @@
+"""GET /tasks/: ordering and conditional requests."""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import update
+
+from app import crud
+from app.models import Task, TaskBulkUpdateItem, TaskCreate, TaskPriority, TaskStatus
+
+pytestmark = pytest.mark.anyio
+
+API = "/api/v1/tasks/"
+
+
+async def test_sort_by_status_and_priority_follows_workflow(session, owner, client, auth_headers):
+    ids = await crud.create_tasks(
+        session=session,
+        tasks_create=[
+            TaskCreate(title="done", priority=TaskPriority.URGENT),
+            TaskCreate(title="todo", priority=TaskPriority.LOW),
+            TaskCreate(title="doing", priority=TaskPriority.HIGH),
+            TaskCreate(title="later", priority=TaskPriority.MEDIUM),
+        ],
+        owner_id=owner.id,
+    )
+    await crud.update_tasks(
+        session=session,
+        items=[
+            TaskBulkUpdateItem(id=ids[0], status=TaskStatus.COMPLETED),
+            TaskBulkUpdateItem(id=ids[2], status=TaskStatus.IN_PROGRESS),
+        ],
+        owner_id=owner.id,
+    )
+
+    response = client.get(API, params={"sort": "status", "fields": "status"}, headers=auth_headers)
+    assert [task["status"] for task in response.json()["data"]] == [
+        "todo", "todo", "in_progress", "completed"
+    ]
+    response = client.get(API, params={"sort": "-priority", "fields": "priority"}, headers=auth_headers)
+    assert [task["priority"] for task in response.json()["data"]] == [
+        "urgent", "high", "medium", "low"
+    ]
+
+
+async def test_overdue_etag_changes_when_a_task_falls_due(session, owner, client, auth_headers):
+    task = await crud.create_task(
+        session=session,
+        task_create=TaskCreate(
+            title="pay invoice", due_date=datetime.now(timezone.utc) + timedelta(hours=1)
+        ),
+        owner_id=owner.id,
+    )
+    params = {"overdue": "true"}
+    response = client.get(API, params=params, headers=auth_headers)
+    assert response.json()["count"] == 0
+    etag = response.headers["etag"]
+    assert client.get(API, params=params, headers={**auth_headers, "If-None-Match": etag}).status_code == 304
+
+    # As if the clock passed the due date: no write through crud, so the
+    # counter version does not move.
+    await session.execute(
+        update(Task)
+        .where(Task.id == task.id)
+        .values(due_date=datetime.now(timezone.utc) - timedelta(minutes=1))
+    )
+    await session.commit()
+
+    response = client.get(API, params=params, headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["count"] == 1
+
+
+async def test_bulk_created_tasks_keep_request_order(owner, client, auth_headers):
+    titles = [f"step {i}" for i in range(20)]
+    response = client.post(
+        f"{API}bulk", json={"items": [{"title": title} for title in titles]}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    listed = client.get(API, params={"fields": "title"}, headers=auth_headers).json()["data"]
+    assert [task["title"] for task in listed] == titles
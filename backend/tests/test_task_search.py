@@ -0,0 +1,38 @@
+"""crud.search_tasks (SQLite FTS5 on the test database)."""
+import uuid
+
+import pytest
+
+from app import crud
+from app.models import TaskCreate, UserCreate
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_search_only_matches_the_owners_tasks(session, owner):
+    other = await crud.create_user(
+        session=session,
+        user_create=UserCreate(email=f"other-{uuid.uuid4().hex[:8]}@example.com", password="password123"),
+    )
+    await crud.create_tasks(
+        session=session,
+        tasks_create=[
+            TaskCreate(title="quarterly report", description="numbers for the board"),
+            TaskCreate(title="call the bank", description="about the report deadline"),
+            TaskCreate(title="water the plants"),
+        ],
+        owner_id=owner.id,
+    )
+    await crud.create_tasks(
+        session=session,
+        tasks_create=[TaskCreate(title="report for someone else")],
+        owner_id=other.id,
+    )
+
+    hits = await crud.search_tasks(session=session, owner_id=owner.id, query="report")
+    assert [task.title for task, _, _ in hits] == ["quarterly report", "call the bank"]
+    assert all(task.owner_id == owner.id for task, _, _ in hits)
+    assert "<mark>report</mark>" in hits[1][2]
+
+    # The owner column is only matched through the owner filter.
+    assert await crud.search_tasks(session=session, owner_id=other.id, query=owner.id.hex) == []
@@ -0,0 +1,100 @@
+"""GET /tasks/changes: imports, archiving and restoring."""
+import asyncio
+import io
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app import crud, task_io
+from app.core.config import settings
+from app.models import TaskCreate, TaskStatus
+
+pytestmark = pytest.mark.anyio
+
+CHANGES = "/api/v1/tasks/changes"
+
+
+async def test_sync_between_import_chunks_sees_every_row(owner, client, auth_headers, monkeypatch):
+    monkeypatch.setattr(settings, "SYNC_SETTLE_SECONDS", 0.0)
+    cursors = []
+    load_task_rows = task_io.load_task_rows
+
+    def load_then_sync(rows):
+        load_task_rows(rows)
+        if not cursors:
+            # A client syncs after the first chunk is committed.
+            time.sleep(0.01)
+            response = client.get(CHANGES, headers=auth_headers)
+            assert [task["title"] for task in response.json()["changed"]] == ["first"]
+            cursors.append(response.json()["next_cursor"])
+            time.sleep(0.01)
+
+    monkeypatch.setattr(task_io, "load_task_rows", load_then_sync)
+    file = io.BytesIO(
+        b"".join(json.dumps({"title": title}).encode() + b"\n" for title in ("first", "second"))
+    )
+    report = task_io.import_tasks(file, owner_id=owner.id, import_format="ndjson", chunk_size=1)
+    assert report.imported == 2
+
+    response = client.get(CHANGES, params={"since": cursors[0]}, headers=auth_headers)
+    assert [task["title"] for task in response.json()["changed"]] == ["second"]
+
+
+async def test_sync_waits_for_slow_write_transactions(owner, client, auth_headers, monkeypatch):
+    # The write commits long after it stamped its rows, and long after the
+    # settle window: the sync must not hand out a cursor past them.
+    monkeypatch.setattr(settings, "SYNC_SETTLE_SECONDS", 0.2)
+    update_task_counters = crud._update_task_counters
+
+    async def slow_update_task_counters(**kwargs):
+        await update_task_counters(**kwargs)
+        await asyncio.sleep(1.0)
+
+    monkeypatch.setattr(crud, "_update_task_counters", slow_update_task_counters)
+    titles = [f"task {i}" for i in range(3)]
+    writer = threading.Thread(
+        target=client.post,
+        args=("/api/v1/tasks/bulk",),
+        kwargs={"json": {"items": [{"title": title} for title in titles]}, "headers": auth_headers},
+    )
+    writer.start()
+    time.sleep(0.3)
+    first = client.get(CHANGES, headers=auth_headers).json()
+    writer.join()
+    time.sleep(0.3)
+    second = client.get(CHANGES, params={"since": first["next_cursor"]}, headers=auth_headers).json()
+
+    synced = [task["title"] for task in first["changed"] + second["changed"]]
+    assert sorted(synced) == titles
+
+
+async def test_archive_and_restore_show_up_in_changes(
+    session, owner, client, auth_headers, monkeypatch
+):
+    monkeypatch.setattr(settings, "SYNC_SETTLE_SECONDS", 0.0)
+    task = await crud.create_task(
+        session=session, task_create=TaskCreate(title="old news", status=TaskStatus.COMPLETED),
+        owner_id=owner.id,
+    )
+    time.sleep(0.01)
+    cursor = client.get(CHANGES, headers=auth_headers).json()["next_cursor"]
+
+    older_than = datetime.now(timezone.utc) + timedelta(days=1)
+    while await crud.archive_tasks(session=session, older_than=older_than, batch_size=100):
+        pass
+    time.sleep(0.01)
+    response = client.get(CHANGES, params={"since": cursor}, headers=auth_headers).json()
+    assert (response["changed"], response["deleted"]) == ([], [str(task.id)])
+    cursor = response["next_cursor"]
+
+    assert client.post(f"/api/v1/tasks/{task.id}/restore", headers=auth_headers).status_code == 200
+    time.sleep(0.01)
+    response = client.get(CHANGES, params={"since": cursor}, headers=auth_headers).json()
+    assert [changed["id"] for changed in response["changed"]] == [str(task.id)]
+    assert response["deleted"] == []
+    # A client syncing from scratch sees only the restored task.
+    full = client.get(CHANGES, headers=auth_headers).json()
+    assert [changed["id"] for changed in full["changed"]] == [str(task.id)]
@@ -0,0 +1,41 @@
+"""PATCH /tasks/{id} and PATCH /tasks/bulk validation."""
+import pytest
+
+from app import crud
+from app.models import Task, TaskCreate
+
+pytestmark = pytest.mark.anyio
+
+API = "/api/v1/tasks"
+
+
+@pytest.mark.parametrize("field", ["title", "status", "priority"])
+async def test_null_for_required_fields_is_rejected(session, owner, client, auth_headers, field):
+    task = await crud.create_task(
+        session=session, task_create=TaskCreate(title="keep me"), owner_id=owner.id
+    )
+    response = client.patch(
+        f"{API}/bulk", json={"items": [{"id": str(task.id), field: None}]}, headers=auth_headers
+    )
+    assert response.status_code == 422
+    response = client.patch(f"{API}/{task.id}", json={field: None}, headers=auth_headers)
+    assert response.status_code == 422
+
+    stored = await session.get(Task, task.id, populate_existing=True)
+    assert (stored.title, stored.status, stored.priority) == (task.title, task.status, task.priority)
+
+
+async def test_null_clears_optional_fields(session, owner, client, auth_headers):
+    task = await crud.create_task(
+        session=session,
+        task_create=TaskCreate(title="t", description="notes", due_date="2030-01-01T00:00:00Z"),
+        owner_id=owner.id,
+    )
+    response = client.patch(
+        f"{API}/bulk",
+        json={"items": [{"id": str(task.id), "description": None, "due_date": None}]},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    stored = await session.get(Task, task.id, populate_existing=True)
+    assert (stored.description, stored.due_date) == (None, None)